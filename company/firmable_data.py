@@ -2,6 +2,8 @@ import os
 import logging
 import requests
 from dotenv import load_dotenv
+from utils.failures import CircuitOpenError
+from utils.resilience import http_request
 
 # -------------------------------------------------------------------
 # Logging configuration
@@ -40,8 +42,11 @@ def get_company_info(url, linkedin=False):
         params = {"website": url}
 
     try:
-        response = requests.get(BASE_URL, headers=headers, params=params, timeout=30)
+        response = http_request("firmable", "GET", BASE_URL, headers=headers, params=params, timeout=30)
         response.raise_for_status()
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping Firmable lookup for {url}: {e}")
+        return None
     except requests.exceptions.RequestException as e:
         # If the first attempt fails and URL doesn't end in .au, try with .com.au
         if not url.endswith('.au'):
@@ -65,9 +70,9 @@ def get_company_info(url, linkedin=False):
                 params = {"website": retry_url}
 
             try:
-                response = requests.get(BASE_URL, headers=headers, params=params, timeout=30)
+                response = http_request("firmable", "GET", BASE_URL, headers=headers, params=params, timeout=30)
                 response.raise_for_status()
-            except requests.exceptions.RequestException as retry_e:
+            except (requests.exceptions.RequestException, CircuitOpenError) as retry_e:
                 logger.exception(f"Firmable API retry also failed for {retry_url}: {retry_e}")
                 return None
         else:
@@ -1,4 +1,5 @@
 import logging
+from utils.negative_cache import known_empty, remember_empty
 from .serp_company_url import get_company_url
 from .firmable_data import get_company_info
 
@@ -20,6 +21,12 @@ def get_info(company_name, company_location):
         dict: Company info with all available fields on success
         None: Only if critical data (company URL) cannot be obtained
     """
+    # Firmable had no LinkedIn page for this company last time: reuse that lookup
+    inputs = (company_name, company_location)
+    cached = known_empty(company_name, "linkedin", inputs)
+    if cached and cached.get("data"):
+        return cached["data"]
+
     # Get company URL from SERP
     company_url = get_company_url(company_name, company_location)
 
@@ -29,6 +36,7 @@ def get_info(company_name, company_location):
 
     # Get detailed company info from Firmable
     company_info = get_company_info(company_url)
+    firmable_found = bool(company_info)
 
     # If Firmable fails, create a minimal info dict so workflow can continue
     if not company_info:
@@ -44,6 +52,10 @@ def get_info(company_name, company_location):
     company_info['name'] = company_name
     company_info['city'] = company_location
 
+    # Only a Firmable answer without a LinkedIn page is cached, not a failed lookup
+    if firmable_found and not company_info.get('linkedin'):
+        remember_empty(company_name, "linkedin", "Firmable has no LinkedIn page for the company", inputs, data=company_info)
+
     logger.info(f"Successfully aggregated info for {company_name}")
     return company_info
 
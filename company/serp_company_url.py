@@ -2,6 +2,7 @@ import os
 import logging
 import serpapi
 from dotenv import load_dotenv
+from utils.resilience import call
 from urllib.parse import urlparse
 
 # -------------------------------------------------------------------
@@ -41,7 +42,7 @@ def get_company_url(name, location):
 
     try:
         client = serpapi.Client(api_key=params["api_key"])
-        results = client.search(params)
+        results = call("serpapi", client.search, params)
 
         if not results.get("organic_results"):
             logger.warning(f"No search results found for {name} in {location}")
@@ -2,6 +2,8 @@ import os
 import logging
 import serpapi
 from dotenv import load_dotenv
+from utils.negative_cache import known_empty, remember_empty
+from utils.resilience import call
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +27,11 @@ def get_contact_linkedin_url(contact_name, company_name):
         str: LinkedIn profile URL on success
         None: On any failure
     """
+    # A search that found no profile for this contact is not repeated until it expires
+    inputs = (company_name, contact_name)
+    if known_empty(company_name, "contact", inputs):
+        return None
+
     params = {
         "engine": "google",
         "location": "Australia",
@@ -37,10 +44,11 @@ def get_contact_linkedin_url(contact_name, company_name):
 
     try:
         client = serpapi.Client(api_key=params["api_key"])
-        results = client.search(params)
+        results = call("serpapi", client.search, params)
 
         if not results.get("organic_results"):
             logger.warning(f"No search results for contact {contact_name} at {company_name}")
+            remember_empty(company_name, "contact", f"no search results for {contact_name}", inputs)
             return None
 
         for result in results["organic_results"][:5]:
@@ -50,6 +58,7 @@ def get_contact_linkedin_url(contact_name, company_name):
                 return link
 
         logger.warning(f"No LinkedIn profile URL found in top results for {contact_name}")
+        remember_empty(company_name, "contact", f"no LinkedIn profile found for {contact_name}", inputs)
         return None
 
     except Exception as e:
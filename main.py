@@ -1,10 +1,18 @@
 import argparse
 import asyncio
 import logging
+import sys
 from pathlib import Path
 from scraper import scrape_all_companies, scrape_companies, read_companies_from_csv
-from salesforce import import_companies_from_salesforce, push_to_salesforce
+from salesforce import import_companies_from_salesforce, import_single_company, push_to_salesforce
 from utils.email_client import send_all_reports, send_owner_digests
+from utils.cadence import carry_forward, plan_refresh
+from utils.owner_digests import mark_finished, sent_owners, set_early_digests
+from utils.resilience import set_fast_polling
+from utils.model_routing import apply_route_overrides, parse_route_override
+from utils.llm_usage import set_budgets
+from utils.planner import format_plan, plan_run
+from utils.run_journal import RunJournal
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,6 +28,12 @@ def run(
     deliver_only: bool = False,
     batch: str = None,
     limit: int = None,
+    model_routes: list[str] = None,
+    company_token_budget: int = None,
+    run_token_budget: int = None,
+    resume: str = None,
+    run_id: str = None,
+    due_only: bool = False,
 ):
     """
     Run the full scraping and email pipeline.
@@ -32,19 +46,38 @@ def run(
         deliver_only: If True, push + email + cleanup only — skip import + scrape.
         batch: Batch spec like "1/4" meaning "batch 1 of 4".
         limit: If provided, only process the first N companies from the list.
+        model_routes: Per-run model route overrides like "reachout_message=gpt-4o:400:60".
+        company_token_budget: LLM token budget per company (0 = unlimited, None = use env).
+        run_token_budget: LLM token budget for the whole run (0 = unlimited, None = use env).
+        resume: Run ID (or "latest") of an interrupted run to resume from its journal;
+            its companies are scraped again, skipping the steps that completed.
+        run_id: ID for this run's journal; an unfinished journal with this ID is resumed.
+        due_only: Sub-monthly run: only scrape busy companies whose refresh is due,
+            without carrying forward the reports of the others.
     """
+    apply_route_overrides(model_routes)
+    if not send_digest:
+        set_early_digests(False)
+    if company_token_budget is not None or run_token_budget is not None:
+        set_budgets(company=company_token_budget, run=run_token_budget)
+
     # ── Scrape phase ──
     if not deliver_only:
-        if company:
+        if resume:
+            journal = RunJournal.load(resume)
+            if not journal:
+                return
+            _scrape(journal.companies, journal)
+        elif company:
             logger.info(f"Single-company mode: {company}")
-            import_companies_from_salesforce()
-            companies = read_companies_from_csv()
-            match = [(name, loc) for name, loc in companies if name.lower() == company.lower()]
-            if not match:
-                logger.error(f"Company '{company}' not found in companies.csv")
+            found = import_single_company(company)
+            if not found:
+                logger.error(f"No Opportunity named '{company}' in Salesforce")
                 return
-            logger.info(f"Found: {match[0][0]} in {match[0][1]}")
-            asyncio.run(scrape_companies(match, inter_delay=False))
+            logger.info(f"Found: {found[0]} in {found[1]}")
+            match = [found]
+            set_fast_polling(True)
+            _scrape(match, _open_journal(match, run_id), inter_delay=False)
         elif batch:
             batch_num, total_batches = _parse_batch(batch)
             if not scrape_only:
@@ -57,14 +90,14 @@ def run(
             logger.info(f"Batch {batch_num}/{total_batches}: processing {len(chunk)} of {len(companies)} companies")
             for name, loc in chunk:
                 logger.info(f"  - {name}")
-            asyncio.run(scrape_companies(chunk))
+            _scrape_due(chunk, run_id, due_only)
         else:
             import_companies_from_salesforce()
             companies = read_companies_from_csv()
             if limit:
                 companies = companies[:limit]
                 logger.info(f"Limited to first {limit} companies")
-            asyncio.run(scrape_companies(companies))
+            _scrape_due(companies, run_id, due_only)
 
     if scrape_only:
         logger.info("Scrape-only mode: skipping push, email, and cleanup")
@@ -74,7 +107,7 @@ def run(
     push_to_salesforce()
 
     if send_digest:
-        send_owner_digests(fallback_recipients=recipients)
+        send_owner_digests(fallback_recipients=recipients, skip_owners=sent_owners())
     elif recipients:
         send_all_reports(recipients)
     else:
@@ -83,6 +116,62 @@ def run(
     cleanup()
 
 
+def plan(limit: int = None, due_only: bool = False) -> bool:
+    """
+    Print the expected calls, tokens, cost and job wall time of a run over the
+    imported companies, without scraping anything (see utils/planner.py).
+
+    Args:
+        limit: Plan for only the first N companies.
+        due_only: Plan a sub-monthly run.
+
+    Returns:
+        bool: True if no job is expected to time out or run over a token budget.
+    """
+    try:
+        companies = read_companies_from_csv()
+    except FileNotFoundError:
+        companies = []
+    if not companies:
+        logger.error("No imported companies to plan for, run the Salesforce import first (python salesforce.py)")
+        return False
+    if limit:
+        companies = companies[:limit]
+
+    result = plan_run(companies, due_only=due_only)
+    print("\n".join(format_plan(result)))
+    return not result["warnings"]
+
+
+def _open_journal(companies: list, run_id: str = None) -> RunJournal:
+    """Start a new run journal, or pick up the unfinished one saved under `run_id`."""
+    if run_id:
+        return RunJournal.start_or_resume(companies, run_id)
+    return RunJournal.start(companies)
+
+
+def _scrape_due(companies: list, run_id: str = None, due_only: bool = False):
+    """
+    Scrape the companies that are due for a refresh (see utils/cadence.py) and
+    carry forward the last report of the others into data/output.
+    """
+    due, carried = plan_refresh(companies, due_only=due_only)
+    carry_forward(carried)
+    for company, report_data in carried:
+        mark_finished(company, {**report_data, "carried_forward": True})
+    if due:
+        _scrape(due, _open_journal(due, run_id))
+
+
+def _scrape(companies: list, journal: RunJournal, inter_delay: bool = True):
+    """Run the scrape phase; exits with status 143 if it was stopped by SIGTERM."""
+    try:
+        asyncio.run(scrape_companies(companies, inter_delay=inter_delay, journal=journal))
+    except asyncio.CancelledError:
+        logger.error(f"Scrape interrupted, progress saved in run journal {journal.run_id}")
+        sys.exit(143)
+
+
 def _parse_batch(batch_str: str) -> tuple[int, int]:
     """Parse '1/4' into (1, 4)."""
     parts = batch_str.split("/")
@@ -123,7 +212,7 @@ if __name__ == "__main__":
     parser.add_argument(
         "--company",
         type=str,
-        help="Run pipeline for a single company (must match a name in companies.csv)",
+        help="Run pipeline for a single company (an Opportunity name in Salesforce, looked up on its own)",
     )
     parser.add_argument(
         "--batch",
@@ -150,11 +239,71 @@ if __name__ == "__main__":
         type=int,
         help="Only process the first N companies (useful for testing)",
     )
+    parser.add_argument(
+        "--route",
+        action="append",
+        metavar="TASK=MODEL[:MAX_TOKENS[:TIMEOUT]]",
+        help=(
+            "Override the model route for an LLM task for this run (repeatable). Tasks: "
+            "post_classification, contact_summary, reachout_message, potential_actions, news_search"
+        ),
+    )
+    parser.add_argument(
+        "--company-token-budget",
+        type=int,
+        help="LLM token budget per company; optional steps are skipped as it runs out (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--run-token-budget",
+        type=int,
+        help="LLM token budget for the whole run; optional steps are skipped as it runs out (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--due-only",
+        action="store_true",
+        help="Sub-monthly refresh: only scrape busy companies that are due, carry nothing forward",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print the expected calls, tokens, cost and job times for the imported companies without running "
+             "anything; exits 1 if a job may time out or run over a budget",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from its journal in data/state/runs/ ('latest' for the most recent)",
+    )
+    parser.add_argument(
+        "--run-id",
+        help="ID for this run's journal; if an unfinished journal with this ID exists, it is resumed",
+    )
     args = parser.parse_args()
 
     if args.scrape_only and args.deliver_only:
         parser.error("Cannot use --scrape-only and --deliver-only together")
 
+    if args.resume and (args.company or args.batch or args.limit or args.deliver_only or args.run_id or args.due_only):
+        parser.error("--resume takes its companies from the run journal; it cannot be combined with "
+                     "--company, --batch, --limit, --deliver-only, --run-id or --due-only")
+
+    if args.due_only and (args.company or args.deliver_only):
+        parser.error("--due-only cannot be combined with --company or --deliver-only")
+
+    for route_spec in args.route or []:
+        try:
+            parse_route_override(route_spec)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.plan:
+        if args.company or args.batch or args.resume or args.deliver_only:
+            parser.error("--plan covers the whole imported company list; it cannot be combined with "
+                         "--company, --batch, --resume or --deliver-only")
+        if args.company_token_budget is not None or args.run_token_budget is not None:
+            set_budgets(company=args.company_token_budget, run=args.run_token_budget)
+        sys.exit(0 if plan(limit=args.limit, due_only=args.due_only) else 1)
+
     if args.no_email:
         run(
             company=args.company,
@@ -163,6 +312,12 @@ if __name__ == "__main__":
             deliver_only=args.deliver_only,
             batch=args.batch,
             limit=args.limit,
+            model_routes=args.route,
+            company_token_budget=args.company_token_budget,
+            run_token_budget=args.run_token_budget,
+            resume=args.resume,
+            run_id=args.run_id,
+            due_only=args.due_only,
         )
     else:
         run(
@@ -172,4 +327,10 @@ if __name__ == "__main__":
             deliver_only=args.deliver_only,
             batch=args.batch,
             limit=args.limit,
+            model_routes=args.route,
+            company_token_budget=args.company_token_budget,
+            run_token_budget=args.run_token_budget,
+            resume=args.resume,
+            run_id=args.run_id,
+            due_only=args.due_only,
         )
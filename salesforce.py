@@ -2,20 +2,52 @@ import csv
 import json
 import logging
 import os
+import queue
+import threading
+import time
 import urllib.parse
-from datetime import datetime
+from datetime import datetime, timedelta
 import requests
 from dotenv import load_dotenv
+from utils.failures import CircuitOpenError
+from utils.resilience import http_request
+from utils.state import load_state, save_state
 
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
 API_VERSION = "v62.0"
-TARGET_REPORTS = ["GOWT Ultra High's", "GOWT High's"]
+# Dashboard reports companies are imported from, and the priority each one stands for
+# (written to companies.csv for the step gating rules in utils/gating.py)
+REPORT_PRIORITIES = {"GOWT Ultra High's": "Ultra High", "GOWT High's": "High"}
+TARGET_REPORTS = list(REPORT_PRIORITIES)
 
 domain = os.getenv("SALESFORCE_DOMAIN")
 
+# Push each company's report to Salesforce as soon as it is scraped (see
+# StreamingDelivery); the deliver phase then only pushes reports that were not delivered
+STREAM_DELIVERY = os.getenv("STREAM_DELIVERY", "false").lower() == "true"
+
+# Streamed reports are pushed in batches of up to STREAM_BATCH_SIZE (one composite
+# request), waiting up to STREAM_BATCH_WAIT seconds for a batch to fill, with at least
+# STREAM_MIN_INTERVAL seconds between requests to Salesforce
+STREAM_BATCH_SIZE = 10
+STREAM_BATCH_WAIT = 30
+STREAM_MIN_INTERVAL = 5
+
+# Seconds to wait for queued reports to be pushed when the scrape ends
+STREAM_CLOSE_TIMEOUT = 120
+
+# company -> {"refreshed_at", "delivered_at"} of the last report pushed to its Opportunity
+DELIVERED_STATE = "delivered"
+
+# Opportunity identity per company (location, priority, owner, primary contact), recorded
+# by every import. Single-company runs reuse it for IDENTITY_TTL_HOURS instead of querying
+# Salesforce; 0 always looks the company up
+IDENTITY_STATE = "company_identity"
+IDENTITY_TTL_HOURS = int(os.getenv("IDENTITY_TTL_HOURS", "24"))
+
 
 def get_access_token():
     payload = {
@@ -49,6 +81,7 @@ def extract_companies(token, dashboard_id):
         metadata = report.get("reportMetadata", {})
         if metadata.get("name", "") not in TARGET_REPORTS:
             continue
+        priority = REPORT_PRIORITIES[metadata["name"]]
 
         columns = metadata.get("detailColumns", [])
         name_idx = next((i for i, c in enumerate(columns) if c == "OPPORTUNITY_NAME"), None)
@@ -59,7 +92,7 @@ def extract_companies(token, dashboard_id):
                 cells = row.get("dataCells", [])
                 company = cells[name_idx].get("label", "") if name_idx is not None else ""
                 location = cells[addr_idx].get("label", "") if addr_idx is not None else ""
-                companies.append((company, location))
+                companies.append((company, location, priority))
 
     return companies
 
@@ -91,8 +124,15 @@ def get_owner_emails(token, company_names):
     return company_to_owner
 
 
-def write_owner_mapping(company_to_owner):
-    """Write owner_email -> [company_names] mapping to JSON."""
+def write_owner_mapping(company_to_owner, imported_at=None):
+    """
+    Write owner_email -> [company_names] mapping to JSON.
+
+    Args:
+        company_to_owner: {company_name: owner email or None}
+        imported_at: Import timestamp to keep (single-company imports update the
+            mapping without starting a new import); defaults to now
+    """
     owner_to_companies = {}
     unmapped = []
 
@@ -105,6 +145,8 @@ def write_owner_mapping(company_to_owner):
     mapping = {
         "owner_to_companies": owner_to_companies,
         "unmapped_companies": unmapped,
+        # Identifies this import, so per-run state (e.g. early owner digests) is not mixed across runs
+        "imported_at": imported_at or datetime.now().isoformat(timespec="seconds"),
     }
 
     mapping_path = os.path.join(os.path.dirname(__file__), "data", "input", "owner_mapping.json")
@@ -162,11 +204,144 @@ def write_companies_csv(companies):
     os.makedirs(os.path.dirname(csv_path), exist_ok=True)
     with open(csv_path, "w", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow(["company", "location"])
+        writer.writerow(["company", "location", "priority"])
         writer.writerows(companies)
     logger.info(f"Wrote {len(companies)} companies to {csv_path}")
 
 
+def get_company_identity(token, company):
+    """
+    Single SOQL query for one Opportunity's identity: ID, name, location, owner email
+    and primary contact (names match case-insensitively).
+
+    Returns:
+        dict: {"id", "company", "location", "owner", "contact"}
+        None: If no Opportunity has that name
+    """
+    escaped = company.replace("'", "\\'")
+    soql = (
+        "SELECT Id, Name, fid5__c, Owner.Email, "
+        "(SELECT Contact.Name FROM OpportunityContactRoles WHERE IsPrimary = true) "
+        f"FROM Opportunity WHERE Name = '{escaped}' LIMIT 1"
+    )
+    result = sf_get(f"query/?q={urllib.parse.quote(soql)}", token)
+    if not isinstance(result, dict):
+        # Salesforce returns a list of errors for a failed query
+        raise RuntimeError(f"Opportunity query failed: {result}")
+
+    records = result.get("records", [])
+    if not records:
+        return None
+
+    record = records[0]
+    owner = record.get("Owner") or {}
+    # The subquery is null when the Opportunity has no primary contact
+    roles = (record.get("OpportunityContactRoles") or {}).get("records", [])
+    return {
+        "id": record.get("Id"),
+        "company": record.get("Name"),
+        "location": record.get("fid5__c") or "",
+        "owner": owner.get("Email") if isinstance(owner, dict) else None,
+        "contact": (roles[0].get("Contact") or {}).get("Name") if roles else None,
+    }
+
+
+def _remember_identities(identities):
+    """Record companies' identities ({company: identity dict}) in data/state."""
+    state = load_state(IDENTITY_STATE, default={})
+    fetched_at = datetime.now().isoformat(timespec="seconds")
+    for company, identity in identities.items():
+        state[company] = {**state.get(company, {}), **identity, "fetched_at": fetched_at}
+    try:
+        save_state(IDENTITY_STATE, state)
+    except Exception as e:
+        logger.warning(f"Could not save company identities: {e}")
+
+
+def _cached_identity(company):
+    """A company's recorded identity (name matched case-insensitively), or None."""
+    state = load_state(IDENTITY_STATE, default={})
+    return next((entry for name, entry in state.items() if name.lower() == company.lower()), None)
+
+
+def _merge_company_inputs(identity):
+    """Add or update one company in the data/input files, keeping every other company."""
+    input_dir = os.path.join(os.path.dirname(__file__), "data", "input")
+    company = identity["company"]
+
+    rows, priority = [], identity.get("priority")
+    try:
+        with open(os.path.join(input_dir, "companies.csv"), "r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row.get("company") == company:
+                    # Keep the priority of the company's last full import
+                    priority = priority or row.get("priority")
+                else:
+                    rows.append((row["company"], row.get("location", ""), row.get("priority") or ""))
+    except FileNotFoundError:
+        pass
+    rows.append((company, identity["location"], priority or ""))
+    write_companies_csv(rows)
+
+    company_to_owner, imported_at = {}, None
+    try:
+        with open(os.path.join(input_dir, "owner_mapping.json"), "r", encoding="utf-8") as f:
+            mapping = json.load(f)
+        for owner, names in mapping.get("owner_to_companies", {}).items():
+            company_to_owner.update({name: owner for name in names})
+        company_to_owner.update({name: None for name in mapping.get("unmapped_companies", [])})
+        imported_at = mapping.get("imported_at")
+    except FileNotFoundError:
+        pass
+    company_to_owner[company] = identity["owner"]
+    write_owner_mapping(company_to_owner, imported_at)
+
+    company_to_contact = {}
+    try:
+        with open(os.path.join(input_dir, "contact_mapping.json"), "r", encoding="utf-8") as f:
+            company_to_contact = json.load(f)
+    except FileNotFoundError:
+        pass
+    company_to_contact[company] = identity["contact"]
+    write_contact_mapping(company_to_contact)
+
+
+def import_single_company(company):
+    """
+    Import one company for a single-company run without walking the dashboards.
+
+    Reuses the company's identity recorded within IDENTITY_TTL_HOURS, otherwise looks
+    it up with one SOQL query, then merges it into the data/input files.
+
+    Args:
+        company: Opportunity name (case-insensitive)
+
+    Returns:
+        tuple: (company_name, location) as named in Salesforce
+        None: If no Opportunity has that name
+    """
+    cached = _cached_identity(company)
+    fresh = (
+        cached and cached.get("fetched_at")
+        and datetime.now() - datetime.fromisoformat(cached["fetched_at"]) < timedelta(hours=IDENTITY_TTL_HOURS)
+    )
+    if fresh:
+        identity = cached
+        logger.info(f"Using identity of {identity['company']} recorded at {identity['fetched_at']}")
+    else:
+        token = get_access_token()
+        identity = get_company_identity(token, company)
+        if identity is None:
+            return None
+        # Priority comes from the dashboard report, which the query doesn't touch
+        identity["priority"] = (cached or {}).get("priority")
+        _remember_identities({identity["company"]: identity})
+        logger.info(f"Looked up {identity['company']} (Opportunity {identity['id']})")
+
+    _merge_company_inputs(identity)
+    return identity["company"], identity["location"]
+
+
 def sf_patch(endpoint, token, payload):
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     return requests.patch(f"{domain}/services/data/{API_VERSION}/{endpoint}", headers=headers, json=payload)
@@ -198,18 +373,19 @@ def _section_header(title):
     )
 
 
-def _last_updated_banner():
-    now = datetime.now().strftime("%d %b %Y, %I:%M %p")
+def _last_updated_banner(data):
+    # Carried-forward reports keep the date they were scraped on
+    refreshed = datetime.fromisoformat(data["refreshed_at"]) if data.get("refreshed_at") else datetime.now()
     return (
         f'<div style="text-align:right; color:#999; font-size:11px; margin-bottom:8px;">'
-        f'Last updated: {now}'
+        f'Last updated: {refreshed.strftime("%d %b %Y, %I:%M %p")}'
         f'</div>'
     )
 
 
 def _format_news_html(data):
     """Format articles and LinkedIn posts as HTML."""
-    html = _last_updated_banner()
+    html = _last_updated_banner(data)
     html += _section_header("Articles")
     if data.get("articles"):
         for i, article in enumerate(data["articles"]):
@@ -247,7 +423,7 @@ def _format_contact_activity_html(data):
         contact_name = data.get("contact_name")
         contact_posts = data.get("contact_posts") or []
 
-        html = _last_updated_banner()
+        html = _last_updated_banner(data)
         contact_title = f"Contact Activity: {contact_name}" if contact_name else "Contact LinkedIn Activity"
         html += _section_header(contact_title)
 
@@ -329,12 +505,26 @@ def push_to_salesforce(output_dir=None):
 
     logger.info(f"Loaded {len(company_data)} company reports")
 
+    if STREAM_DELIVERY:
+        # Reports already pushed while scraping only need reconciling
+        ledger = load_state(DELIVERED_STATE, default={})
+        streamed = [
+            name for name, data in company_data.items()
+            if data.get("refreshed_at") and ledger.get(name, {}).get("refreshed_at") == data["refreshed_at"]
+        ]
+        for name in streamed:
+            del company_data[name]
+        logger.info(f"Already delivered while scraping: {len(streamed)}, pushing the remaining {len(company_data)}")
+        if not company_data:
+            return
+
     # Get Opportunity IDs for all companies
     name_to_id = _get_opportunity_ids(token, list(company_data.keys()))
     logger.info(f"Matched {len(name_to_id)} companies to Opportunities")
 
     updated = 0
     failed = 0
+    delivered = []
     for company_name, data in company_data.items():
         try:
             opp_id = name_to_id.get(company_name)
@@ -343,16 +533,11 @@ def push_to_salesforce(output_dir=None):
                 failed += 1
                 continue
 
-            payload = {
-                "Growth_News__c": _format_news_html(data),
-                "Growth_Actions__c": _format_actions_html(data),
-                "P__c": _format_contact_activity_html(data),
-            }
-
-            resp = sf_patch(f"sobjects/Opportunity/{opp_id}", token, payload)
+            resp = sf_patch(f"sobjects/Opportunity/{opp_id}", token, _opportunity_payload(data))
             if resp.status_code == 204:
                 logger.info(f"Updated: {company_name}")
                 updated += 1
+                delivered.append(data)
             else:
                 logger.error(f"Failed to update {company_name}: {resp.status_code} {resp.text}")
                 failed += 1
@@ -360,9 +545,159 @@ def push_to_salesforce(output_dir=None):
             logger.error(f"Error processing {company_name}, skipping: {e}")
             failed += 1
 
+    _record_delivered(delivered)
     logger.info(f"Push complete: {updated} updated, {failed} failed")
 
 
+def _opportunity_payload(data):
+    """Opportunity fields for a company report."""
+    return {
+        "Growth_News__c": _format_news_html(data),
+        "Growth_Actions__c": _format_actions_html(data),
+        "P__c": _format_contact_activity_html(data),
+    }
+
+
+def _record_delivered(reports):
+    """Record the reports pushed to Salesforce in the delivered ledger."""
+    if not reports:
+        return
+    ledger = load_state(DELIVERED_STATE, default={})
+    delivered_at = datetime.now().isoformat(timespec="seconds")
+    for data in reports:
+        ledger[data["company"]] = {"refreshed_at": data.get("refreshed_at"), "delivered_at": delivered_at}
+    try:
+        save_state(DELIVERED_STATE, ledger)
+    except Exception as e:
+        logger.warning(f"Could not save delivered ledger: {e}")
+
+
+def push_reports(token, reports):
+    """
+    Push a batch of company reports to their Opportunities with one composite request.
+
+    Args:
+        token: Salesforce access token
+        reports: Company report dicts (as written to data/output)
+
+    Returns:
+        tuple: (delivered company names, failed company names)
+    """
+    name_to_id = _get_opportunity_ids(token, [data["company"] for data in reports])
+
+    records, companies, failed = [], [], []
+    for data in reports:
+        opp_id = name_to_id.get(data["company"])
+        if not opp_id:
+            logger.warning(f"No Opportunity found for: {data['company']}")
+            failed.append(data["company"])
+            continue
+        records.append({"attributes": {"type": "Opportunity"}, "id": opp_id, **_opportunity_payload(data)})
+        companies.append(data["company"])
+    if not records:
+        return [], failed
+
+    resp = http_request(
+        "salesforce", "PATCH", f"{domain}/services/data/{API_VERSION}/composite/sobjects",
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        json={"allOrNone": False, "records": records},
+        timeout=60,
+    )
+    if resp.status_code != 200:
+        logger.error(f"Composite update failed: {resp.status_code} {resp.text}")
+        return [], failed + companies
+
+    delivered = []
+    for company_name, result in zip(companies, resp.json()):
+        if result.get("success"):
+            delivered.append(company_name)
+        else:
+            logger.error(f"Failed to update {company_name}: {result.get('errors')}")
+            failed.append(company_name)
+    return delivered, failed
+
+
+class StreamingDelivery:
+    """
+    Background worker that pushes company reports to Salesforce while the scrape
+    is still running, instead of waiting for the deliver phase.
+
+    Reports are queued with submit() and pushed from a worker thread in batches
+    (STREAM_BATCH_SIZE / STREAM_BATCH_WAIT), at most one request every
+    STREAM_MIN_INTERVAL seconds. Delivered reports are recorded in the delivered
+    ledger; failed ones are left for push_to_salesforce() to reconcile.
+    """
+
+    def __init__(self):
+        self.delivered = []
+        self.failed = []
+        self._queue = queue.Queue()
+        self._last_push = 0.0
+        self._thread = threading.Thread(target=self._run, name="salesforce-delivery", daemon=True)
+        self._thread.start()
+        logger.info("Streaming delivery to Salesforce started")
+
+    def submit(self, report_data):
+        """Queue a company report (dict) for delivery."""
+        self._queue.put(report_data)
+
+    def close(self, timeout=STREAM_CLOSE_TIMEOUT):
+        """Push the reports still queued and stop the worker."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Streaming delivery still busy, remaining reports are left for the deliver phase")
+        logger.info(
+            f"Streaming delivery: {len(self.delivered)} delivered, {len(self.failed)} left for the deliver phase"
+        )
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            report_data = self._queue.get()
+            if report_data is None:
+                break
+
+            # Collect more reports for the same request until the batch is full or
+            # STREAM_BATCH_WAIT passes; a later report of a company replaces the earlier one
+            batch = {report_data["company"]: report_data}
+            deadline = time.monotonic() + STREAM_BATCH_WAIT
+            while len(batch) < STREAM_BATCH_SIZE:
+                try:
+                    report_data = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if report_data is None:
+                    stopping = True
+                    break
+                batch[report_data["company"]] = report_data
+
+            self._push(list(batch.values()))
+
+    def _push(self, batch):
+        wait = self._last_push + STREAM_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_push = time.monotonic()
+
+        names = [data["company"] for data in batch]
+        try:
+            # Batches are minutes apart over a run that can outlast a token, so each gets a fresh one
+            delivered, failed = push_reports(get_access_token(), batch)
+        except CircuitOpenError as e:
+            logger.warning(f"Not delivering {names} yet: {e}")
+            delivered, failed = [], names
+        except Exception as e:
+            logger.error(f"Streaming delivery failed for {names}: {e}")
+            delivered, failed = [], names
+
+        _record_delivered([data for data in batch if data["company"] in delivered])
+        self.delivered += delivered
+        self.failed = [name for name in self.failed if name not in delivered] + failed
+        if delivered:
+            logger.info(f"Delivered to Salesforce while scraping: {delivered}")
+
+
 def import_companies_from_salesforce():
     logger.info("Starting Salesforce company import")
     token = get_access_token()
@@ -384,12 +719,24 @@ def import_companies_from_salesforce():
     company_to_owner = get_owner_emails(token, company_names)
     write_owner_mapping(company_to_owner)
 
+    company_to_contact = {}
     try:
         company_to_contact = get_primary_contacts(token, company_names)
         write_contact_mapping(company_to_contact)
     except Exception as e:
         logger.error(f"Contact mapping failed (non-fatal, continuing): {e}")
 
+    identities = {}
+    for company, location, priority in companies:
+        identities.setdefault(company, {
+            "company": company,
+            "location": location,
+            "priority": priority,
+            "owner": company_to_owner.get(company),
+            "contact": company_to_contact.get(company),
+        })
+    _remember_identities(identities)
+
     logger.info("Import complete")
 
 
@@ -4,14 +4,32 @@ import json
 import logging
 import os
 import random
+import threading
+import time
+from datetime import datetime
 from company.get_company_info import get_info
 from scrapers.linkedin_scraper_api import scrape_news_linkedin as scrape_linkedin_api
 from scrapers.linkedin_scraper_requests import scrape_news_linkedin as scrape_linkedin_requests
 from scrapers.linkedin_scraper_playwright import scrape_news_linkedin as scrape_linkedin_playwright
-from utils.summarizer import summarize_posts, generate_reachout_message, generate_potential_actions, add_posts_to_news_file, summarize_contact_posts
+from utils.summarizer import summarize_posts, generate_reachout_message, generate_potential_actions, summarize_contact_posts
 from scrapers.perplexity_scraper import scrape_news_perplexity
+from scrapers.perplexity_batch import scrape_news_bulk
 from company.serp_contact_url import get_contact_linkedin_url
 from scrapers.linkedin_contact_scraper import scrape_contact_linkedin
+from salesforce import STREAM_DELIVERY, StreamingDelivery
+from utils.cadence import record_refresh
+from utils.dedup import collapse_duplicates
+from utils.failures import begin_company_failures, failure_class, is_transient, record_failure
+from utils.gating import begin_company_gating, gate_skip_reason, log_gating_summary, set_facts
+from utils.llm_usage import begin_company, budget_skip_reason, log_usage_summary, save_usage_stats, write_run_report
+from utils.negative_cache import known_empty
+from utils.owner_digests import mark_finished
+from utils.posts import PostRecord
+from utils.report import CompanyReport
+from utils.resilience import seconds_until_probe
+from utils.run_journal import RunJournal, handle_sigterm
+from utils.scrape_history import BACKFILL_DAYS, begin_company_history, commit_scrapes, filter_seen, record_key, record_scrape, window_days
+from utils.tier_stats import DEFAULT_ORDER, latency_percentile, order_tiers, record_attempt
 
 logging.basicConfig(
     level=logging.INFO,  # change to DEBUG for more verbosity
@@ -19,6 +37,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pull news for every company up front through Perplexity's async completions API
+# (see scrapers/perplexity_batch.py) instead of one blocking search per company
+USE_BULK_NEWS = os.getenv('PERPLEXITY_BULK_NEWS', 'false').lower() == 'true'
+
+# Companies that failed transiently (timeouts, 429s, 5xx; see utils/failures.py) are
+# scraped again at the end of the run: up to RETRY_ROUNDS rounds with exponential
+# backoff from RETRY_BACKOFF_SECONDS, and at most RETRY_BUDGET re-scrapes in total
+RETRY_BUDGET = int(os.getenv('RETRY_BUDGET', '5'))
+RETRY_ROUNDS = int(os.getenv('RETRY_ROUNDS', '2'))
+RETRY_BACKOFF_SECONDS = int(os.getenv('RETRY_BACKOFF_SECONDS', '120'))
+
+# Hedged LinkedIn scraping: start the requests scraper LINKEDIN_HEDGE_DELAY seconds
+# after the BrightData trigger instead of only once BrightData has failed, and keep
+# whichever returns posts first (see _scrape_linkedin_hedged). Unset, the delay is the
+# median latency of recent successful BrightData scrapes (utils/tier_stats.py), so only
+# slower-than-usual snapshots are hedged; LINKEDIN_HEDGE_DEFAULT_DELAY until there is history
+LINKEDIN_HEDGE = os.getenv('LINKEDIN_HEDGE', 'false').lower() == 'true'
+LINKEDIN_HEDGE_DELAY = os.getenv('LINKEDIN_HEDGE_DELAY', '')
+LINKEDIN_HEDGE_DEFAULT_DELAY = float(os.getenv('LINKEDIN_HEDGE_DEFAULT_DELAY', '120'))
+
+# LinkedIn scraper tiers by name (the order they are tried in is chosen per company
+# by utils/tier_stats.order_tiers). `stats` collects the raw post count of scrapers
+# that drop already-seen posts themselves
+LINKEDIN_TIERS = {
+    'API': lambda company_info, stats: asyncio.to_thread(scrape_linkedin_api, company_info, None, stats),
+    'Requests': lambda company_info, stats: asyncio.to_thread(scrape_linkedin_requests, company_info),
+    'Playwright': lambda company_info, stats: scrape_linkedin_playwright(company_info),
+}
+
 
 def load_contact_mapping():
     """Load the company -> contact_name mapping from JSON."""
@@ -34,83 +81,339 @@ def load_contact_mapping():
         return {}
 
 
-def _add_contact_data_to_output(news_filepath, contact_name, contact_summaries):
-    """Add contact name and contact post summaries to the company output JSON."""
+def _collapse_duplicate_signals(company, report, posts, contact_posts):
+    """
+    Collapse near-duplicates across news articles, company posts and contact posts
+    (see utils/dedup.py). The report's articles are replaced with the deduplicated list.
+
+    Returns:
+        tuple: (company posts, contact posts) as PostRecords; None for a source that
+        was not scraped. The inputs are returned unchanged if deduplication failed
+    """
     try:
-        with open(news_filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        kept = collapse_duplicates(company, [
+            ("articles", report.articles if report else [],
+             lambda a: f"{a.get('headline', '')} {a.get('summary', '')}", lambda a: a.get('date')),
+            ("posts", posts, lambda p: p.text, lambda p: p.display_date),
+            ("contact_posts", contact_posts, lambda p: p.text, lambda p: p.display_date),
+        ])
+
+        if report:
+            report.articles = kept['articles']
+
+        return (
+            kept['posts'] if posts is not None else None,
+            kept['contact_posts'] if contact_posts is not None else None,
+        )
+    except Exception as e:
+        logger.warning(f"Near-duplicate detection failed for {company}, summarizing all signals: {e}")
+        return posts, contact_posts
 
-        data['contact_name'] = contact_name
-        data['contact_posts'] = contact_summaries if contact_summaries else []
 
-        with open(news_filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+def _resumed(journal, company, step):
+    """Whether a step already finished in an earlier attempt of this run (see utils/run_journal.py)."""
+    if journal and journal.is_done(company, step):
+        logger.info(f"Skipping {step} for {company}: already done in run {journal.run_id}")
+        return True
+    return False
 
-        post_count = len(data['contact_posts'])
-        logger.info(f"Added contact data to {news_filepath}: {contact_name}, {post_count} posts")
-    except Exception as e:
-        logger.warning(f"Could not add contact data to {news_filepath}: {e}")
 
+async def _scrape_linkedin_sources(company, company_info, results, journal=None):
+    """
+    Scrape company LinkedIn posts (API -> Requests -> Playwright) and the primary
+    contact's posts. Blocking scrapers run in worker threads so a concurrent news
+    pull keeps making progress. Each source is journaled once it has been scraped,
+    and taken from the journal when resuming.
 
-def ensure_posts_field(news_filepath):
+    Returns:
+        tuple: (posts, contact_posts, contact_name); posts are PostRecords, None
+        for a source that could not be scraped
     """
-    Ensure the JSON file has a 'posts' field, adding an empty array if missing.
+    if _resumed(journal, company, "linkedin"):
+        posts = [PostRecord.from_dict(p) for p in journal.output(company, "linkedin")]
+        results['linkedin_scrape'] = True
+    else:
+        started = time.monotonic()
+        posts = await _scrape_company_posts(company, company_info, results)
+        if journal and posts is not None:
+            journal.record_step(company, "linkedin", [p.to_dict() for p in posts], time.monotonic() - started)
+
+    if _resumed(journal, company, "contact"):
+        output = journal.output(company, "contact")
+        contact_name = output['contact_name']
+        contact_posts = [PostRecord.from_dict(p) for p in output['posts']] if output['posts'] is not None else None
+    else:
+        started = time.monotonic()
+        contact_posts, contact_name = await _scrape_contact_posts(company, results)
+        if journal and (contact_posts is not None or not contact_name):
+            output = {
+                'contact_name': contact_name,
+                'posts': [p.to_dict() for p in contact_posts] if contact_posts is not None else None,
+            }
+            journal.record_step(company, "contact", output, time.monotonic() - started)
+
+    return posts, contact_posts, contact_name
+
+
+async def _scrape_company_posts(company, company_info, results):
     """
-    if not news_filepath or not os.path.exists(news_filepath):
-        return False
+    Step 3: Scrape the company's LinkedIn posts, trying API -> Requests -> Playwright.
 
-    try:
-        with open(news_filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    The Requests and Playwright tiers are opt-in (USE_REQUESTS_FALLBACK,
+    USE_PLAYWRIGHT_FALLBACK). Each company's tiers are reordered or skipped from
+    their history (see utils/tier_stats.py), and with LINKEDIN_HEDGE the API and
+    Requests tiers run side by side when they come first.
 
-        if 'posts' not in data:
-            data['posts'] = []
-            with open(news_filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            logger.info(f"Added empty posts array to {news_filepath}")
+    Returns:
+        list: PostRecords, or None if every enabled scraper failed
+    """
+    if not company_info.get('linkedin'):
+        logger.info(f"No LinkedIn page known for {company}, skipping LinkedIn scrape")
+        return None
+
+    enabled = ['API']
+    if LINKEDIN_HEDGE or os.getenv('USE_REQUESTS_FALLBACK', 'false').lower() == 'true':
+        enabled.append('Requests')
+    if os.getenv('USE_PLAYWRIGHT_FALLBACK', 'false').lower() == 'true':
+        enabled.append('Playwright')
+    tiers = order_tiers(company, enabled, record_skips=True)
+
+    posts = None
+    scraper_used = None
 
-        return True
+    if LINKEDIN_HEDGE and set(tiers[:2]) == {'API', 'Requests'}:
+        hedged = [tier for tier in tiers[:2] if not gate_skip_reason(f"linkedin_{tier.lower()}")]
+        if len(hedged) == 2:
+            posts, scraper_used = await _scrape_linkedin_hedged(company, company_info, results)
+            tiers = tiers[2:]
+        else:
+            tiers = hedged + tiers[2:]
+
+    for tier in tiers:
+        if posts is not None:
+            break
+        posts = await _try_linkedin_tier(tier, company, company_info, results)
+        if posts is not None:
+            scraper_used = tier
+
+    if scraper_used:
+        logger.info(f"LinkedIn scrape completed using: {scraper_used}")
+    else:
+        disabled = [tier for tier in DEFAULT_ORDER if tier not in enabled]
+        if disabled:
+            logger.info(
+                f"LinkedIn tiers disabled: {', '.join(disabled)} "
+                f"(set USE_REQUESTS_FALLBACK / USE_PLAYWRIGHT_FALLBACK=true to enable)"
+            )
+        results['errors'].append("All enabled LinkedIn scrapers failed")
+
+    return posts
+
+
+async def _try_linkedin_tier(tier, company, company_info, results):
+    """
+    Run one LinkedIn scraper tier and record its outcome in the tier history.
+
+    Returns:
+        list: PostRecords, or None if the tier failed or was skipped by a gating rule
+    """
+    if gate_skip_reason(f"linkedin_{tier.lower()}"):
+        return None
+
+    started = time.monotonic()
+    posts = None
+    stats = {}
+    try:
+        logger.info(f"Attempting LinkedIn scrape via {tier} for {company}")
+        posts = await LINKEDIN_TIERS[tier](company_info, stats)
+        if posts is not None:
+            results['linkedin_scrape'] = True
+            logger.info(f"LinkedIn {tier} scrape successful for {company}")
+        else:
+            logger.warning(f"LinkedIn {tier} scrape returned no results for {company}")
     except Exception as e:
-        logger.warning(f"Could not ensure posts field in {news_filepath}: {e}")
-        return False
+        logger.warning(f"LinkedIn {tier} scrape failed for {company}: {e}")
+        results['errors'].append(f"LinkedIn {tier} scrape: {e}")
+
+    record_attempt(company, tier, posts, time.monotonic() - started, stats.get('raw_posts'))
+    # The BrightData scraper applies the scrape history itself
+    if posts and tier != 'API':
+        posts = _drop_seen_posts(company_info, posts)
+    return posts
+
+
+def _hedge_delay():
+    """Seconds after the BrightData trigger before the hedged requests scrape starts."""
+    if LINKEDIN_HEDGE_DELAY:
+        return float(LINKEDIN_HEDGE_DELAY)
+    median = latency_percentile('API', 50)
+    return median if median is not None else LINKEDIN_HEDGE_DEFAULT_DELAY
+
+
+def _drop_seen_posts(company_info, posts):
+    """
+    Apply the LinkedIn scrape history to PostRecords from the requests or Playwright
+    scraper, as the BrightData scraper does for its own results: posts returned by an
+    earlier scrape are dropped and the rest are recorded as seen.
+    """
+    company_name = company_info.get('name', 'Unknown')
+    scraped_at = datetime.now()
+    posts = filter_seen(company_name, "linkedin", posts, record_key)
+    record_scrape(company_name, "linkedin", posts, record_key, scraped_at)
+    return posts
+
+
+async def _scrape_linkedin_hedged(company, company_info, results):
+    """
+    Step 3, hedged: run the BrightData scrape and the requests scraper side by side.
+
+    The requests scraper starts LINKEDIN_HEDGE_DELAY seconds (see _hedge_delay) after
+    the BrightData trigger. The first tier to return posts wins (an empty incremental result from
+    BrightData also counts) and the other is cancelled: BrightData stops polling
+    its snapshot and discards it without touching the scrape history, a requests
+    scrape still in flight is ignored.
 
+    Returns:
+        tuple: (PostRecords or None, name of the winning tier or None)
+    """
+    cancel = threading.Event()
+    delay = _hedge_delay()
+    api_stats = {}
+
+    async def requests_tier():
+        await asyncio.sleep(delay)
+        logger.info(f"Hedging LinkedIn scrape for {company} with the requests scraper after {delay:.0f}s")
+        return await asyncio.to_thread(scrape_linkedin_requests, company_info)
+
+    logger.info(f"Attempting hedged LinkedIn scrape (API + Requests) for {company}")
+    tiers = {
+        asyncio.create_task(asyncio.to_thread(scrape_linkedin_api, company_info, cancel, api_stats)): 'API',
+        asyncio.create_task(requests_tier()): 'Requests',
+    }
+    pending = set(tiers)
+    posts = None
+    scraper_used = None
+    started = time.monotonic()
 
-def add_linkedin_url(news_filepath, company_info):
+    try:
+        while pending and scraper_used is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # If both finish together, prefer the API's fuller, windowed result
+            for task in sorted(done, key=lambda t: tiers[t] != 'API'):
+                tier = tiers[task]
+                latency = time.monotonic() - started - (delay if tier == 'Requests' else 0)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.warning(f"LinkedIn {tier} scrape failed for {company}: {e}")
+                    results['errors'].append(f"LinkedIn {tier} scrape: {e}")
+                    record_attempt(company, tier, None, latency)
+                    continue
+                record_attempt(company, tier, result, latency, api_stats.get('raw_posts') if tier == 'API' else None)
+
+                # The requests scraper isn't incremental, so only the API's empty list means "no new posts"
+                if result is None or (tier == 'Requests' and not result):
+                    logger.warning(f"LinkedIn {tier} scrape returned no results for {company}")
+                    continue
+                if scraper_used is None:
+                    posts = _drop_seen_posts(company_info, result) if tier == 'Requests' else result
+                    scraper_used = tier
+                    results['linkedin_scrape'] = True
+                    logger.info(f"LinkedIn {tier} scrape successful for {company}")
+    finally:
+        # Also reached when the company's scrape is cancelled (e.g. SIGTERM)
+        cancel.set()
+        for task in pending:
+            task.cancel()
+
+    if pending and scraper_used:
+        losers = ', '.join(tiers[t] for t in pending)
+        logger.info(f"Hedged LinkedIn scrape for {company} won by {scraper_used}, cancelled {losers} (not needed)")
+    return posts, scraper_used
+
+
+async def _scrape_contact_posts(company, results):
     """
-    Add linkedin_url field to the JSON file.
+    Step 3.5: Scrape the LinkedIn posts of the company's primary contact.
+
+    Returns:
+        tuple: (contact_posts, contact_name); contact_posts are PostRecords, None if
+        there is no mapped contact or the scrape failed
     """
-    if not news_filepath or not os.path.exists(news_filepath):
-        return False
+    contact_posts = None
+    contact_name = None
 
     try:
-        with open(news_filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        contact_mapping = load_contact_mapping()
+        contact_name = contact_mapping.get(company)
 
-        linkedin_id = company_info.get('linkedin') if company_info else None
-        if linkedin_id:
-            data['linkedin_url'] = f"https://www.linkedin.com/company/{linkedin_id}/posts/"
-        else:
-            data['linkedin_url'] = None
+        if contact_name and gate_skip_reason("contact"):
+            # Skipped by a gating rule (see utils/gating.py)
+            pass
+        elif contact_name and budget_skip_reason("contact_summary"):
+            logger.info(f"Skipping contact scrape for {company} to stay within token budget")
+        elif contact_name:
+            logger.info(f"Found primary contact for {company}: {contact_name}")
 
-        with open(news_filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+            contact_linkedin_url = await asyncio.to_thread(get_contact_linkedin_url, contact_name, company)
 
-        logger.info(f"Added linkedin_url to {news_filepath}")
-        return True
+            if contact_linkedin_url:
+                contact_posts = await asyncio.to_thread(
+                    scrape_contact_linkedin, contact_name, contact_linkedin_url, company
+                )
+
+                if contact_posts is None:
+                    logger.warning(f"No LinkedIn posts found for contact {contact_name}")
+            else:
+                logger.warning(f"Could not find LinkedIn URL for contact {contact_name}")
+        else:
+            logger.info(f"No primary contact mapped for {company}")
     except Exception as e:
-        logger.warning(f"Could not add linkedin_url to {news_filepath}: {e}")
-        return False
+        logger.warning(f"Contact scrape failed for {company}: {e}")
+        results['errors'].append(f"Contact scrape: {e}")
+
+    return contact_posts, contact_name
+
 
-async def scrape(company, location):
+async def _pull_news(company, company_info, journal=None):
+    """Step 2: Pull the company's news, journaling the report once it arrives."""
+    started = time.monotonic()
+    report = await scrape_news_perplexity(company_info)
+    if journal and report:
+        journal.record_step(company, "news", report.to_dict(), time.monotonic() - started)
+    return report
+
+
+async def scrape(company, location, prefetched=None, journal=None, delivery=None):
     """
     Scrape news and LinkedIn posts for a single company.
 
     This function handles failures gracefully - if one step fails,
     it will continue with subsequent steps where possible.
 
+    Args:
+        company: Company name
+        location: Company location
+        prefetched: Optional results of the bulk news stage for this company
+            (company_info, news_report, usage, history); steps already done are skipped
+        journal: Optional RunJournal; each completed step is recorded in it, and
+            steps it already holds for this company are skipped
+        delivery: Optional StreamingDelivery the finished report is pushed through
+
     Returns:
         dict: Results summary with success/failure status for each step
     """
+    prefetched = prefetched or {}
+
+    if journal and journal.completed_results(company):
+        logger.info(f"Skipping {company}: already complete in run {journal.run_id}")
+        report_data = journal.completed_report(company)
+        if report_data:
+            report = CompanyReport.from_dict(report_data)
+            if not os.path.exists(report.filename):
+                report.save()
+        return journal.completed_results(company)
+
     results = {
         'company': company,
         'location': location,
@@ -119,17 +422,37 @@ async def scrape(company, location):
         'linkedin_scrape': False,
         'contact_scrape': False,
         'summarization': False,
-        'errors': []
+        'errors': [],
+        # LLM token/cost ledger for this company, filled in as calls are made
+        'usage': begin_company(company, prefetched.get('usage')),
+        # Why steps failed and whether a retry may help, filled in by record_failure()
+        'failures': begin_company_failures(),
+        # Steps skipped by the gating rules and their estimated savings (see utils/gating.py)
+        'gated': begin_company_gating(company),
+        # New items and window ends of this company's scrapes, written to the scrape
+        # history only once the report holding the items is saved
+        'history': begin_company_history(prefetched.get('history')),
+        # Days the first news window covered, kept across retries for the refresh cadence
+        'scraped_days': prefetched.get('scraped_days'),
+        # Where the report was written (named after the company name Perplexity returned)
+        'report_path': None,
     }
 
     # Step 1: Get company info
     logger.info(f"Starting scrape for {company} in {location}")
-    try:
-        company_info = get_info(company, location)
-    except Exception as e:
-        logger.exception(f"Unexpected error getting company info for {company}: {e}")
-        company_info = None
-        results['errors'].append(f"Company info: {e}")
+    if _resumed(journal, company, "company_info"):
+        company_info = journal.output(company, "company_info")
+    else:
+        started = time.monotonic()
+        try:
+            company_info = prefetched.get('company_info') or get_info(company, location)
+        except Exception as e:
+            logger.exception(f"Unexpected error getting company info for {company}: {e}")
+            company_info = None
+            results['errors'].append(f"Company info: {e}")
+            record_failure("company_info", e)
+        if journal and company_info:
+            journal.record_step(company, "company_info", company_info, time.monotonic() - started)
 
     if not company_info:
         logger.error(f"Could not retrieve company info for {company}, skipping this company")
@@ -138,11 +461,37 @@ async def scrape(company, location):
     results['company_info'] = True
     logger.debug("Retrieved company info: %s", company_info)
 
-    # Step 2: Scrape news from Perplexity
-    news_filepath = None
+    # Step 2: Start the Perplexity news pull in the background; it runs while the
+    # LinkedIn and contact scrapes below are polling BrightData in worker threads
+    # (already done when the bulk news stage fetched this company, or earlier in a resumed run)
+    news_task = None
+    news_report = None
+    if _resumed(journal, company, "news"):
+        news_report = CompanyReport.from_dict(journal.output(company, "news"))
+    elif prefetched.get('news_report'):
+        news_report = prefetched['news_report']
+        if journal:
+            journal.record_step(company, "news", news_report.to_dict())
+    elif known_empty(company, "news", (company, location)):
+        # Perplexity recently found nothing for this company: an empty report keeps
+        # the LinkedIn signals without paying for the same search again
+        news_report = CompanyReport(company=company, industry=company_info.get('industry'))
+    else:
+        news_task = asyncio.create_task(_pull_news(company, company_info, journal))
+    try:
+        posts, contact_posts, contact_name = await _scrape_linkedin_sources(
+            company, company_info, results, journal
+        )
+    except asyncio.CancelledError:
+        if news_task:
+            news_task.cancel()
+        raise
+
+    # The company report is built in memory by the steps below and written once at the end
+    report = None
     try:
-        news_filepath = await scrape_news_perplexity(company_info, "month")
-        if news_filepath:
+        report = await news_task if news_task else news_report
+        if report:
             results['news_scrape'] = True
             logger.info(f"News scrape successful for {company}")
         else:
@@ -152,106 +501,29 @@ async def scrape(company, location):
         logger.exception(f"Unexpected error in news scrape for {company}: {e}")
         results['errors'].append(f"News scrape: {e}")
 
-    # Step 3: Scrape LinkedIn posts (try API -> Requests -> Playwright)
-    posts_filepath = None
-    scraper_used = None
+    # Step 3.6: Collapse near-duplicate articles, company posts and contact posts so
+    # each announcement is summarized and reported once
+    posts, contact_posts = _collapse_duplicate_signals(company, report, posts, contact_posts)
 
-    # Try API scraper first
-    try:
-        logger.info(f"Attempting LinkedIn scrape via API for {company}")
-        posts_filepath = scrape_linkedin_api(company_info)
-        if posts_filepath:
-            results['linkedin_scrape'] = True
-            scraper_used = 'API'
-            logger.info(f"LinkedIn API scrape successful for {company}")
-        else:
-            logger.warning(f"LinkedIn API scrape returned no results for {company}")
-    except Exception as e:
-        logger.warning(f"LinkedIn API scrape failed for {company}: {e}")
-        results['errors'].append(f"LinkedIn API scrape: {e}")
-
-    # Fall back to requests-based scraper if API failed (only if explicitly enabled)
-    use_requests_fallback = os.getenv('USE_REQUESTS_FALLBACK', 'false').lower() == 'true'
-
-    if not posts_filepath and use_requests_fallback:
-        try:
-            logger.info(f"Falling back to requests-based scraper for {company}")
-            posts_filepath = scrape_linkedin_requests(company_info)
-            if posts_filepath:
-                results['linkedin_scrape'] = True
-                scraper_used = 'Requests'
-                logger.info(f"LinkedIn requests scrape successful for {company}")
-            else:
-                logger.warning(f"LinkedIn requests scrape returned no results for {company}")
-        except Exception as e:
-            logger.warning(f"LinkedIn requests scrape failed for {company}: {e}")
-            results['errors'].append(f"LinkedIn requests scrape: {e}")
-    elif not posts_filepath and not use_requests_fallback:
-        logger.info(f"Requests fallback disabled. Set USE_REQUESTS_FALLBACK=true to enable.")
-
-    # Fall back to Playwright if both API and Requests failed (only if explicitly enabled)
-    use_playwright_fallback = os.getenv('USE_PLAYWRIGHT_FALLBACK', 'false').lower() == 'true'
-
-    if not posts_filepath and use_playwright_fallback:
+    # Step 3.7: Summarize the contact's posts
+    contact_summaries = None
+    if contact_posts is not None:
         try:
-            logger.info(f"Falling back to Playwright scraper for {company}")
-            posts_filepath = await scrape_linkedin_playwright(company_info)
-            if posts_filepath:
-                results['linkedin_scrape'] = True
-                scraper_used = 'Playwright'
-                logger.info(f"LinkedIn Playwright scrape successful for {company}")
+            contact_summaries = summarize_contact_posts(contact_posts, contact_name)
+            if contact_summaries is not None:
+                results['contact_scrape'] = True
+                logger.info(f"Contact scrape successful for {contact_name} ({company}): {len(contact_summaries)} posts")
             else:
-                logger.warning(f"LinkedIn Playwright scrape returned no results for {company}")
-                results['errors'].append("All scrapers returned None")
+                logger.warning(f"Contact post summarization returned None for {contact_name}")
         except Exception as e:
-            logger.exception(f"Unexpected error in LinkedIn Playwright scrape for {company}: {e}")
-            results['errors'].append(f"LinkedIn Playwright scrape: {e}")
-    elif not posts_filepath and not use_playwright_fallback:
-        logger.info(f"Playwright fallback disabled. Set USE_PLAYWRIGHT_FALLBACK=true to enable.")
-        if not scraper_used:
-            results['errors'].append("All enabled LinkedIn scrapers failed")
-
-    if scraper_used:
-        logger.info(f"LinkedIn scrape completed using: {scraper_used}")
-
-    # Step 3.5: Scrape contact's LinkedIn posts
-    contact_posts_filepath = None
-    contact_summaries = None
-    contact_name = None
-
-    try:
-        contact_mapping = load_contact_mapping()
-        contact_name = contact_mapping.get(company)
-
-        if contact_name:
-            logger.info(f"Found primary contact for {company}: {contact_name}")
-
-            contact_linkedin_url = get_contact_linkedin_url(contact_name, company)
-
-            if contact_linkedin_url:
-                contact_posts_filepath = scrape_contact_linkedin(contact_name, contact_linkedin_url, company)
-
-                if contact_posts_filepath:
-                    contact_summaries = summarize_contact_posts(contact_posts_filepath, contact_name)
-                    if contact_summaries is not None:
-                        results['contact_scrape'] = True
-                        logger.info(f"Contact scrape successful for {contact_name} ({company}): {len(contact_summaries)} posts")
-                    else:
-                        logger.warning(f"Contact post summarization returned None for {contact_name}")
-                else:
-                    logger.warning(f"No LinkedIn posts found for contact {contact_name}")
-            else:
-                logger.warning(f"Could not find LinkedIn URL for contact {contact_name}")
-        else:
-            logger.info(f"No primary contact mapped for {company}")
-    except Exception as e:
-        logger.warning(f"Contact scrape failed for {company}: {e}")
-        results['errors'].append(f"Contact scrape: {e}")
+            logger.warning(f"Contact post summarization failed for {company}: {e}")
+            results['errors'].append(f"Contact scrape: {e}")
 
-    # Step 4: Summarize and merge data (only if we have both files)
-    if news_filepath and posts_filepath:
+    # Step 4: Summarize and merge data (only if we have news and posts)
+    started = time.monotonic()
+    if report and posts is not None:
         try:
-            summary_result = summarize_posts(news_filepath, posts_filepath)
+            summary_result = summarize_posts(report, posts)
             if summary_result is not None:
                 results['summarization'] = True
                 logger.info(f"Summarization successful for {company}")
@@ -261,44 +533,62 @@ async def scrape(company, location):
         except Exception as e:
             logger.exception(f"Unexpected error in summarization for {company}: {e}")
             results['errors'].append(f"Summarization: {e}")
-    elif news_filepath:
+    elif report and report.articles:
         # No LinkedIn posts, but still generate reachout message and actions from news alone
         logger.info(f"No LinkedIn posts for {company} - generating actions from news only")
         try:
-            with open(news_filepath, 'r', encoding='utf-8') as f:
-                company_data = json.load(f)
-            company_name = company_data.get('company', company)
-
-            message = generate_reachout_message(company_name, [], company_data)
-            potential_actions = generate_potential_actions(company_name, [], company_data)
-            add_posts_to_news_file(news_filepath, [], message, potential_actions)
+            set_facts(signals=len(report.articles))
+            company_data = report.to_dict()
+            report.message = generate_reachout_message(report.company, [], company_data)
+            report.potential_actions = generate_potential_actions(report.company, [], company_data)
             results['summarization'] = True
         except Exception as e:
             logger.warning(f"Failed to generate actions from news for {company}: {e}")
             results['errors'].append(f"News-only actions: {e}")
+    elif report:
+        logger.info(f"Skipping summarization for {company} - no articles or LinkedIn posts to summarize")
     else:
         logger.info(f"Skipping summarization for {company} - no news data available")
+    if journal and results['summarization']:
+        journal.record_step(company, "summarization", duration=time.monotonic() - started)
+
+    # Step 5: Add the LinkedIn URL and contact activity, then write the report once
+    if report:
+        linkedin_id = company_info.get('linkedin')
+        report.linkedin_url = f"https://www.linkedin.com/company/{linkedin_id}/posts/" if linkedin_id else None
+        report.contact_name = contact_name
+        report.contact_posts = contact_summaries or []
+        report.refreshed_at = datetime.now().isoformat(timespec="seconds")
+        try:
+            report.save()
+            results['report_path'] = report.filename
+            # Posts only reach the report when summarization (or the contact summary) ran
+            saved_sources = ["news"]
+            if results['summarization'] or posts == []:
+                saved_sources.append("linkedin")
+            if contact_summaries is not None:
+                saved_sources.append("contact")
+            # The news window just scraped, read before the commit moves it on
+            if not results['scraped_days']:
+                results['scraped_days'] = window_days(company_info['name'], "news") if company_info else BACKFILL_DAYS
+            commit_scrapes(results['history'], saved_sources)
+            # Companies without news, or with transient failures, are left incomplete
+            # so a retry or resumed run repeats the steps that did not finish (and are
+            # only streamed to Salesforce once they do). Their refresh is only scored
+            # once complete, so a same-run retry does not count the window twice
+            if failure_class(results) != "transient":
+                record_refresh(company, report, results['scraped_days'])
+                if journal:
+                    journal.complete(company, report.to_dict(), results)
+                if delivery:
+                    delivery.submit(report.to_dict())
+        except Exception as e:
+            logger.exception(f"Could not save report for {company}: {e}")
+            results['errors'].append(f"Save report: {e}")
 
-    # Step 5: Ensure posts field exists in JSON (even if empty) and add linkedin_url
-    if news_filepath:
-        ensure_posts_field(news_filepath)
-        add_linkedin_url(news_filepath, company_info)
-        _add_contact_data_to_output(news_filepath, contact_name, contact_summaries)
-
-    # Cleanup: Delete LinkedIn posts file after summarization
-    try:
-        if posts_filepath and os.path.exists(posts_filepath):
-            os.remove(posts_filepath)
-            logger.info(f"Deleted posts file: {posts_filepath}")
-    except Exception as e:
-        logger.warning(f"Error deleting {posts_filepath}: {e}")
-
-    try:
-        if contact_posts_filepath and os.path.exists(contact_posts_filepath):
-            os.remove(contact_posts_filepath)
-            logger.info(f"Deleted contact posts file: {contact_posts_filepath}")
-    except Exception as e:
-        logger.warning(f"Error deleting {contact_posts_filepath}: {e}")
+    if journal:
+        durations = ", ".join(f"{step} {seconds}s" for step, seconds in journal.durations(company).items() if seconds is not None)
+        logger.info(f"Step durations for {company}: {durations or 'n/a'}")
 
     # Log summary for this company
     success_count = sum([results['company_info'], results['news_scrape'],
@@ -343,45 +633,217 @@ def read_companies_from_csv(csv_path="data/input/companies.csv"):
         logger.error(f"Error reading CSV file: {e}")
         raise
 
-async def scrape_companies(companies_list, inter_delay=True):
+async def prefetch_news(companies_list):
+    """
+    Run the bulk news stage: look up every company's info, then pull all of
+    their news at once through Perplexity's async completions API.
+
+    Returns:
+        dict: {company: {"company_info", "news_report", "usage"}} to pass to scrape()
+    """
+    company_infos = {}
+    for company, location in companies_list:
+        if known_empty(company, "news", (company, location)):
+            continue
+        try:
+            company_info = await asyncio.to_thread(get_info, company, location)
+        except Exception as e:
+            logger.warning(f"Could not get company info for {company} before bulk news stage: {e}")
+            company_info = None
+        if company_info:
+            company_infos[company] = company_info
+
+    prefetched = {company: {'company_info': info} for company, info in company_infos.items()}
+    if not company_infos:
+        return prefetched
+
+    try:
+        news = await scrape_news_bulk(company_infos)
+    except Exception as e:
+        # Companies without prefetched news fall back to per-company news pulls
+        logger.exception(f"Bulk news stage failed: {e}")
+        return prefetched
+
+    for company, result in news.items():
+        prefetched[company].update(result)
+    return prefetched
+
+
+def _critical_error_results(company, location, error):
+    """Results of a company whose scrape() raised."""
+    return {
+        'company': company,
+        'location': location,
+        'company_info': False,
+        'news_scrape': False,
+        'linkedin_scrape': False,
+        'contact_scrape': False,
+        'summarization': False,
+        'errors': [f"Critical error: {error}"],
+        'failures': [{"step": "scrape", "reason": str(error), "transient": is_transient(error)}],
+    }
+
+
+async def _retry_transient_failures(all_results, companies_list, journal, current, delivery=None):
+    """
+    Re-scrape companies whose results show a transient failure, after the rest of
+    the run is done. Steps that already succeeded are taken from the run journal,
+    so a retry only repeats what failed. all_results is updated in place.
+    """
+    initial = {r['company']: failure_class(r) for r in all_results}
+    locations = dict(companies_list)
+    budget = RETRY_BUDGET
+
+    for round_num in range(1, RETRY_ROUNDS + 1):
+        queue = [i for i, r in enumerate(all_results) if failure_class(r) == "transient"]
+        if not queue:
+            break
+        if budget <= 0:
+            logger.info(f"Retry budget used up, {len(queue)} companies left with transient failures")
+            break
+        queue = queue[:budget]
+        budget -= len(queue)
+
+        delay = RETRY_BACKOFF_SECONDS * 2 ** (round_num - 1) * random.uniform(0.8, 1.2)
+        # Don't retry into a provider whose circuit is still open
+        delay = max(delay, seconds_until_probe())
+        logger.info(f"Retry round {round_num}: {len(queue)} companies with transient failures, starting in {delay:.0f}s")
+        await asyncio.sleep(delay)
+
+        for i in queue:
+            previous = all_results[i]
+            company = previous['company']
+            logger.info(f"Retrying {company} (attempt {previous.get('retries', 0) + 2})")
+            current['company'] = company
+            try:
+                result = await scrape(
+                    company, locations[company],
+                    {key: previous.get(key) for key in ('usage', 'history', 'scraped_days')}, journal, delivery,
+                )
+            except Exception as e:
+                logger.exception(f"Critical error retrying {company}: {e}")
+                result = _critical_error_results(company, locations[company], e)
+            current['company'] = None
+            result['retries'] = previous.get('retries', 0) + 1
+            all_results[i] = result
+
+    retried = [r for r in all_results if initial.get(r['company']) == "transient"]
+    if not retried:
+        return
+    recovered = sum(1 for r in retried if failure_class(r) is None)
+    logger.info(f"Retry summary: recovered {recovered}/{len(retried)} transiently failed companies")
+    for result in all_results:
+        outcome = failure_class(result)
+        if initial.get(result['company']) == "transient" and outcome is None:
+            logger.info(f"  - {result['company']}: recovered after {result['retries']} retries")
+        elif outcome == "transient":
+            logger.info(f"  - {result['company']}: still failing after retries (transient)")
+        elif outcome == "permanent":
+            logger.info(f"  - {result['company']}: permanently failed")
+
+
+def saved_report(result, journal=None):
+    """
+    The report scrape() saved for a company, as a dict, or None if it has none.
+
+    Report files are named after the company name Perplexity returned, not the
+    companies.csv name, so the report is found through the run journal or the
+    path scrape() recorded in its results.
+
+    Args:
+        result: The company's scrape() results
+        journal: The RunJournal the company was scraped with, if any
+    """
+    report_data = journal.completed_report(result['company']) if journal else None
+    path = result.get('report_path')
+    if report_data is None and path and os.path.exists(path):
+        report_data = CompanyReport.load(path).to_dict()
+    return report_data
+
+
+async def _finish_company(result, journal):
+    """Record that the run is done with a company; sends its owner's digest if it was their last (see utils/owner_digests.py)."""
+    company = result['company']
+    try:
+        report_data = saved_report(result, journal)
+        await asyncio.to_thread(mark_finished, company, report_data)
+    except Exception as e:
+        logger.warning(f"Could not record {company} as finished for owner digests: {e}")
+
+
+async def scrape_companies(companies_list, inter_delay=True, journal=None):
     """
     Scrape a specific subset of companies with random 5-15 min delays between them.
 
+    Progress is recorded step by step in a run journal (see utils/run_journal.py).
+    On SIGTERM the journal is saved with the company in flight marked as
+    interrupted and the run stops; passing the loaded journal back in resumes it.
+    Companies that failed transiently are retried once the list is done (see
+    _retry_transient_failures). With STREAM_DELIVERY, each finished report is
+    pushed to Salesforce in the background while the rest are scraped. With
+    EARLY_DIGESTS, an owner's digest is sent as soon as all their companies are done.
+
     Args:
         companies_list: List of (company_name, location) tuples to scrape
         inter_delay: Whether to add random delays between companies
+        journal: RunJournal to record progress in (a new one is started when None)
 
     Returns:
         list: Results for each company
     """
     all_results = []
+    journal = journal or RunJournal.start(companies_list)
+    current = {'company': None}
+    remove_sigterm_handler = handle_sigterm(journal, lambda: current['company'])
+    delivery = StreamingDelivery() if STREAM_DELIVERY else None
+    finished = set()
 
-    for idx, (company, location) in enumerate(companies_list):
-        logger.info(f"{'=' * 50}")
-        logger.info(f"Processing company {idx + 1}/{len(companies_list)}: {company}")
-        logger.info(f"{'=' * 50}")
-
-        try:
-            result = await scrape(company, location)
+    try:
+        # Companies whose news is already journaled don't need the bulk stage
+        to_prefetch = [(c, loc) for c, loc in companies_list if not journal.is_done(c, "news")]
+        prefetched = await prefetch_news(to_prefetch) if USE_BULK_NEWS and to_prefetch else {}
+
+        for idx, (company, location) in enumerate(companies_list):
+            logger.info(f"{'=' * 50}")
+            logger.info(f"Processing company {idx + 1}/{len(companies_list)}: {company}")
+            logger.info(f"{'=' * 50}")
+
+            current['company'] = company
+            already_complete = bool(journal.completed_results(company))
+            try:
+                result = await scrape(company, location, prefetched.get(company), journal, delivery)
+            except Exception as e:
+                logger.exception(f"Critical error processing {company}: {e}")
+                result = _critical_error_results(company, location, e)
             all_results.append(result)
-        except Exception as e:
-            logger.exception(f"Critical error processing {company}: {e}")
-            all_results.append({
-                'company': company,
-                'location': location,
-                'company_info': False,
-                'news_scrape': False,
-                'linkedin_scrape': False,
-                'contact_scrape': False,
-                'summarization': False,
-                'errors': [f"Critical error: {e}"]
-            })
-
-        # Inter-company delay (skip after last company)
-        if inter_delay and idx < len(companies_list) - 1:
-            delay = 60
-            logger.info(f"Waiting {delay // 60}m {delay % 60}s before next company...")
-            await asyncio.sleep(delay)
+            current['company'] = None
+
+            # Companies with transient failures are finished after the retry rounds
+            if failure_class(result) != "transient":
+                finished.add(company)
+                await _finish_company(result, journal)
+
+            # Inter-company delay (skip after last company and after companies taken from the journal)
+            if inter_delay and not already_complete and idx < len(companies_list) - 1:
+                delay = 60
+                logger.info(f"Waiting {delay // 60}m {delay % 60}s before next company...")
+                await asyncio.sleep(delay)
+
+        await _retry_transient_failures(all_results, companies_list, journal, current, delivery)
+        for result in all_results:
+            if result['company'] not in finished:
+                await _finish_company(result, journal)
+    except asyncio.CancelledError:
+        journal.mark_interrupted(current['company'])
+        logger.warning(f"Run {journal.run_id} interrupted; resume with: python main.py --resume {journal.run_id}")
+        raise
+    finally:
+        remove_sigterm_handler()
+        if delivery:
+            # Reports that could not be pushed are left for the deliver phase
+            delivery.close()
+
+    journal.finish()
 
     # Log summary
     logger.info("=" * 50)
@@ -389,6 +851,10 @@ async def scrape_companies(companies_list, inter_delay=True):
     logger.info("=" * 50)
     successful = sum(1 for r in all_results if r['news_scrape'] or r['linkedin_scrape'])
     logger.info(f"Companies processed: {len(all_results)}, Successful: {successful}")
+    log_usage_summary()
+    log_gating_summary(all_results)
+    write_run_report(all_results)
+    save_usage_stats()
 
     return all_results
 
@@ -406,26 +872,19 @@ async def scrape_all_companies():
     all_results = []
     companies_list = read_companies_from_csv()
 
+    prefetched = await prefetch_news(companies_list) if USE_BULK_NEWS else {}
+
     for idx, (company, location) in enumerate(companies_list):
         logger.info(f"=" * 50)
         logger.info(f"Processing company {idx + 1}/{len(companies_list)}: {company}")
         logger.info(f"=" * 50)
 
         try:
-            result = await scrape(company, location)
+            result = await scrape(company, location, prefetched.get(company))
             all_results.append(result)
         except Exception as e:
             logger.exception(f"Critical error processing {company}, moving to next company: {e}")
-            all_results.append({
-                'company': company,
-                'location': location,
-                'company_info': False,
-                'news_scrape': False,
-                'linkedin_scrape': False,
-                'contact_scrape': False,
-                'summarization': False,
-                'errors': [f"Critical error: {e}"]
-            })
+            all_results.append(_critical_error_results(company, location, e))
 
         # Inter-company delay to avoid API rate limits (skip after last company)
         if idx < len(companies_list) - 1:
@@ -452,6 +911,11 @@ async def scrape_all_companies():
             for error in result['errors']:
                 logger.debug(f"      Error: {error}")
 
+    log_usage_summary()
+    log_gating_summary(all_results)
+    write_run_report(all_results)
+    save_usage_stats()
+
     return all_results
 
 
@@ -3,8 +3,12 @@ import json
 import logging
 import time
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 from dotenv import load_dotenv
+from utils.scrape_history import get_window_start, filter_seen, record_scrape, post_key
+from utils.posts import post_from_brightdata, dump_posts
+from utils.failures import record_failure, CircuitOpenError, TRANSIENT_STATUS_CODES
+from utils.resilience import http_request, get_breaker, brightdata_poll_interval
 
 load_dotenv()
 
@@ -22,10 +26,10 @@ def scrape_contact_linkedin(contact_name, linkedin_url, company_name):
     Args:
         contact_name: Name of the contact person
         linkedin_url: Full LinkedIn profile URL (e.g. "https://www.linkedin.com/in/nick-gannoulis-2a94991/")
-        company_name: Company name (used for output file naming)
+        company_name: Company name (used for scrape history and debug dumps)
 
     Returns:
-        str: Path to output JSON file on success
+        list: PostRecords on success (empty when an incremental scrape found no new posts)
         None: On any failure
     """
     if not linkedin_url:
@@ -38,17 +42,12 @@ def scrape_contact_linkedin(contact_name, linkedin_url, company_name):
         return None
 
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
+    start_date, incremental = get_window_start(company_name, "contact", end_date)
     start_date_str = start_date.strftime("%Y-%m-%dT%H:%M:%S.000Z")
     end_date_str = end_date.strftime("%Y-%m-%dT%H:%M:%S.000Z")
 
     logger.info(f"Scraping contact LinkedIn posts for {contact_name} ({company_name}) from {start_date_str} to {end_date_str}")
 
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    output_dir = os.path.join(project_root, "data", "output")
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, f"{company_name} Contact Posts.json")
 
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -66,12 +65,15 @@ def scrape_contact_linkedin(contact_name, linkedin_url, company_name):
     try:
         # Step 1: Trigger the scrape
         logger.info(f"Triggering BrightData profile scrape for {contact_name}...")
-        response = requests.post(
+        response = http_request(
+            "brightdata", "POST",
             "https://api.brightdata.com/datasets/v3/trigger"
             "?dataset_id=gd_lyy3tktm25m4avu764"
             "&custom_output_fields=title%2Cpost_text%2Cdate_posted"
             "&notify=false&type=discover_new&discover_by=profile_url",
             headers=headers,
+            # The scrape only counts as working once its snapshot downloads
+            closes_circuit=False,
             data=data,
         )
 
@@ -82,6 +84,7 @@ def scrape_contact_linkedin(contact_name, linkedin_url, company_name):
         snapshot_id = response.json().get("snapshot_id")
         if not snapshot_id:
             logger.error(f"No snapshot_id in trigger response: {response.text[:300]}")
+            record_failure("contact", "no snapshot_id in trigger response")
             return None
 
         logger.info(f"Scrape triggered, snapshot_id: {snapshot_id}")
@@ -89,14 +92,19 @@ def scrape_contact_linkedin(contact_name, linkedin_url, company_name):
         # Step 2: Poll for completion
         poll_url = f"https://api.brightdata.com/datasets/v3/progress/{snapshot_id}"
         max_wait = 1800
-        poll_interval = 60
+        poll_interval = brightdata_poll_interval()  # seconds between polls
         elapsed = 0
 
         while elapsed < max_wait:
             time.sleep(poll_interval)
             elapsed += poll_interval
 
-            progress_resp = requests.get(poll_url, headers={"Authorization": f"Bearer {api_key}"})
+            progress_resp = http_request(
+                "brightdata", "GET", poll_url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                closes_circuit=False,
+                follow_up=True,
+            )
             if not progress_resp.ok:
                 logger.warning(f"Progress check failed ({progress_resp.status_code}): {progress_resp.text[:200]}")
                 continue
@@ -108,20 +116,30 @@ def scrape_contact_linkedin(contact_name, linkedin_url, company_name):
                 break
             elif status == "failed":
                 logger.error(f"Snapshot failed: {progress_resp.text[:300]}")
+                record_failure("contact", f"snapshot {snapshot_id} failed")
                 return None
         else:
             logger.error(f"Snapshot {snapshot_id} did not complete within {max_wait}s")
+            record_failure("contact", f"snapshot {snapshot_id} did not complete within {max_wait}s", transient=True)
+            # A snapshot that never finishes counts against BrightData's circuit, so later
+            # companies fail fast instead of each waiting out max_wait
+            get_breaker("brightdata").record_failure()
             return None
 
         # Step 3: Download the snapshot
         logger.info(f"Downloading snapshot {snapshot_id}...")
-        download_resp = requests.get(
+        download_resp = http_request(
+            "brightdata", "GET",
             f"https://api.brightdata.com/datasets/v3/snapshot/{snapshot_id}?format=json",
             headers={"Authorization": f"Bearer {api_key}"},
         )
 
         if not download_resp.ok:
             logger.error(f"Download failed ({download_resp.status_code}): {download_resp.text[:500]}")
+            record_failure(
+                "contact", f"snapshot download failed ({download_resp.status_code})",
+                transient=download_resp.status_code in TRANSIENT_STATUS_CODES,
+            )
             return None
 
         response_text = download_resp.text.strip()
@@ -135,23 +153,29 @@ def scrape_contact_linkedin(contact_name, linkedin_url, company_name):
         else:
             posts_data = []
 
-        if not posts_data:
+        if not posts_data and not incremental:
             logger.warning(f"No posts found for contact {contact_name}")
             return None
 
-        logger.info(f"Collected {len(posts_data)} posts for {contact_name}")
+        posts_data = filter_seen(company_name, "contact", posts_data, post_key)
+        logger.info(f"Collected {len(posts_data)} new posts for {contact_name}")
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(posts_data, f, indent=2, ensure_ascii=False)
-
-        logger.info(f"Successfully saved {len(posts_data)} contact posts to {output_file}")
-        return output_file
+        posts = [post_from_brightdata(post) for post in posts_data]
+        dump_posts(f"{company_name} Contact Posts", posts)
+        record_scrape(company_name, "contact", posts_data, post_key, end_date)
+        return posts
 
+    except CircuitOpenError as e:
+        record_failure("contact", e)
+        logger.warning(f"Skipping BrightData scrape for contact {contact_name}: {e}")
+        return None
     except requests.exceptions.RequestException as e:
+        record_failure("contact", e)
         logger.error(f"API request failed for contact {contact_name}: {e}")
         return None
     except Exception as e:
         logger.exception(f"Contact LinkedIn scraper failed for {contact_name}: {e}")
+        record_failure("contact", e)
         return None
 
 
@@ -161,7 +185,7 @@ if __name__ == "__main__":
         linkedin_url="https://www.linkedin.com/in/nick-gannoulis-2a94991/",
         company_name="OnQ Software",
     )
-    if result:
-        print(f"Successfully scraped contact posts to: {result}")
+    if result is not None:
+        print(f"Successfully scraped {len(result)} contact posts")
     else:
         print("Scraping failed")
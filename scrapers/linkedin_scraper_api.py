@@ -1,10 +1,14 @@
 import os
 import json
 import logging
-import time
+import threading
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 from dotenv import load_dotenv
+from utils.scrape_history import get_window_start, filter_seen, record_scrape, post_key
+from utils.posts import post_from_brightdata, dump_posts
+from utils.failures import record_failure, CircuitOpenError, TRANSIENT_STATUS_CODES
+from utils.resilience import http_request, get_breaker, brightdata_poll_interval
 
 load_dotenv()
 
@@ -15,7 +19,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def scrape_news_linkedin(company_info):
+def scrape_news_linkedin(company_info, cancel=None, stats=None):
     """
     Scrape LinkedIn posts for a company using BrightData's API.
 
@@ -24,13 +28,19 @@ def scrape_news_linkedin(company_info):
             - name: Company name
             - linkedin: LinkedIn company ID/slug
             - city: Company city (optional, for logging)
+        cancel (threading.Event): Set when the posts are no longer needed (a hedged
+            scrape won by another scraper); polling stops and the snapshot is
+            discarded without updating the scrape history
+        stats (dict): Filled with 'raw_posts', the number of posts in the window
+            before already-seen ones are dropped (for the tier history)
 
     Returns:
-        str: Path to output JSON file on success
+        list: PostRecords on success (empty when an incremental scrape found no new posts)
         None: On any failure (missing linkedin ID, API error, etc.)
     """
     company_name = company_info.get('name', 'Unknown')
     linkedin_id = company_info.get('linkedin')
+    cancel = cancel or threading.Event()
 
     if not linkedin_id:
         logger.warning(f"No LinkedIn ID available for {company_name}, skipping LinkedIn scrape")
@@ -45,9 +55,9 @@ def scrape_news_linkedin(company_info):
     # Build LinkedIn company URL
     company_url = f"https://www.linkedin.com/company/{linkedin_id}"
 
-    # Calculate date range (last 30 days)
+    # Date range: since the last successful scrape (or a first-time backfill)
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
+    start_date, incremental = get_window_start(company_name, "linkedin", end_date)
 
     # Format dates as ISO 8601 strings
     start_date_str = start_date.strftime("%Y-%m-%dT%H:%M:%S.000Z")
@@ -55,12 +65,6 @@ def scrape_news_linkedin(company_info):
 
     logger.info(f"Scraping LinkedIn posts for {company_name} from {start_date_str} to {end_date_str}")
 
-    # Prepare output directory and file
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    output_dir = os.path.join(project_root, "data", "output")
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, f"{company_name} Linkedin Posts.json")
 
     # Prepare API request
     headers = {
@@ -79,9 +83,12 @@ def scrape_news_linkedin(company_info):
     try:
         # Step 1: Trigger the scrape (async)
         logger.info(f"Triggering BrightData scrape for {company_name}...")
-        response = requests.post(
+        response = http_request(
+            "brightdata", "POST",
             "https://api.brightdata.com/datasets/v3/trigger?dataset_id=gd_lyy3tktm25m4avu764&custom_output_fields=title%2Cpost_text%2Cdate_posted&notify=false&type=discover_new&discover_by=company_url",
             headers=headers,
+            # The scrape only counts as working once its snapshot downloads
+            closes_circuit=False,
             data=data
         )
 
@@ -92,6 +99,7 @@ def scrape_news_linkedin(company_info):
         snapshot_id = response.json().get("snapshot_id")
         if not snapshot_id:
             logger.error(f"No snapshot_id in trigger response: {response.text[:300]}")
+            record_failure("linkedin", "no snapshot_id in trigger response")
             return None
 
         logger.info(f"Scrape triggered, snapshot_id: {snapshot_id}")
@@ -99,14 +107,23 @@ def scrape_news_linkedin(company_info):
         # Step 2: Poll for completion
         poll_url = f"https://api.brightdata.com/datasets/v3/progress/{snapshot_id}"
         max_wait = 1800  # 30 minutes max
-        poll_interval = 60  # seconds between polls
+        poll_interval = brightdata_poll_interval()  # seconds between polls
         elapsed = 0
 
         while elapsed < max_wait:
-            time.sleep(poll_interval)
+            if cancel.wait(poll_interval):
+                logger.info(f"BrightData scrape for {company_name} no longer needed, stopping at snapshot {snapshot_id}")
+                return None
             elapsed += poll_interval
 
-            progress_resp = requests.get(poll_url, headers={"Authorization": f"Bearer {api_key}"})
+            # Polls go through BrightData's retries and circuit; they neither claim the
+            # half-open probe nor close the circuit (only the download does)
+            progress_resp = http_request(
+                "brightdata", "GET", poll_url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                closes_circuit=False,
+                follow_up=True,
+            )
             if not progress_resp.ok:
                 logger.warning(f"Progress check failed ({progress_resp.status_code}): {progress_resp.text[:200]}")
                 continue
@@ -118,20 +135,30 @@ def scrape_news_linkedin(company_info):
                 break
             elif status == "failed":
                 logger.error(f"Snapshot failed: {progress_resp.text[:300]}")
+                record_failure("linkedin", f"snapshot {snapshot_id} failed")
                 return None
         else:
             logger.error(f"Snapshot {snapshot_id} did not complete within {max_wait}s")
+            record_failure("linkedin", f"snapshot {snapshot_id} did not complete within {max_wait}s", transient=True)
+            # A snapshot that never finishes counts against BrightData's circuit, so later
+            # companies fail fast instead of each waiting out max_wait
+            get_breaker("brightdata").record_failure()
             return None
 
         # Step 3: Download the snapshot
         logger.info(f"Downloading snapshot {snapshot_id}...")
-        download_resp = requests.get(
+        download_resp = http_request(
+            "brightdata", "GET",
             f"https://api.brightdata.com/datasets/v3/snapshot/{snapshot_id}?format=json",
             headers={"Authorization": f"Bearer {api_key}"}
         )
 
         if not download_resp.ok:
             logger.error(f"Download failed ({download_resp.status_code}): {download_resp.text[:500]}")
+            record_failure(
+                "linkedin", f"snapshot download failed ({download_resp.status_code})",
+                transient=download_resp.status_code in TRANSIENT_STATUS_CODES,
+            )
             return None
 
         response_text = download_resp.text.strip()
@@ -147,24 +174,35 @@ def scrape_news_linkedin(company_info):
         else:
             posts_data = []
 
-        if not posts_data:
+        if not posts_data and not incremental:
             logger.error("No posts found in response")
             return None
 
-        logger.info(f"Collected {len(posts_data)} posts total")
+        if cancel.is_set():
+            logger.info(f"BrightData scrape for {company_name} no longer needed, discarding snapshot {snapshot_id}")
+            return None
 
-        # Save to JSON file
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(posts_data, f, indent=2, ensure_ascii=False)
+        if stats is not None:
+            stats['raw_posts'] = len(posts_data)
+        posts_data = filter_seen(company_name, "linkedin", posts_data, post_key)
+        logger.info(f"Collected {len(posts_data)} new posts total")
 
-        logger.info(f"Successfully saved {len(posts_data)} posts to {output_file}")
-        return output_file
+        posts = [post_from_brightdata(post) for post in posts_data]
+        dump_posts(f"{company_name} Linkedin Posts", posts)
+        record_scrape(company_name, "linkedin", posts_data, post_key, end_date)
+        return posts
 
+    except CircuitOpenError as e:
+        record_failure("linkedin", e)
+        logger.warning(f"Skipping BrightData scrape for {company_name}: {e}")
+        return None
     except requests.exceptions.RequestException as e:
+        record_failure("linkedin", e)
         logger.error(f"API request failed for {company_name}: {e}")
         return None
     except Exception as e:
         logger.exception(f"LinkedIn API scraper failed for {company_name}: {e}")
+        record_failure("linkedin", e)
         return None
 
 
@@ -180,7 +218,7 @@ if __name__ == "__main__":
     }
 
     result = scrape_news_linkedin(company_info)
-    if result:
-        print(f"Successfully scraped posts to: {result}")
+    if result is not None:
+        print(f"Successfully scraped {len(result)} posts")
     else:
         print("Scraping failed")
\ No newline at end of file
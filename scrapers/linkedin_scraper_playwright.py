@@ -1,10 +1,10 @@
-import os
 import asyncio
 import random
-import csv
 import logging
+from datetime import datetime
 from playwright.async_api import async_playwright
 from playwright_stealth import Stealth
+from utils.posts import PostRecord, parse_relative_date, parse_likes, dump_posts
 
 # -------------------------------------------------------------------
 # Logging configuration
@@ -182,7 +182,7 @@ async def scrape_news_linkedin(company_info):
     Navigates via DuckDuckGo search to appear as organic traffic.
 
     Returns:
-        str: Path to output CSV file on success
+        list: PostRecords on success
         None: On any failure (missing linkedin ID, browser error, etc.)
     """
     company_name = company_info.get('name', 'Unknown')
@@ -194,17 +194,13 @@ async def scrape_news_linkedin(company_info):
         return None
 
     search_query = f"{company_name} {company_city} Linkedin"
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    output_dir = os.path.join(project_root, "data", "output")
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, f"{company_name} Linkedin Posts.csv")
     scroll_loops = random.randint(4, 7)
 
     try:
-        success = await run(search_query, linkedin_id, scroll_loops, output_file)
-        if success:
-            return output_file
+        posts = await run(search_query, linkedin_id, scroll_loops)
+        if posts is not None:
+            dump_posts(f"{company_name} Linkedin Posts", posts)
+            return posts
         else:
             logger.warning(f"LinkedIn scrape did not complete successfully for {company_name}")
             return None
@@ -213,13 +209,13 @@ async def scrape_news_linkedin(company_info):
         return None
 
 
-async def run(search_query, linkedin_id, scroll_loops, output_file):
+async def run(search_query, linkedin_id, scroll_loops):
     """
     Run the LinkedIn public page scraper with Playwright.
     Each invocation uses a fresh incognito context with a randomised fingerprint.
 
     Returns:
-        bool: True on success, False on failure
+        list: PostRecords on success, None on failure
     """
     browser = None
     context = None
@@ -286,7 +282,7 @@ async def run(search_query, linkedin_id, scroll_loops, output_file):
                 logger.error(f"Could not find a LinkedIn company link in DuckDuckGo results for '{search_query}'")
                 await context.close()
                 await browser.close()
-                return False
+                return None
 
             href = await linkedin_link.get_attribute("href")
             logger.info(f"Found LinkedIn result: {href}. Clicking...")
@@ -310,13 +306,13 @@ async def run(search_query, linkedin_id, scroll_loops, output_file):
                 logger.error("LinkedIn auth wall hit — page requires login (expected for guest)")
                 await context.close()
                 await browser.close()
-                return False
+                return None
 
             if "checkpoint/challenge" in page.url or "security-verification" in page.url:
                 logger.error("LinkedIn CAPTCHA/security check detected")
                 await context.close()
                 await browser.close()
-                return False
+                return None
 
             # --- Step 5: Scroll down to the Updates section ---
             read_delay = random.uniform(2, 5)
@@ -350,6 +346,7 @@ async def run(search_query, linkedin_id, scroll_loops, output_file):
             logger.info(f"Found {len(posts)} posts. Parsing...")
 
             extracted_data = []
+            scraped_at = datetime.now()
 
             for idx, post in enumerate(posts):
                 try:
@@ -359,19 +356,23 @@ async def run(search_query, linkedin_id, scroll_loops, output_file):
                     if await text_loc.count() > 0:
                         text = await text_loc.inner_text()
 
-                    # Extract date (e.g. "1d", "5w", "2mo")
+                    # Extract date (e.g. "1d", "5w", "2mo"), relative to now
                     date = "Unknown"
                     date_loc = post.locator("time").first
                     if await date_loc.count() > 0:
                         date = (await date_loc.inner_text()).strip()
 
                     # Extract reaction count
-                    likes = "0"
+                    likes = None
                     likes_loc = post.locator("[data-test-id='social-actions__reaction-count']").first
                     if await likes_loc.count() > 0:
                         likes = (await likes_loc.inner_text()).strip()
 
-                    extracted_data.append([date, likes, text.replace('\n', ' ').strip()])
+                    extracted_data.append(PostRecord(
+                        date=parse_relative_date(date, scraped_at),
+                        text=text.replace('\n', ' ').strip(),
+                        likes=parse_likes(likes),
+                    ))
                     logger.debug(f"Parsed post {idx + 1}: date={date}, likes={likes}")
 
                     await asyncio.sleep(random.uniform(0.3, 1.0))
@@ -380,17 +381,11 @@ async def run(search_query, linkedin_id, scroll_loops, output_file):
                     logger.warning(f"Error parsing post {idx + 1}, skipping: {e}")
                     continue
 
-            # Save to CSV
-            with open(output_file, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Date", "Likes", "Content"])
-                writer.writerows(extracted_data)
-
-            logger.info(f"Successfully saved {len(extracted_data)} posts to {output_file}")
+            logger.info(f"Successfully parsed {len(extracted_data)} posts")
             await context.close()
             await browser.close()
             logger.info("Browser closed. Scraping complete.")
-            return True
+            return extracted_data
 
     except Exception as e:
         logger.exception(f"LinkedIn scraper error: {e}")
@@ -400,7 +395,7 @@ async def run(search_query, linkedin_id, scroll_loops, output_file):
                     await closeable.close()
                 except Exception:
                     pass
-        return False
+        return None
 
 
 if __name__ == "__main__":
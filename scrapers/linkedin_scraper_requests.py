@@ -1,4 +1,3 @@
-import os
 import re
 import json
 import time
@@ -6,6 +5,7 @@ import random
 import logging
 import requests
 from dotenv import load_dotenv
+from utils.posts import PostRecord, parse_post_date, dump_posts
 
 load_dotenv()
 
@@ -54,7 +54,7 @@ def scrape_news_linkedin(company_info):
             - linkedin: LinkedIn company ID/slug
 
     Returns:
-        str: Path to output JSON file on success
+        list: PostRecords on success
         None: On any failure
     """
     company_name = company_info.get("name", "Unknown")
@@ -66,12 +66,6 @@ def scrape_news_linkedin(company_info):
 
     url = f"https://www.linkedin.com/company/{linkedin_id}"
 
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    output_dir = os.path.join(project_root, "data", "output")
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, f"{company_name} Linkedin Posts.json")
-
     # Create a session to maintain cookies (acts like a real browser)
     session = requests.Session()
 
@@ -178,11 +172,12 @@ def scrape_news_linkedin(company_info):
 
         logger.info(f"Extracted {len(unique_posts)} unique posts")
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(unique_posts, f, indent=2, ensure_ascii=False)
-
-        logger.info(f"Saved to {output_file}")
-        return output_file
+        records = [
+            PostRecord(date=parse_post_date(p.get("date_posted")), text=p["post_text"])
+            for p in unique_posts
+        ]
+        dump_posts(f"{company_name} Linkedin Posts", records)
+        return records
 
     except requests.exceptions.RequestException as e:
         logger.error(f"Request failed: {e}")
@@ -303,6 +298,6 @@ if __name__ == "__main__":
 
     result = scrape_news_linkedin(company_info)
     if result:
-        print(f"Successfully scraped posts to: {result}")
+        print(f"Successfully scraped {len(result)} posts")
     else:
         print("Scraping failed")
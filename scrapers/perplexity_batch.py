@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import contextvars
+from types import SimpleNamespace
+from datetime import datetime
+from scrapers.perplexity_scraper import (
+    NEWS_SEARCH_CASCADE,
+    build_news_report,
+    build_news_request,
+    escalation_reason,
+    get_client,
+    news_window_start,
+)
+from utils.llm_usage import new_ledger, record_usage
+from utils.model_routing import get_route
+from utils.resilience import acall
+from utils.scrape_history import begin_company_history
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Seconds between status polls of pending requests
+POLL_INTERVAL = int(os.getenv("NEWS_BULK_POLL_INTERVAL", "5"))
+
+# Give up on a submitted request after this many seconds (queued async requests
+# can wait longer than a synchronous call's route timeout)
+MAX_WAIT = int(os.getenv("NEWS_BULK_MAX_WAIT", "900"))
+
+
+class PerplexityAsyncBackend:
+    """Submits news searches through Perplexity's async chat completions API."""
+
+    async def submit(self, request):
+        """Submit a request body and return its request ID."""
+        response = await acall("perplexity", get_client().async_.chat.completions.create, request=request)
+        return response.id
+
+    async def poll(self, request_id):
+        """
+        Return (status, response, error_message) for a submitted request.
+
+        status is one of CREATED, IN_PROGRESS, COMPLETED or FAILED; response is the
+        completion (with choices and usage) once COMPLETED.
+        """
+        result = await get_client().async_.chat.completions.get(request_id)
+        return result.status, result.response, result.error_message
+
+
+class LocalNewsBackend:
+    """
+    Local stand-in for the async completions API, for tests and offline runs.
+
+    Each submitted request is answered by `responder(request)`, which returns the
+    news dict (company and articles) or raises to simulate a failed request. The
+    answer becomes available `delay(request)` seconds after submission.
+    """
+
+    def __init__(self, responder, delay=None):
+        self.responder = responder
+        self.delay = delay or (lambda request: 0)
+        self.requests = {}
+
+    async def submit(self, request):
+        request_id = f"local-{len(self.requests) + 1}"
+        self.requests[request_id] = (request, time.monotonic() + self.delay(request))
+        return request_id
+
+    async def poll(self, request_id):
+        request, ready_at = self.requests[request_id]
+        if time.monotonic() < ready_at:
+            return "IN_PROGRESS", None, None
+        try:
+            data = self.responder(request)
+        except Exception as e:
+            return "FAILED", None, str(e)
+        message = SimpleNamespace(content=json.dumps(data))
+        return "COMPLETED", SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None), None
+
+
+async def scrape_news_bulk(company_infos, backend=None, timeframe=None):
+    """
+    Pull news for many companies at once through the async completions API.
+
+    Every company's search is submitted up front and results are collected into
+    unsaved CompanyReports as they finish, so the stage takes about as long as the
+    slowest request. With NEWS_SEARCH_CASCADE enabled, searches go to the
+    news_search_fast route first and a result that needs escalation (see
+    escalation_reason) is resubmitted on the news_search route as soon as it arrives.
+
+    Args:
+        company_infos: Dict of {company key: company info dict}
+        backend: PerplexityAsyncBackend (default) or LocalNewsBackend
+        timeframe: Fixed window for every search, or None for incremental windows
+
+    Returns:
+        dict: {company key: {"news_report": CompanyReport or None, "usage": ledger,
+        "history": held news scrape, committed by scraper.scrape() once the report is saved}}
+    """
+    backend = backend or PerplexityAsyncBackend()
+    now = datetime.now()
+    first_task = "news_search_fast" if NEWS_SEARCH_CASCADE else "news_search"
+
+    results = {key: {"news_report": None, "usage": new_ledger(key)} for key in company_infos}
+    start_dates = {key: news_window_start(info['name'], timeframe, now) for key, info in company_infos.items()}
+    pending = {}  # request_id -> (company key, task, submitted_at)
+
+    async def submit(key, task):
+        try:
+            request_id = await backend.submit(build_news_request(task, company_infos[key], start_dates[key]))
+            pending[request_id] = (key, task, time.monotonic())
+        except Exception as e:
+            logger.warning(f"Could not submit {task} for {key}: {e}")
+            if task == "news_search_fast":
+                await escalate(key, f"submit failed: {e}")
+
+    async def escalate(key, reason):
+        logger.info(
+            f"News cascade for {key}: escalating from {get_route('news_search_fast')['model']} to "
+            f"{get_route('news_search')['model']} ({reason})"
+        )
+        await submit(key, "news_search")
+
+    async def finish(key, task, response):
+        try:
+            data = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            data = None
+            logger.warning(f"Could not parse {task} result for {key}: {e}")
+
+        if task == "news_search_fast":
+            reason = escalation_reason(data) if data is not None else "unparseable result"
+            if reason:
+                await escalate(key, reason)
+                return
+            logger.info(f"News cascade for {key}: accepted {get_route(task)['model']} result ({len(data['articles'])} articles)")
+        elif data is None:
+            return
+
+        def build():
+            history = begin_company_history()
+            return build_news_report(data, company_infos[key], timeframe, now), history
+
+        try:
+            # Each company's news scrape is held in its own context until scrape() saves its report
+            results[key]["news_report"], results[key]["history"] = contextvars.copy_context().run(build)
+        except Exception:
+            logger.exception(f"Failed to build news report for {key}")
+
+    logger.info(f"Submitting {len(company_infos)} news searches ({first_task})")
+    await asyncio.gather(*(submit(key, first_task) for key in company_infos))
+
+    while pending:
+        await asyncio.sleep(POLL_INTERVAL)
+        request_ids = list(pending)
+        polls = await asyncio.gather(*(backend.poll(rid) for rid in request_ids), return_exceptions=True)
+
+        for request_id, poll in zip(request_ids, polls):
+            key, task, submitted_at = pending[request_id]
+            waited = time.monotonic() - submitted_at
+
+            if isinstance(poll, Exception):
+                logger.warning(f"Status check for {key} ({request_id}) failed: {poll}")
+                status, response, error = None, None, str(poll)
+            else:
+                status, response, error = poll
+
+            if status == "COMPLETED":
+                del pending[request_id]
+                route = get_route(task)
+                record_usage(task, response, model=route["model"], latency=waited, ledger=results[key]["usage"])
+                await finish(key, task, response)
+            elif status == "FAILED" or waited > MAX_WAIT:
+                del pending[request_id]
+                reason = error if status == "FAILED" else f"no result after {MAX_WAIT}s"
+                logger.warning(f"{task} for {key} failed: {reason}")
+                if task == "news_search_fast":
+                    await escalate(key, f"request failed: {reason}")
+
+        if pending:
+            logger.info(f"Waiting on {len(pending)} news searches")
+
+    fetched = sum(1 for r in results.values() if r["news_report"])
+    logger.info(f"Bulk news stage complete: {fetched}/{len(company_infos)} companies")
+    return results
@@ -1,10 +1,18 @@
 import os
 import json
+import time
 import asyncio
 import logging
 from dotenv import load_dotenv
-from perplexity import Perplexity
+from perplexity import AsyncPerplexity
 from datetime import datetime, timedelta
+from utils.failures import record_failure
+from utils.llm_usage import record_usage
+from utils.model_routing import get_route
+from utils.negative_cache import remember_empty
+from utils.resilience import acall
+from utils.report import CompanyReport
+from utils.scrape_history import get_window_start, filter_seen, is_backfill, record_scrape, article_key
 
 # -------------------------------------------------------------------
 # Logging configuration
@@ -20,7 +28,22 @@ logger = logging.getLogger(__name__)
 # -------------------------------------------------------------------
 load_dotenv()
 
-client = Perplexity()
+# Async client shared by all news pulls on the running event loop. main.py may call
+# asyncio.run() once per chunk, so a client (and its connection pool) is only reused
+# within the loop that created it.
+_client = None
+_client_loop = None
+
+
+def get_client():
+    """Return the shared AsyncPerplexity client for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        # Retries happen in utils/resilience.py (backoff + circuit breaker), not in the SDK
+        _client = AsyncPerplexity(max_retries=0)
+        _client_loop = loop
+    return _client
 
 article_schema = {
     "type": "json_schema",
@@ -52,6 +75,13 @@ article_schema = {
     }
 }
 
+# Run the fast search model before sonar-pro (see escalation_reason)
+NEWS_SEARCH_CASCADE = os.getenv("NEWS_SEARCH_CASCADE", "true").lower() == "true"
+
+# Minimum share of sourced, dated articles for a fast-model result to be accepted
+NEWS_MIN_CONFIDENCE = 0.5
+
+
 def parse_date(article):
     """
     Parses the date string in DD/MM/YYYY format. 
@@ -65,114 +95,262 @@ def parse_date(article):
         logger.warning(f"Could not parse date: '{date_str}'. Sorting to end.")
         return datetime.min
 
-async def scrape_news_perplexity(company_info, timeframe):
-    company_name = company_info['name']
-    company_city = company_info['city']
-    company_hq_location = company_info['hq_location']
-    company_website = company_info['website']
-    company_industry = company_info['industry']
-
-    start_date = None 
-    now = datetime.now()
+def news_window_start(company_name, timeframe, now):
+    """
+    Return the search_after_date (M/D/YYYY) for a news search.
 
-    if timeframe == "year":
-        start_date = (now - timedelta(days=365)).strftime("%-m/%-d/%Y")
+    With timeframe None the window starts at the company's last successful news
+    scrape (see utils/scrape_history.py); otherwise it is a fixed "year", "month",
+    "week" or "day" window.
+    """
+    if timeframe is None:
+        start = get_window_start(company_name, "news", now)[0]
+    elif timeframe == "year":
+        start = now - timedelta(days=365)
     elif timeframe == "month":
-        start_date = (now - timedelta(days=30)).strftime("%-m/%-d/%Y")
+        start = now - timedelta(days=30)
     elif timeframe == "week":
-        start_date = (now - timedelta(days=7)).strftime("%-m/%-d/%Y")
+        start = now - timedelta(days=7)
     elif timeframe == "day":
-        start_date = (now - timedelta(days=1)).strftime("%-m/%-d/%Y")
+        start = now - timedelta(days=1)
+    else:
+        return None
+    return start.strftime("%-m/%-d/%Y")
 
-    logger.info(f"Starting news pull for company={company_name}, location={company_city} after {start_date}")
 
-    try:
-        hq_sentence = (
-                        f"{company_name} is currently headquartered at {company_hq_location}. "
-                        if company_info.get("hq_location")
-                        else ""
-                    )
-
-        user_prompt = (
-            f"The company you will be finding news articles for is {company_name} located in {company_city}. "
-            f"{hq_sentence}"
-            f"They are primarily in the {company_industry.lower()} industries. "
-            f"Find news articles indicating growth (awards, expansion, new hires, "
-            f"partnerships, patents, financial success, etc) for {company_name}. "
-            "Only return news for this specific company and location, do not confuse it with other companies with similar names."
-        )
+def build_news_prompt(company_info):
+    """Build the Perplexity user prompt for a company's growth news."""
+    company_name = company_info['name']
+    hq_sentence = (
+        f"{company_name} is currently headquartered at {company_info['hq_location']}. "
+        if company_info.get("hq_location")
+        else ""
+    )
 
-        logger.info(f"User prompt: {user_prompt}")
+    return (
+        f"The company you will be finding news articles for is {company_name} located in {company_info['city']}. "
+        f"{hq_sentence}"
+        f"They are primarily in the {company_info['industry'].lower()} industries. "
+        f"Find news articles indicating growth (awards, expansion, new hires, "
+        f"partnerships, patents, financial success, etc) for {company_name}. "
+        "Only return news for this specific company and location, do not confuse it with other companies with similar names."
+    )
 
-        logger.info("Sending request to Perplexity model")
-        domains = [company_website, 
-                   "afr.com", 
-                   "insidesmallbusiness.com.au", 
-                   "dynamicbusiness.com",
-                   "smartcompany.com.au",
-                   "startupdaily.net",
-                   "businessnews.com.au",
-                  ]
-        
-        for domain in domains:
-            logger.info(f"Scraping {domain}")
 
-        response = client.chat.completions.create(
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": user_prompt
-                            }
-                        ],
-                        model="sonar-pro",
-                        web_search_options={
-                            "search_domain_filter": domains,
-                            "search_after_date": start_date,
-                            "user_location": {
-                                                "country": "AU",
-                                                "city": company_city,
-                                             }
-                        },
-                        response_format=article_schema
-                    )
+def news_domains(company_info):
+    """Return the search domain filter: the company's website plus Australian business media."""
+    return [company_info['website'],
+            "afr.com",
+            "insidesmallbusiness.com.au",
+            "dynamicbusiness.com",
+            "smartcompany.com.au",
+            "startupdaily.net",
+            "businessnews.com.au",
+           ]
 
-        content = response.choices[0].message.content
-        data = json.loads(content)
 
-        data["articles"] = sorted(
-            data["articles"],
-            key=parse_date,
-            reverse=True
-        )
+def build_news_request(task, company_info, start_date):
+    """
+    Build the chat completion parameters for a news search on the route for `task`.
+
+    The same dict is passed as keyword arguments to chat.completions.create and as
+    the `request` body of the async (batch) completions API.
+    """
+    route = get_route(task)
+    return {
+        "messages": [
+            {
+                "role": "user",
+                "content": build_news_prompt(company_info)
+            }
+        ],
+        "model": route["model"],
+        "max_tokens": route["max_tokens"],
+        "web_search_options": {
+            "search_domain_filter": news_domains(company_info),
+            "search_after_date": start_date,
+            "user_location": {
+                "country": "AU",
+                "city": company_info['city'],
+            }
+        },
+        "response_format": article_schema,
+    }
+
+
+async def _request_news(task, company_info, start_date):
+    """
+    Run one Perplexity news search on the model route for `task`.
 
-        logger.info(
-            "Successfully retrieved %d articles for %s",
-            len(data["articles"]),
-            company_name
+    Returns:
+        dict: The parsed JSON response (company and articles)
+    """
+    route = get_route(task)
+    started = time.monotonic()
+    # wait_for enforces the route timeout on each attempt; timeouts and other transient
+    # errors are retried behind the Perplexity circuit breaker. Cancelling the calling
+    # task cancels the in-flight request.
+    async def attempt():
+        return await asyncio.wait_for(
+            get_client().chat.completions.create(
+                **build_news_request(task, company_info, start_date),
+                timeout=route["timeout"],
+            ),
+            timeout=route["timeout"],
         )
 
-        # 1. Get the project root directory (parent of 'scrapers' folder)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        output_dir = os.path.join(project_root, "data", "output")
+    response = await acall("perplexity", attempt)
+    record_usage(task, response, model=route["model"], latency=time.monotonic() - started)
+
+    content = response.choices[0].message.content
+    return json.loads(content)
 
-        # 2. Create the 'data/output' directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
 
-        # 3. Construct the filename (e.g., "data/output/LAB Group.json")
-        # Using .get("company") ensures we use the exact name returned by the AI
-        filename = os.path.join(output_dir, f"{data.get('company', company_name)}.json")
+def escalation_reason(data):
+    """
+    Decide whether a fast-model news result should be retried on the full model.
+
+    A result is escalated when it does not match article_schema, has no articles,
+    or fewer than NEWS_MIN_CONFIDENCE of its articles have both a source URL and
+    a DD/MM/YYYY date (a sign of hallucinated or unsourced results).
+
+    Returns:
+        str: Reason to escalate
+        None: If the result can be used as is
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("articles"), list):
+        return "result does not match article_schema"
+
+    required = article_schema["json_schema"]["schema"]["properties"]["articles"]["items"]["required"]
+    articles = data["articles"]
+    if any(not isinstance(a, dict) or any(key not in a for key in required) for a in articles):
+        return "articles do not match article_schema"
+
+    if not articles:
+        return "no articles"
+
+    confident = 0
+    for article in articles:
+        try:
+            datetime.strptime(article.get("date", ""), "%d/%m/%Y")
+        except (ValueError, TypeError):
+            continue
+        if str(article.get("source_url", "")).startswith("http"):
+            confident += 1
+
+    if confident / len(articles) < NEWS_MIN_CONFIDENCE:
+        return f"low confidence ({confident}/{len(articles)} articles sourced and dated)"
+    return None
+
+
+def build_news_report(data, company_info, timeframe, now):
+    """
+    Sort and deduplicate a news search result into a new CompanyReport.
+
+    The report is not written here; scraper.scrape() saves it once all steps are done.
+
+    Args:
+        data: Parsed news search result (company and articles)
+        company_info: Company info dict
+        timeframe: The timeframe the search used (None for incremental)
+        now: Time the search window was computed; recorded as the last successful scrape
+
+    Returns:
+        CompanyReport: Report holding the company's articles
+    """
+    company_name = company_info['name']
+
+    # Only a search over a full window says the company has no news at all; an empty
+    # incremental window just means nothing new since the last scrape
+    full_window = timeframe == "year" or (timeframe is None and is_backfill(company_name, "news"))
+    if not data["articles"] and full_window:
+        remember_empty(company_name, "news", "Perplexity found no articles", (company_name, company_info['city']))
+
+    articles = sorted(
+        data["articles"],
+        key=parse_date,
+        reverse=True
+    )
+    if timeframe is None:
+        articles = filter_seen(company_name, "news", articles, article_key)
+        record_scrape(company_name, "news", articles, article_key, now)
+
+    logger.info(
+        "Successfully retrieved %d articles for %s",
+        len(articles),
+        company_name
+    )
+
+    # Using .get("company") keeps the exact name returned by the AI, which names the
+    # output file (e.g., "data/output/LAB Group.json"). The industry is kept for
+    # ranking signals against the company when building prompts.
+    return CompanyReport(
+        company=data.get('company', company_name),
+        articles=articles,
+        industry=company_info['industry'],
+    )
+
+
+async def scrape_news_perplexity(company_info, timeframe=None):
+    """
+    Pull recent growth news for a company from Perplexity.
+
+    Args:
+        company_info: Company info dict (name, city, hq_location, website, industry)
+        timeframe: Fixed window ("year", "month", "week" or "day"). When None, the
+            window starts at the last successful news scrape for this company (see
+            utils/scrape_history.py) and previously seen articles are dropped.
+
+    Returns:
+        CompanyReport: New report holding the articles, or None on failure
+    """
+    company_name = company_info['name']
+    now = datetime.now()
+    start_date = news_window_start(company_name, timeframe, now)
+
+    logger.info(f"Starting news pull for company={company_name}, location={company_info['city']} after {start_date}")
+
+    try:
+        logger.info(f"User prompt: {build_news_prompt(company_info)}")
+
+        logger.info("Sending request to Perplexity model")
+        for domain in news_domains(company_info):
+            logger.info(f"Scraping {domain}")
+
+        data = None
+        if NEWS_SEARCH_CASCADE:
+            # Try the fast search model first and only pay for sonar-pro when its
+            # result is empty, malformed or low-confidence
+            fast_model = get_route("news_search_fast")["model"]
+            try:
+                data = await _request_news("news_search_fast", company_info, start_date)
+                reason = escalation_reason(data)
+            except asyncio.TimeoutError:
+                reason = f"timed out after {get_route('news_search_fast')['timeout']}s"
+            except Exception as e:
+                reason = f"request failed: {e}"
 
-        # 4. Save the result
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+            if reason:
+                logger.info(
+                    f"News cascade for {company_name}: escalating from {fast_model} to "
+                    f"{get_route('news_search')['model']} ({reason})"
+                )
+                data = None
+            else:
+                logger.info(f"News cascade for {company_name}: accepted {fast_model} result ({len(data['articles'])} articles)")
 
-        logger.info(f"Result saved to {filename}")
+        if data is None:
+            data = await _request_news("news_search", company_info, start_date)
 
-        return filename
+        return build_news_report(data, company_info, timeframe, now)
 
-    except Exception:
+    except asyncio.TimeoutError:
+        logger.error(f"News pull for {company_name} timed out after {get_route('news_search')['timeout']}s")
+        record_failure("news", f"timed out after {get_route('news_search')['timeout']}s", transient=True)
+        return None
+    except Exception as e:
         logger.exception("Failed to pull news for %s", company_name)
+        record_failure("news", e)
         return None  # Return None to allow workflow to continue
 
 # -------------------------------------------------------------------
@@ -189,5 +367,6 @@ if __name__ == "__main__":
         'city': 'Sydney'
         }
     
-    data = asyncio.run(scrape_news_perplexity(company_info, "year"))
-    print(json.dumps(data, indent=2))
\ No newline at end of file
+    report = asyncio.run(scrape_news_perplexity(company_info, "year"))
+    if report:
+        print(json.dumps(report.to_dict(), indent=2))
\ No newline at end of file
@@ -0,0 +1,420 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import urllib.parse
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from scraper import saved_report, scrape_companies, read_companies_from_csv
+from salesforce import STREAM_BATCH_SIZE, STREAM_DELIVERY, get_access_token, import_companies_from_salesforce, push_reports
+from utils.cadence import carry_forward, plan_refresh
+from utils.llm_usage import reset_usage
+from utils.report import CompanyReport
+from utils.resilience import set_fast_polling
+from utils.run_journal import RunJournal
+from utils.state import load_state
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Local refresh API; bound to localhost only, there is no authentication
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8765"))
+
+# Hours between periodic full refreshes (Salesforce import + every company due per
+# utils/cadence.py); 0 disables them
+SERVICE_FULL_REFRESH_HOURS = float(os.getenv("SERVICE_FULL_REFRESH_HOURS", "24"))
+
+# Finished jobs kept for GET /jobs
+JOB_HISTORY = 100
+
+
+class RefreshService:
+    """
+    Resident pipeline: keeps the API clients, company list and reports warm in one
+    process and runs refresh jobs from a queue, one at a time.
+
+    Jobs are either a single company ("company") or a full refresh ("full"). Both
+    scrape through scraper.scrape_companies() with their own run journal and push
+    the refreshed reports to Salesforce. Emails stay with the monthly pipeline.
+    """
+
+    def __init__(self, full_refresh_hours=SERVICE_FULL_REFRESH_HOURS):
+        self.full_refresh_hours = full_refresh_hours
+        self.companies = {}
+        # Where each company's report was last saved by a job (files are named after
+        # the company name Perplexity returned, not the companies.csv name)
+        self.report_paths = {}
+        self.jobs = {}
+        self.next_full_refresh = None
+        self._queue = None
+        self._loop = None
+        self._lock = threading.Lock()
+
+    # ── Company list ──
+
+    def load_companies(self, import_first=True):
+        """(Re)load the company list, importing it from Salesforce first unless import_first is False."""
+        if import_first:
+            import_companies_from_salesforce()
+        self.companies = {name.lower(): (name, location) for name, location in read_companies_from_csv()}
+        logger.info(f"Service has {len(self.companies)} companies")
+
+    def find_company(self, name):
+        """Return (company_name, location) for a case-insensitive name, or None."""
+        return self.companies.get(name.strip().lower())
+
+    # ── Reports ──
+
+    def latest_report(self, company):
+        """
+        The latest report of a company: data/output first, then the copy kept with
+        the company's refresh cadence in data/state.
+
+        The output file is looked for where a job last saved it, then under the
+        company name of the cadence copy (the name Perplexity returned), then under
+        the companies.csv name.
+
+        Returns:
+            tuple: (report dict, source) or (None, None)
+        """
+        cadence_report = (load_state("cadence", default={}).get(company) or {}).get("report")
+        paths = [self.report_paths.get(company)]
+        if cadence_report and cadence_report.get("company"):
+            paths.append(CompanyReport(company=cadence_report["company"]).filename)
+        paths.append(CompanyReport(company=company).filename)
+        for path in dict.fromkeys(filter(None, paths)):
+            if os.path.exists(path):
+                try:
+                    return CompanyReport.load(path).to_dict(), "output"
+                except Exception as e:
+                    logger.warning(f"Could not read report for {company}: {e}")
+        if cadence_report:
+            return cadence_report, "cadence"
+        return None, None
+
+    # ── Jobs ──
+
+    def enqueue(self, kind, company=None):
+        """
+        Queue a refresh job (thread-safe). A job of the same kind and company that
+        is still queued or running is returned instead of queuing another.
+
+        Returns:
+            dict: The job
+        """
+        with self._lock:
+            for job in self.jobs.values():
+                if job["status"] in ("queued", "running") and job["kind"] == kind and job["company"] == company:
+                    return dict(job)
+            job = {
+                "id": uuid.uuid4().hex[:8],
+                "kind": kind,
+                "company": company,
+                "status": "queued",
+                "enqueued_at": datetime.now().isoformat(timespec="seconds"),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                "results": None,
+            }
+            self.jobs[job["id"]] = job
+            self._prune_jobs()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job["id"])
+        logger.info(f"Queued {kind} refresh job {job['id']}" + (f" for {company}" if company else ""))
+        return dict(job)
+
+    def get_job(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self):
+        with self._lock:
+            return [dict(job) for job in self.jobs.values()]
+
+    def pending_job(self, company):
+        """ID of a queued or running refresh of a company, or None."""
+        with self._lock:
+            return next(
+                (job["id"] for job in self.jobs.values()
+                 if job["company"] == company and job["status"] in ("queued", "running")),
+                None,
+            )
+
+    def _prune_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:-JOB_HISTORY]:
+            del self.jobs[job_id]
+
+    def _update_job(self, job_id, **fields):
+        with self._lock:
+            self.jobs[job_id].update(fields)
+
+    async def _run_job(self, job_id):
+        job = self.get_job(job_id)
+        self._update_job(job_id, status="running", started_at=datetime.now().isoformat(timespec="seconds"))
+        try:
+            if job["kind"] == "full":
+                results = await self._full_refresh()
+            else:
+                match = self.find_company(job["company"])
+                if not match:
+                    raise ValueError(f"{job['company']} is no longer in companies.csv")
+                set_fast_polling(True)
+                try:
+                    results = await self._refresh_companies([match], inter_delay=False)
+                finally:
+                    set_fast_polling(False)
+            summary = [
+                {"company": r["company"], "news": r["news_scrape"], "linkedin": r["linkedin_scrape"],
+                 "contact": r["contact_scrape"], "summarization": r["summarization"]}
+                for r in results
+            ]
+            self._update_job(job_id, status="done", results=summary)
+        except Exception as e:
+            logger.exception(f"Refresh job {job_id} failed: {e}")
+            self._update_job(job_id, status="failed", error=str(e))
+        finally:
+            self._update_job(job_id, finished_at=datetime.now().isoformat(timespec="seconds"))
+
+    async def _refresh_companies(self, companies, inter_delay=True):
+        """Scrape companies with a fresh run journal and push their reports to Salesforce."""
+        if not companies:
+            return []
+        # Each job is its own run for the usage stats and RUN_TOKEN_BUDGET
+        reset_usage()
+        journal = RunJournal.start(companies)
+        results = await scrape_companies(companies, inter_delay=inter_delay, journal=journal)
+        reports = self._collect_reports(results, journal)
+        if not STREAM_DELIVERY:
+            # With STREAM_DELIVERY the reports were already pushed while scraping
+            await asyncio.to_thread(self._push, reports)
+        return results
+
+    def _collect_reports(self, results, journal=None):
+        """Reports saved by a job's scrapes; remembers where each was saved for latest_report()."""
+        reports = []
+        for result in results:
+            if result.get('report_path'):
+                self.report_paths[result['company']] = result['report_path']
+            try:
+                report = saved_report(result, journal)
+            except Exception as e:
+                logger.warning(f"Could not read report for {result['company']}: {e}")
+                continue
+            if report:
+                reports.append(report)
+        return reports
+
+    async def _full_refresh(self):
+        """Re-import the company list and refresh every company that is due."""
+        await asyncio.to_thread(self.load_companies)
+        due, carried = plan_refresh(list(self.companies.values()))
+        carry_forward(carried)
+        return await self._refresh_companies(due)
+
+    def _push(self, reports):
+        if not reports:
+            return
+        try:
+            token = get_access_token()
+            for start in range(0, len(reports), STREAM_BATCH_SIZE):
+                delivered, failed = push_reports(token, reports[start:start + STREAM_BATCH_SIZE])
+                logger.info(f"Pushed to Salesforce: {len(delivered)} delivered, {len(failed)} failed")
+        except Exception as e:
+            logger.error(f"Could not push refreshed reports to Salesforce: {e}")
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            await self._run_job(job_id)
+
+    async def _scheduler(self):
+        """Queue a full refresh every full_refresh_hours."""
+        while True:
+            self.next_full_refresh = datetime.now() + timedelta(hours=self.full_refresh_hours)
+            await asyncio.sleep(self.full_refresh_hours * 3600)
+            self.enqueue("full")
+
+    async def run(self, host=SERVICE_HOST, port=SERVICE_PORT, import_first=True):
+        """Serve the refresh API and run queued jobs until interrupted."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        await asyncio.to_thread(self.load_companies, import_first)
+
+        server = ThreadingHTTPServer((host, port), _handler_for(self))
+        threading.Thread(target=server.serve_forever, name="refresh-api", daemon=True).start()
+        logger.info(f"Refresh API listening on http://{host}:{port}")
+
+        tasks = [asyncio.create_task(self._worker())]
+        if self.full_refresh_hours > 0:
+            tasks.append(asyncio.create_task(self._scheduler()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            server.shutdown()
+            logger.info("Refresh service stopped")
+
+
+def _handler_for(service):
+    """Build the HTTP request handler class of the refresh API."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _route(self):
+            url = urllib.parse.urlsplit(self.path)
+            parts = [urllib.parse.unquote(p) for p in url.path.strip("/").split("/") if p]
+            return parts, urllib.parse.parse_qs(url.query)
+
+        def do_GET(self):
+            parts, query = self._route()
+            if parts == ["health"]:
+                self._send(200, {
+                    "status": "ok",
+                    "companies": len(service.companies),
+                    "jobs": {s: sum(1 for j in service.list_jobs() if j["status"] == s) for s in ("queued", "running")},
+                    "next_full_refresh": service.next_full_refresh.isoformat(timespec="seconds")
+                    if service.next_full_refresh else None,
+                })
+            elif parts == ["companies"]:
+                self._send(200, sorted(name for name, _ in service.companies.values()))
+            elif parts == ["jobs"]:
+                self._send(200, service.list_jobs())
+            elif len(parts) == 2 and parts[0] == "jobs":
+                job = service.get_job(parts[1])
+                self._send(200, job) if job else self._send(404, {"error": f"Unknown job '{parts[1]}'"})
+            elif len(parts) == 2 and parts[0] == "reports":
+                self._report(parts[1], query)
+            else:
+                self._send(404, {"error": "Not found"})
+
+        def do_POST(self):
+            parts, _ = self._route()
+            if parts == ["refresh"]:
+                self._send(202, service.enqueue("full"))
+            elif len(parts) == 2 and parts[0] == "refresh":
+                match = service.find_company(parts[1])
+                if not match:
+                    self._send(404, {"error": f"Company '{parts[1]}' not found in companies.csv"})
+                else:
+                    self._send(202, service.enqueue("company", match[0]))
+            else:
+                self._send(404, {"error": "Not found"})
+
+        def _report(self, name, query):
+            """Latest report of a company; ?max_age_hours=N also queues a refresh when it is older."""
+            match = service.find_company(name)
+            if not match:
+                self._send(404, {"error": f"Company '{name}' not found in companies.csv"})
+                return
+            max_age_hours = None
+            if query.get("max_age_hours"):
+                try:
+                    max_age_hours = float(query["max_age_hours"][0])
+                except ValueError:
+                    self._send(400, {"error": f"max_age_hours must be a number, got '{query['max_age_hours'][0]}'"})
+                    return
+            company = match[0]
+            report, source = service.latest_report(company)
+            if report is None:
+                job = service.pending_job(company) or service.enqueue("company", company)["id"]
+                self._send(202, {"company": company, "report": None, "job": job})
+                return
+
+            refreshed = report.get("refreshed_at")
+            age_hours = (datetime.now() - datetime.fromisoformat(refreshed)).total_seconds() / 3600 if refreshed else None
+            job = service.pending_job(company)
+            if max_age_hours is not None and job is None and (age_hours is None or age_hours > max_age_hours):
+                job = service.enqueue("company", company)["id"]
+            self._send(200, {
+                "company": company,
+                "source": source,
+                "refreshed_at": refreshed,
+                "age_hours": round(age_hours, 1) if age_hours is not None else None,
+                "job": job,
+                "report": report,
+            })
+
+        def log_message(self, format, *args):
+            logger.debug(f"{self.address_string()} {format % args}")
+
+    return Handler
+
+
+def _client(method, path, port=SERVICE_PORT, **kwargs):
+    """Call the refresh API of a running service and return the decoded JSON."""
+    url = f"http://{SERVICE_HOST}:{port}{path}"
+    try:
+        response = requests.request(method, url, timeout=10, **kwargs)
+    except requests.ConnectionError:
+        sys.exit(f"No refresh service listening on {SERVICE_HOST}:{port} (start one with: python service.py serve)")
+    return response.json()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Armitage refresh service")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help="Port of the refresh API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the service: refresh API, job queue and periodic full refresh")
+    serve.add_argument(
+        "--no-import",
+        action="store_true",
+        help="Start from the existing data/input instead of importing from Salesforce",
+    )
+    serve.add_argument(
+        "--full-refresh-hours",
+        type=float,
+        default=SERVICE_FULL_REFRESH_HOURS,
+        help="Hours between periodic full refreshes (0 disables them)",
+    )
+
+    refresh = commands.add_parser("refresh", help="Queue a refresh of one company, or of every due company")
+    refresh.add_argument("company", nargs="?", help="Company name (omit for a full refresh)")
+
+    report = commands.add_parser("report", help="Print the latest report of a company")
+    report.add_argument("company")
+    report.add_argument("--max-age-hours", type=float, help="Also queue a refresh if the report is older than this")
+
+    job = commands.add_parser("job", help="Show a refresh job (all recent jobs without an ID)")
+    job.add_argument("job_id", nargs="?")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        service = RefreshService(full_refresh_hours=args.full_refresh_hours)
+        try:
+            asyncio.run(service.run(port=args.port, import_first=not args.no_import))
+        except KeyboardInterrupt:
+            pass
+        except asyncio.CancelledError:
+            # SIGTERM during a job: its run journal was saved (resume with main.py --resume)
+            sys.exit(143)
+    else:
+        if args.command == "refresh":
+            path = f"/refresh/{urllib.parse.quote(args.company)}" if args.company else "/refresh"
+            body = _client("POST", path, args.port)
+        elif args.command == "report":
+            params = {"max_age_hours": args.max_age_hours} if args.max_age_hours is not None else None
+            body = _client("GET", f"/reports/{urllib.parse.quote(args.company)}", args.port, params=params)
+        else:
+            body = _client("GET", f"/jobs/{args.job_id}" if args.job_id else "/jobs", args.port)
+        print(json.dumps(body, indent=2))
@@ -0,0 +1,102 @@
+"""
+Test for the adaptive refresh cadence (no API calls).
+
+Records refreshes for three companies in a temporary state directory:
+  - Busy Co  -> 12 signals over the first-time backfill window, then 10 a week later
+  - Quiet Co -> no signals, refreshed again each time it falls due
+  - Acme Pty -> report named by Perplexity ("Acme"), cadence kept under the input name
+
+Checks that the first refresh is normalised by the backfill window, that later
+refreshes average the rate over the time since the last one, that quiet streaks
+back the interval off up to MAX_INTERVAL_DAYS, and that plan_refresh finds each
+company under its companies.csv name.
+
+Usage:
+    python tests/test_cadence.py
+"""
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import utils.state
+from utils.cadence import MAX_INTERVAL_DAYS, STATE_NAME, plan_refresh, record_refresh
+from utils.report import CompanyReport
+from utils.scrape_history import BACKFILL_DAYS
+
+START = datetime(2026, 1, 5, 9, 0)
+
+
+def report(company, articles=0, posts=0):
+    """A report holding the given number of articles and growth posts."""
+    return CompanyReport(
+        company=company,
+        articles=[{"headline": f"News {i}"} for i in range(articles)],
+        posts=[{"summary": f"Post {i}"} for i in range(posts)],
+    )
+
+
+def main():
+    utils.state.STATE_DIR = tempfile.mkdtemp()
+    failures = []
+
+    def expect(condition, message):
+        print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+        if not condition:
+            failures.append(message)
+
+    def entry(company):
+        return utils.state.load_state(STATE_NAME, default={}).get(company, {})
+
+    print(f"\n{'='*60}")
+    print(f"Refresh cadence (backfill {BACKFILL_DAYS} days)")
+    print(f"{'='*60}")
+
+    # 12 signals over a 90-day backfill is 4 a month, not 12
+    record_refresh("Busy Co", report("Busy Co", articles=8, posts=4), BACKFILL_DAYS, now=START)
+    busy = entry("Busy Co")
+    expect(busy["rate"] == round(12 * 30 / BACKFILL_DAYS, 2), f"first refresh rate is per 30 days of the backfill ({busy['rate']})")
+    expect(busy["interval_days"] == 14, f"4 signals a month refreshes every 14 days ({busy['interval_days']})")
+
+    # 10 more signals a week later: averaged with the previous rate
+    record_refresh("Busy Co", report("Busy Co", articles=10), now=START + timedelta(days=7))
+    busy = entry("Busy Co")
+    expect(busy["rate"] == round(0.5 * 10 * 30 / 7 + 0.5 * 4, 2), f"later refresh averages the rate ({busy['rate']})")
+    expect(busy["interval_days"] == 7, f"a busier company refreshes weekly ({busy['interval_days']})")
+
+    # Each quiet refresh doubles the interval, up to MAX_INTERVAL_DAYS
+    now = START
+    intervals = []
+    for _ in range(4):
+        record_refresh("Quiet Co", report("Quiet Co"), BACKFILL_DAYS, now=now)
+        intervals.append(entry("Quiet Co")["interval_days"])
+        now += timedelta(days=intervals[-1])
+    expect(intervals == [60, MAX_INTERVAL_DAYS, MAX_INTERVAL_DAYS, MAX_INTERVAL_DAYS], f"quiet streak backs off to the cap {intervals}")
+    expect(entry("Quiet Co")["quiet_streak"] == 4, "quiet streak counts consecutive empty refreshes")
+
+    record_refresh("Quiet Co", report("Quiet Co", articles=2), now=now + timedelta(days=30))
+    expect(entry("Quiet Co")["quiet_streak"] == 0, "a refresh with signals resets the quiet streak")
+
+    # The cadence is keyed by the companies.csv name, not the name Perplexity returned
+    record_refresh("Acme Pty", report("Acme", articles=3), BACKFILL_DAYS, now=START)
+    expect(entry("Acme Pty") and not entry("Acme"), "cadence entry uses the input company name")
+
+    companies = [("Busy Co", "Sydney"), ("Acme Pty", "Sydney"), ("New Co", "Sydney")]
+    due, carried = plan_refresh(companies, now=START + timedelta(days=14))
+    due_names = [name for name, _ in due]
+    carried_names = [name for name, _ in carried]
+    expect("Busy Co" in due_names and "New Co" in due_names, f"weekly and new companies are due {due_names}")
+    expect(carried_names == ["Acme Pty"], f"Acme Pty is carried forward under its input name {carried_names}")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nPASSED")
+
+
+if __name__ == "__main__":
+    main()
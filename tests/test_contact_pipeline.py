@@ -18,9 +18,7 @@ Usage:
 """
 
 import argparse
-import json
 import logging
-import os
 import sys
 import time
 from datetime import datetime
@@ -147,22 +145,19 @@ def test_scrape(contact_urls):
 
     from scrapers.linkedin_contact_scraper import scrape_contact_linkedin
 
-    scraped = {}  # company -> filepath
+    scraped = {}  # company -> (contact_name, posts)
 
     for company, (contact_name, linkedin_url) in contact_urls.items():
         logger.info(f"  Scraping posts for {contact_name} ({company})...")
         logger.info(f"    URL: {linkedin_url}")
 
         start_time = time.time()
-        filepath = scrape_contact_linkedin(contact_name, linkedin_url, company)
+        posts = scrape_contact_linkedin(contact_name, linkedin_url, company)
         elapsed = time.time() - start_time
 
-        if filepath and os.path.exists(filepath):
-            with open(filepath, "r") as f:
-                posts = json.load(f)
-            post_count = len(posts) if isinstance(posts, list) else 1
-            logger.info(f"    Scraped {post_count} posts in {elapsed:.0f}s -> {filepath}")
-            scraped[company] = (contact_name, filepath, post_count)
+        if posts:
+            logger.info(f"    Scraped {len(posts)} posts in {elapsed:.0f}s")
+            scraped[company] = (contact_name, posts)
         else:
             logger.warning(f"    No posts returned after {elapsed:.0f}s")
 
@@ -184,10 +179,10 @@ def test_summarize(scraped):
 
     summaries = {}  # company -> (contact_name, summaries_list)
 
-    for company, (contact_name, filepath, post_count) in scraped.items():
-        logger.info(f"  Summarizing {post_count} posts for {contact_name} ({company})...")
+    for company, (contact_name, posts) in scraped.items():
+        logger.info(f"  Summarizing {len(posts)} posts for {contact_name} ({company})...")
 
-        result = summarize_contact_posts(filepath, contact_name)
+        result = summarize_contact_posts(posts, contact_name)
 
         if result is not None:
             logger.info(f"    Generated {len(result)} summaries:")
@@ -272,21 +267,6 @@ def test_push(company_to_contact, summaries):
     return pushed
 
 
-# ── Cleanup ──────────────────────────────────────────────────────────────────
-
-def cleanup(scraped):
-    """Remove intermediate Contact Posts JSON files."""
-    if not scraped:
-        return
-    for company, (contact_name, filepath, _) in scraped.items():
-        try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
-                logger.info(f"  Cleaned up: {filepath}")
-        except Exception as e:
-            logger.warning(f"  Could not delete {filepath}: {e}")
-
-
 # ── Main ─────────────────────────────────────────────────────────────────────
 
 def main():
@@ -301,11 +281,6 @@ def main():
         nargs="+",
         help="Override sample companies (space-separated Opportunity names)",
     )
-    parser.add_argument(
-        "--no-cleanup",
-        action="store_true",
-        help="Keep intermediate files after test",
-    )
     args = parser.parse_args()
 
     companies = args.companies or SAMPLE_COMPANIES
@@ -357,17 +332,17 @@ def main():
             results["scrape"] = False
     else:
         if args.step not in ("salesforce", "search"):
-            test_file = PROJECT_ROOT / "data" / "output" / "OnQ Software Contact Posts.json"
+            # Posts dumped by an earlier run with DEBUG_DUMP_POSTS=true
+            test_file = PROJECT_ROOT / "data" / "debug" / "OnQ Software Contact Posts.json"
             if test_file.exists():
                 try:
-                    with open(test_file) as f:
-                        post_count = len(json.load(f))
-                    scraped = {"OnQ Software": ("Nick Gannoulis", str(test_file), post_count)}
-                    logger.info(f"Skipping scrape step, using existing file: {test_file}")
+                    from utils.posts import load_posts
+                    scraped = {"OnQ Software": ("Nick Gannoulis", load_posts(str(test_file)))}
+                    logger.info(f"Skipping scrape step, using existing dump: {test_file}")
                 except Exception:
-                    logger.info("Skipping scrape step, existing file is corrupt")
+                    logger.info("Skipping scrape step, existing dump is corrupt")
             else:
-                logger.info("Skipping scrape step, no existing file found")
+                logger.info("Skipping scrape step, no existing dump found")
 
     # Step 4: OpenAI summarization
     if args.step in (None, "summarize"):
@@ -391,12 +366,6 @@ def main():
             logger.error(f"Step 5 crashed: {e}")
             results["push"] = False
 
-    # Cleanup
-    if not args.no_cleanup and scraped:
-        logger.info("")
-        logger.info("Cleaning up intermediate files...")
-        cleanup(scraped)
-
     # Final summary
     banner("Test Summary")
     all_pass = True
@@ -0,0 +1,70 @@
+"""
+Test for the --route override parser (no API calls).
+
+Parses route overrides of the form TASK=MODEL[:MAX_TOKENS[:TIMEOUT]], including
+fine-tuned OpenAI model IDs that contain colons, and checks that malformed
+overrides are rejected.
+
+Usage:
+    python tests/test_model_routing.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.model_routing import parse_route_override
+
+CASES = [
+    ("reachout_message=gpt-4o", {"model": "gpt-4o"}),
+    ("post_classification=gpt-4.1-nano:1500", {"model": "gpt-4.1-nano", "max_tokens": 1500}),
+    ("news_search=sonar:3000:60", {"model": "sonar", "max_tokens": 3000, "timeout": 60.0}),
+    ("news_search=sonar::60", {"model": "sonar", "timeout": 60.0}),
+    ("reachout_message=:500", {"max_tokens": 500}),
+    ("reachout_message=ft:gpt-4o-mini:org::abc123", {"model": "ft:gpt-4o-mini:org::abc123"}),
+    ("reachout_message=ft:gpt-4o-mini:org::abc123:500", {"model": "ft:gpt-4o-mini:org::abc123", "max_tokens": 500}),
+    (
+        "contact_summary=ft:gpt-4o-mini-2024-07-18:org:summaries:abc123:1500:45",
+        {"model": "ft:gpt-4o-mini-2024-07-18:org:summaries:abc123", "max_tokens": 1500, "timeout": 45.0},
+    ),
+]
+
+INVALID = [
+    "reachout_message",
+    "reachout_message=",
+    "unknown_task=gpt-4o",
+    "reachout_message=gpt-4o:1.5:60",
+]
+
+
+def main():
+    failures = []
+
+    print(f"\n{'='*60}")
+    print("Route overrides")
+    print(f"{'='*60}")
+    for spec, expected in CASES:
+        task, override = parse_route_override(spec)
+        ok = task == spec.partition("=")[0] and override == expected
+        print(f"  {'ok  ' if ok else 'FAIL'} {spec} -> {override}")
+        if not ok:
+            failures.append(f"{spec}: expected {expected}, got {override}")
+
+    for spec in INVALID:
+        try:
+            override = parse_route_override(spec)
+            print(f"  FAIL {spec} -> {override}")
+            failures.append(f"{spec}: should be rejected")
+        except ValueError as e:
+            print(f"  ok   {spec} rejected ({e})")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nPASSED")
+
+
+if __name__ == "__main__":
+    main()
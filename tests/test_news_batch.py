@@ -0,0 +1,102 @@
+"""
+Test for the bulk news stage using the local stand-in backend (no API calls).
+
+Submits three companies through scrape_news_bulk with LocalNewsBackend:
+  - Fast Co     -> the fast model finds sourced articles, accepted as is
+  - Escalate Co -> the fast model returns nothing, escalated to the full model
+  - Failing Co  -> every request fails, no report is built
+
+Checks that the stage finishes in about the time of the slowest request, not the
+sum of all of them. Reports are built in memory only, nothing is written.
+
+Usage:
+    python tests/test_news_batch.py
+"""
+import os
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Poll the stand-in backend every second instead of every 5s
+os.environ.setdefault("NEWS_BULK_POLL_INTERVAL", "1")
+
+from scrapers.perplexity_batch import LocalNewsBackend, scrape_news_bulk
+from utils.model_routing import get_route
+
+DELAY = 2  # seconds each stand-in request takes
+
+COMPANIES = {
+    name: {
+        'name': name,
+        'city': 'Sydney',
+        'hq_location': '',
+        'website': f"{name.lower().replace(' ', '')}.com.au",
+        'industry': 'Software',
+    }
+    for name in ("Fast Co", "Escalate Co", "Failing Co")
+}
+
+
+def responder(request):
+    """Answer a news request the way each test company is set up to behave."""
+    prompt = request["messages"][0]["content"]
+    company = next(name for name in COMPANIES if name in prompt)
+    fast = request["model"] == get_route("news_search_fast")["model"]
+
+    if company == "Failing Co":
+        raise RuntimeError("simulated provider failure")
+    if company == "Escalate Co" and fast:
+        return {"company": company, "articles": []}
+
+    return {
+        "company": company,
+        "articles": [{
+            "headline": f"{company} opens new office",
+            "date": "01/10/2026",
+            "summary": f"{company} expanded to a second office.",
+            "growth_type": "expansion",
+            "source_url": "https://example.com/news",
+        }],
+    }
+
+
+def main():
+    backend = LocalNewsBackend(responder, delay=lambda request: DELAY)
+
+    started = time.monotonic()
+    results = asyncio.run(scrape_news_bulk(COMPANIES, backend=backend, timeframe="month"))
+    elapsed = time.monotonic() - started
+
+    print(f"\n{'='*60}")
+    print(f"Bulk news stage finished in {elapsed:.1f}s")
+    print(f"{'='*60}")
+    for name, result in results.items():
+        report = result['news_report']
+        print(f"  {name:<15} {f'{len(report.articles)} articles' if report else 'no news'}")
+
+    failures = []
+    if not results["Fast Co"]["news_report"]:
+        failures.append("Fast Co should have news from the fast model")
+    if not results["Escalate Co"]["news_report"]:
+        failures.append("Escalate Co should have news after escalation")
+    if results["Failing Co"]["news_report"]:
+        failures.append("Failing Co should have no news")
+
+    # Fast Co and Failing Co finish in one round, Escalate Co needs two sequential requests;
+    # running one company at a time would take 5 requests' worth
+    if elapsed > 3 * DELAY + 2:
+        failures.append(f"Stage took {elapsed:.1f}s, requests did not overlap")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nPASSED")
+
+
+if __name__ == "__main__":
+    main()
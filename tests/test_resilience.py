@@ -0,0 +1,94 @@
+"""
+Test for the per-provider circuit breaker (no API calls).
+
+Walks one breaker through its states with a short cooldown:
+  - closed    -> failures below the threshold let calls through
+  - open      -> the threshold-th failure opens it, calls (and follow-ups) fail fast
+  - half_open -> after the cooldown a single probe call is let through, and
+                 follow-up calls of the probe's job (snapshot polls) still go through
+  - closed    -> a successful probe closes it again
+  - open      -> a failed probe re-opens it for another cooldown
+
+Usage:
+    python tests/test_resilience.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.failures import CircuitOpenError
+from utils.resilience import CircuitBreaker
+
+THRESHOLD = 2
+COOLDOWN = 0.5  # seconds the test breaker stays open
+
+
+def main():
+    breaker = CircuitBreaker("test", failure_threshold=THRESHOLD, cooldown=COOLDOWN)
+    failures = []
+
+    def expect(condition, message):
+        print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+        if not condition:
+            failures.append(message)
+
+    print(f"\n{'='*60}")
+    print(f"Circuit breaker (threshold {THRESHOLD}, cooldown {COOLDOWN}s)")
+    print(f"{'='*60}")
+
+    expect(breaker.state == "closed" and breaker.allow(), "starts closed and lets calls through")
+
+    breaker.record_failure()
+    expect(breaker.state == "closed" and breaker.allow(), "stays closed below the failure threshold")
+
+    breaker.record_failure()
+    expect(breaker.state == "open", "opens after consecutive failures reach the threshold")
+    expect(not breaker.allow(), "fails fast while open")
+    try:
+        breaker.check()
+        expect(False, "check() raises CircuitOpenError while open")
+    except CircuitOpenError:
+        expect(True, "check() raises CircuitOpenError while open")
+
+    try:
+        breaker.check(follow_up=True)
+        expect(False, "follow-up calls (e.g. snapshot polls) fail fast while open")
+    except CircuitOpenError:
+        expect(True, "follow-up calls (e.g. snapshot polls) fail fast while open")
+
+    time.sleep(COOLDOWN + 0.1)
+    expect(breaker.allow(), "lets a probe through after the cooldown")
+    expect(breaker.state == "half_open", "is half open while the probe runs")
+    expect(not breaker.allow(), "lets only one probe through at a time")
+    try:
+        breaker.check(follow_up=True)
+        expect(True, "lets the probe's own follow-up calls through")
+    except CircuitOpenError:
+        expect(False, "lets the probe's own follow-up calls through")
+
+    breaker.record_success()
+    expect(breaker.state == "closed" and breaker.failures == 0, "a successful probe closes it")
+    expect(breaker.allow(), "lets calls through again once closed")
+
+    # Open it again and fail the probe
+    for _ in range(THRESHOLD):
+        breaker.record_failure()
+    expect(breaker.state == "open", "opens again after another run of failures")
+    time.sleep(COOLDOWN + 0.1)
+    expect(breaker.allow() and breaker.state == "half_open", "half opens after the second cooldown")
+    breaker.record_failure()
+    expect(breaker.state == "open", "a failed probe re-opens it")
+    expect(not breaker.allow(), "fails fast for another cooldown after a failed probe")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nPASSED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Test for finding the refresh service's reports when Perplexity renames a company (no API calls).
+
+"Acme Pty" is the companies.csv (Salesforce) name; Perplexity returns "Acme", so
+scrape() writes data/output/Acme.json. Reports and state go to temporary
+directories. Checks that:
+  - a job's reports are collected from the path scrape() saved them to, so they
+    are pushed to Salesforce
+  - GET /reports serves that output file, not the cadence copy
+  - after a restart (no saved paths in memory) the file is still found through
+    the company name in the cadence copy
+
+Usage:
+    python tests/test_service.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import utils.report
+import utils.state
+from service import RefreshService
+from utils.cadence import record_refresh
+from utils.report import CompanyReport
+
+INPUT_NAME = "Acme Pty"
+PERPLEXITY_NAME = "Acme"
+
+
+def main():
+    utils.report.OUTPUT_DIR = tempfile.mkdtemp()
+    utils.state.STATE_DIR = tempfile.mkdtemp()
+    failures = []
+
+    def expect(condition, message):
+        print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+        if not condition:
+            failures.append(message)
+
+    print(f"\n{'='*60}")
+    print(f"Service reports for {INPUT_NAME} (saved as {PERPLEXITY_NAME})")
+    print(f"{'='*60}")
+
+    # What scrape() leaves behind: an older cadence copy, then the freshly saved report
+    record_refresh(INPUT_NAME, CompanyReport(company=PERPLEXITY_NAME, message="old"))
+    report = CompanyReport(company=PERPLEXITY_NAME, message="fresh")
+    report.save()
+    results = [{"company": INPUT_NAME, "report_path": report.filename}]
+
+    service = RefreshService()
+    reports = service._collect_reports(results)
+    expect([r["message"] for r in reports] == ["fresh"], "the job's saved report is collected for the Salesforce push")
+
+    latest, source = service.latest_report(INPUT_NAME)
+    expect(source == "output" and latest["message"] == "fresh", f"latest report is the output file (source: {source})")
+
+    restarted = RefreshService()
+    latest, source = restarted.latest_report(INPUT_NAME)
+    expect(source == "output" and latest["message"] == "fresh", f"found through the cadence copy's name after a restart (source: {source})")
+
+    expect(restarted.latest_report("Unknown Co") == (None, None), "a company without reports has none")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nPASSED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+from utils.report import CompanyReport
+from utils.scrape_history import BACKFILL_DAYS
+from utils.state import load_state, save_state
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Refresh each company on its own interval from its recent signal volume, carrying
+# forward the last report of companies that are not due; false re-scrapes everything
+ADAPTIVE_CADENCE = os.getenv("ADAPTIVE_CADENCE", "true").lower() == "true"
+
+# Weight of each signal in a report when scoring a company's activity
+SIGNAL_WEIGHTS = {"articles": 1.0, "posts": 1.0, "contact_posts": 0.5}
+
+# (minimum signals per 30 days, refresh interval in days), busiest first. Companies
+# on an interval under MONTHLY_DAYS are refreshed by the sub-monthly (--due-only) runs.
+CADENCE_BANDS = [(8, 7), (3, 14), (1, 30), (0, 60)]
+MONTHLY_DAYS = 30
+# Companies that stay quiet for consecutive refreshes back off up to this interval
+MAX_INTERVAL_DAYS = 90
+
+# A company is due this many days before its interval is up, so a 30-day company is
+# not pushed to the following monthly run by a short month or a late cron
+DUE_SLACK_DAYS = 3
+
+STATE_NAME = "cadence"
+
+# Companies finish (and record their refresh) one at a time, but retries and resumed
+# runs share the file, so load-modify-save is serialized
+_lock = threading.Lock()
+
+
+def signal_score(report):
+    """Weighted count of the signals in a report (articles, growth posts, contact posts)."""
+    return sum(len(getattr(report, source) or []) * weight for source, weight in SIGNAL_WEIGHTS.items())
+
+
+def refresh_interval(rate, quiet_streak):
+    """Refresh interval in days for a signal rate (signals per 30 days)."""
+    for min_rate, days in CADENCE_BANDS:
+        if rate >= min_rate:
+            interval = days
+            break
+    if rate < CADENCE_BANDS[-2][0]:
+        # Each further quiet refresh doubles the interval, up to MAX_INTERVAL_DAYS
+        interval = min(interval * 2 ** max(quiet_streak - 1, 0), MAX_INTERVAL_DAYS)
+    return interval
+
+
+def record_refresh(company, report, window_days=BACKFILL_DAYS, now=None):
+    """
+    Score a freshly written report, set the company's next refresh interval and keep
+    the report to carry forward while the company is not due.
+
+    The rate is signals per 30 days over the window since the previous refresh,
+    averaged with the previous rate so one unusual month doesn't swing the interval.
+
+    Args:
+        company: Company name as in companies.csv (what plan_refresh looks up; the
+            report's own name is the one Perplexity returned)
+        report: The saved CompanyReport
+        window_days: Days the scrape covered, used for the first refresh (a
+            first-time scrape backfills BACKFILL_DAYS)
+        now: Current time (defaults to datetime.now())
+    """
+    now = now or datetime.now()
+    score = signal_score(report)
+
+    with _lock:
+        state = load_state(STATE_NAME, default={})
+        previous = state.get(company, {})
+        if previous.get("last_refresh"):
+            window_days = max((now - datetime.fromisoformat(previous["last_refresh"])).days, 1)
+            rate = 0.5 * score * MONTHLY_DAYS / window_days + 0.5 * previous["rate"]
+        else:
+            rate = score * MONTHLY_DAYS / max(window_days, 1)
+        quiet_streak = previous.get("quiet_streak", 0) + 1 if score == 0 else 0
+        interval = refresh_interval(rate, quiet_streak)
+
+        state[company] = {
+            "rate": round(rate, 2),
+            "interval_days": interval,
+            "quiet_streak": quiet_streak,
+            "last_refresh": now.isoformat(timespec="seconds"),
+            "report": report.to_dict(),
+        }
+        try:
+            save_state(STATE_NAME, state)
+        except Exception as e:
+            logger.warning(f"Could not save refresh cadence: {e}")
+
+    logger.info(f"{company}: {score:g} signals, {rate:.1f}/month -> next refresh in {interval} days")
+
+
+def plan_refresh(companies, due_only=False, now=None):
+    """
+    Split companies into those due for a refresh and those whose last report is
+    carried forward.
+
+    Args:
+        companies: List of (company_name, location) tuples
+        due_only: Sub-monthly run: only companies on an interval shorter than a
+            month are considered, and nothing is carried forward
+        now: Current time (defaults to datetime.now())
+
+    Returns:
+        tuple: (due companies, list of (company_name, report dict) to carry forward)
+    """
+    if not ADAPTIVE_CADENCE:
+        return list(companies), []
+
+    now = now or datetime.now()
+    state = load_state(STATE_NAME, default={})
+    due, carried = [], []
+
+    for company, location in companies:
+        entry = state.get(company)
+        if not entry:
+            if not due_only:
+                due.append((company, location))
+            continue
+        if due_only and entry["interval_days"] >= MONTHLY_DAYS:
+            continue
+
+        due_at = datetime.fromisoformat(entry["last_refresh"]) + timedelta(days=entry["interval_days"] - DUE_SLACK_DAYS)
+        if now >= due_at:
+            due.append((company, location))
+        elif not due_only:
+            carried.append((company, entry["report"]))
+
+    mode = "sub-monthly" if due_only else "full"
+    logger.info(f"Refresh plan ({mode} run): {len(due)} companies due, {len(carried)} carried forward")
+    return due, carried
+
+
+def carry_forward(carried):
+    """Write the last report of each company that is not due to data/output, marked as carried forward."""
+    for company, report_data in carried:
+        try:
+            report = CompanyReport.from_dict(report_data)
+            report.carried_forward = True
+            report.save()
+            logger.info(f"Carried forward report for {company} (last refreshed {report.refreshed_at or 'unknown'})")
+        except Exception as e:
+            logger.warning(f"Could not carry forward report for {company}: {e}")
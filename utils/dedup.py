@@ -0,0 +1,151 @@
+import os
+import random
+import hashlib
+import logging
+from utils.ranking import tokenize
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Estimated Jaccard similarity (over word sets) at which two signals are treated
+# as the same announcement
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.5"))
+
+# MinHash signature length and LSH banding: 16 bands of 4 rows puts the candidate
+# threshold at about (1/16) ** (1/4) = 0.5, matching DEDUP_THRESHOLD
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(42)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def minhash(text):
+    """
+    Return the MinHash signature of the word set of `text`.
+
+    Returns:
+        tuple: NUM_PERM integers, or None if the text has no words
+    """
+    words = set(tokenize(text))
+    if not words:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(w.encode("utf-8"), digest_size=8).digest(), "big") for w in words]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH index of signals for near-duplicate lookups.
+
+    Entries are bucketed by band so a lookup only compares against candidates that
+    share at least one band, instead of every signal seen so far.
+    """
+
+    def __init__(self, threshold=DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self.signatures = {}
+        self.buckets = {}
+
+    def find(self, signature):
+        """Return the key of the most similar indexed entry above the threshold, or None."""
+        candidates = set()
+        for band in range(BANDS):
+            candidates.update(self.buckets.get(self._band_key(signature, band), ()))
+
+        best_key, best_score = None, self.threshold
+        for key in candidates:
+            score = similarity(signature, self.signatures[key])
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for band in range(BANDS):
+            self.buckets.setdefault(self._band_key(signature, band), []).append(key)
+
+    @staticmethod
+    def _band_key(signature, band):
+        return band, signature[band * ROWS:(band + 1) * ROWS]
+
+
+# Articles seen across the whole run, for linking syndicated press between companies
+_run_articles = NearDuplicateIndex()
+
+
+def _also_in(item):
+    """The 'also_in' link list of an article dict or a PostRecord."""
+    if isinstance(item, dict):
+        return item.setdefault("also_in", [])
+    return item.also_in
+
+
+def collapse_duplicates(company, streams):
+    """
+    Collapse near-duplicate signals across a company's sources.
+
+    Streams are processed in order (e.g. articles, company posts, contact posts), so
+    the first copy of an announcement is kept. Later copies are dropped and linked
+    on the kept item's 'also_in' list as {"source", "date"} (plus "url" when known).
+    Articles that match an article kept for another company earlier in the run are
+    kept, but marked with 'syndicated_with'.
+
+    Args:
+        company: Company name
+        streams: List of (source name, items, text_fn, date_fn) tuples; items are
+            article dicts or PostRecords
+
+    Returns:
+        dict: {source name: kept items, in input order}
+    """
+    index = NearDuplicateIndex()
+    kept_items = {}
+    kept = {}
+    dropped = 0
+
+    for source, items, text_fn, date_fn in streams:
+        kept[source] = []
+        for i, item in enumerate(items or []):
+            signature = minhash(text_fn(item))
+            if signature is None:
+                kept[source].append(item)
+                continue
+
+            match = index.find(signature)
+            if match is not None:
+                link = {"source": source, "date": date_fn(item)}
+                if isinstance(item, dict) and item.get("source_url"):
+                    link["url"] = item["source_url"]
+                _also_in(kept_items[match]).append(link)
+                dropped += 1
+                continue
+
+            key = (source, i)
+            index.add(key, signature)
+            kept_items[key] = item
+            kept[source].append(item)
+
+            if source == "articles":
+                other = _run_articles.find(signature)
+                if other is not None and other[0] != company:
+                    item.setdefault("syndicated_with", []).append(other[0])
+                    logger.info(f"Article '{item.get('headline', '')}' for {company} is syndicated with {other[0]}")
+                _run_articles.add((company, i), signature)
+
+    if dropped:
+        logger.info(f"Collapsed {dropped} near-duplicate signals for {company}")
+    return kept
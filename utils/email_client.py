@@ -2,6 +2,7 @@ import os
 import json
 import logging
 import smtplib
+from datetime import datetime
 from dotenv import load_dotenv
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -16,6 +17,31 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Labels for the sources a near-duplicate signal was also found in (see utils/dedup.py)
+SOURCE_LABELS = {"articles": "News", "posts": "Company LinkedIn", "contact_posts": "Contact LinkedIn"}
+
+
+def _carried_forward_html(company_data: dict) -> str:
+    """Note for a report carried forward from an earlier run (company not due for a refresh)."""
+    if not company_data.get("carried_forward"):
+        return ""
+    refreshed = (company_data.get("refreshed_at") or "")[:10]
+    since = f" on {datetime.fromisoformat(refreshed).strftime('%d/%m/%Y')}" if refreshed else ""
+    return f'<p class="meta">No new activity expected yet &mdash; carried forward from the last refresh{since}.</p>'
+
+
+def _also_in_html(item: dict) -> str:
+    """Render the sources an article or post was also found in, or '' if none."""
+    sources = []
+    for link in item.get("also_in", []):
+        label = SOURCE_LABELS.get(link.get("source"), link.get("source", ""))
+        if link.get("url"):
+            label = f'<a href="{link["url"]}">{label}</a>'
+        if label not in sources:
+            sources.append(label)
+    return f'<div class="meta">Also in: {", ".join(sources)}</div>' if sources else ""
+
+
 class EmailClient:
     def __init__(
         self,
@@ -65,6 +91,7 @@ class EmailClient:
                         <h1>{company_name}</h1>
                         <p>Growth Intelligence Report</p>
                     </div>
+                    {_carried_forward_html(company_data)}
                 """
 
         html += """
@@ -88,6 +115,7 @@ class EmailClient:
                                     </div>
                                     <div class="summary">{summary}</div>
                                     {f'<div class="meta"><a href="{source_url}">Source</a></div>' if source_url else ''}
+                                    {_also_in_html(article)}
                                 </div>
                         """
         else:
@@ -113,6 +141,7 @@ class EmailClient:
                                         {f'<span class="growth-tag">{growth_type}</span>' if growth_type else ''}
                                     </div>
                                     <div class="summary">{summary}</div>
+                                    {_also_in_html(post)}
                                 </div>
                         """
         else:
@@ -139,6 +168,7 @@ class EmailClient:
                                         {f'<span class="growth-tag" style="background: #e67e22;">{topic}</span>' if topic else ''}
                                     </div>
                                     <div class="summary">{summary}</div>
+                                    {_also_in_html(post)}
                                 </div>
                         """
         else:
@@ -247,10 +277,6 @@ def load_json_files(output_dir: str = "data/output") -> list[dict]:
 
     data = []
     for json_file in json_files:
-        # Skip LinkedIn Posts files (they are intermediate files, not company reports)
-        if "Linkedin Posts" in json_file.name or "Contact Posts" in json_file.name:
-            logger.debug(f"Skipping intermediate file: {json_file.name}")
-            continue
         try:
             with open(json_file, "r", encoding="utf-8") as f:
                 company_data = json.load(f)
@@ -342,6 +368,7 @@ def _build_digest_html(companies: list[dict]) -> str:
         html += f"""
                     <div class="company-section" id="company-{i}">
                         <h2 class="company-name">{company_name}</h2>
+                        {_carried_forward_html(company_data)}
                 """
         html += """
                             <div class="subsection">
@@ -362,6 +389,7 @@ def _build_digest_html(companies: list[dict]) -> str:
                                         {f'<div style="margin: 4px 0;"><span class="growth-tag">{growth_type}</span></div>' if growth_type else ''}
                                         {f'<p style="margin: 8px 0; color: #555;">{summary}</p>' if summary else ''}
                                         {f'<a href="{source_url}">Read more</a>' if source_url else ''}
+                                        {_also_in_html(article)}
                                     </div>
                         """
         else:
@@ -385,6 +413,7 @@ def _build_digest_html(companies: list[dict]) -> str:
                                         <div class="meta">{date}</div>
                                         {f'<div style="margin: 4px 0;"><span class="growth-tag">{growth_type}</span></div>' if growth_type else ''}
                                         {f'<p style="margin: 8px 0; color: #555;">{summary}</p>' if summary else ''}
+                                        {_also_in_html(post)}
                                     </div>
                         """
         else:
@@ -409,6 +438,7 @@ def _build_digest_html(companies: list[dict]) -> str:
                                         <div class="meta">{date}</div>
                                         {f'<div style="margin: 4px 0;"><span class="growth-tag" style="background: #e67e22;">{topic}</span></div>' if topic else ''}
                                         {f'<p style="margin: 8px 0; color: #555;">{summary}</p>' if summary else ''}
+                                        {_also_in_html(post)}
                                     </div>
                         """
         else:
@@ -497,17 +527,30 @@ def load_owner_mapping(input_dir: str = "data/input") -> dict | None:
         return None
 
 
+def send_owner_digest(client: EmailClient, owner_email: str, owner_companies: list[dict]) -> bool:
+    """Send one owner the digest of their companies."""
+    html = _build_digest_html(owner_companies)
+    subject = f"Growth Intelligence Digest - {len(owner_companies)} Companies"
+
+    success = client.send_email([owner_email], subject, html)
+    if success:
+        logger.info(f"Sent digest to {owner_email}: {[c.get('company') for c in owner_companies]}")
+    return success
+
+
 def send_owner_digests(
     fallback_recipients: list[str] = None,
     output_dir: str = "data/output",
     input_dir: str = "data/input",
+    skip_owners: set[str] = None,
 ) -> dict:
     """
     Send per-owner digest emails. Each owner receives a digest containing
     only their companies' data.
 
     Companies without a mapped owner are included in a fallback digest
-    sent to fallback_recipients (if provided).
+    sent to fallback_recipients (if provided). Owners in skip_owners already
+    received their digest this run (see utils/owner_digests.py) and are skipped.
     """
     mapping = load_owner_mapping(input_dir)
 
@@ -528,19 +571,18 @@ def send_owner_digests(
     unmapped_names = mapping.get("unmapped_companies", [])
 
     for owner_email, company_names in owner_to_companies.items():
+        if owner_email in (skip_owners or set()):
+            logger.info(f"Skipping digest for {owner_email}: already sent as soon as their companies finished")
+            continue
+
         owner_companies = [company_lookup[name] for name in company_names if name in company_lookup]
 
         if not owner_companies:
             logger.warning(f"No scraped data for {owner_email}'s companies: {company_names}")
             continue
 
-        html = _build_digest_html(owner_companies)
-        subject = f"Growth Intelligence Digest - {len(owner_companies)} Companies"
-
-        success = client.send_email([owner_email], subject, html)
-        if success:
+        if send_owner_digest(client, owner_email, owner_companies):
             results["owners_sent"] += 1
-            logger.info(f"Sent digest to {owner_email}: {[c.get('company') for c in owner_companies]}")
         else:
             results["owners_failed"] += 1
 
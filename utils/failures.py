@@ -0,0 +1,114 @@
+import logging
+import contextvars
+import openai
+import perplexity
+import requests
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying later in the run (rate limits, provider hiccups)
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open (see utils/resilience.py)."""
+
+    def __init__(self, provider, retry_in):
+        super().__init__(f"{provider} circuit open, next probe in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+# Open circuits, timeouts and dropped connections, including the OpenAI/Perplexity
+# SDK equivalents (their APITimeoutError subclasses APIConnectionError)
+TRANSIENT_ERRORS = (
+    CircuitOpenError,
+    TimeoutError,
+    ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    openai.APIConnectionError,
+    perplexity.APIConnectionError,
+)
+
+# scraper.scrape() step -> its flag in the results dict
+STEP_RESULTS = {
+    "company_info": "company_info",
+    "news": "news_scrape",
+    "linkedin": "linkedin_scrape",
+    "contact": "contact_scrape",
+    "summarization": "summarization",
+}
+
+# Failures of the company currently being scraped (set per scrape() call)
+_company_failures = contextvars.ContextVar("company_failures", default=None)
+
+
+def is_transient(error):
+    """Whether an exception is likely to succeed on a later attempt (timeout, 429, 5xx)."""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status in TRANSIENT_STATUS_CODES
+
+
+def begin_company_failures():
+    """Start recording failures for a company; calls to record_failure() after this land in the returned list."""
+    failures = []
+    _company_failures.set(failures)
+    return failures
+
+
+def record_failure(step, error, transient=None):
+    """
+    Record why a step failed for the company currently being scraped.
+
+    Args:
+        step: scrape() step ("company_info", "news", "linkedin", "contact", "summarization")
+        error: The exception, or a description of the failure
+        transient: Whether a retry later in the run may succeed; classified from
+            the exception when None (descriptions default to permanent)
+
+    Returns:
+        dict: The recorded failure ({"step", "reason", "transient"})
+    """
+    if transient is None:
+        transient = isinstance(error, BaseException) and is_transient(error)
+    failure = {"step": step, "reason": str(error) or type(error).__name__, "transient": transient}
+
+    failures = _company_failures.get()
+    if failures is not None:
+        failures.append(failure)
+    logger.debug(f"Recorded {'transient' if transient else 'permanent'} {step} failure: {failure['reason']}")
+    return failure
+
+
+def failure_class(results):
+    """
+    Classify a company's scrape results.
+
+    A step counts as failed when its results flag is False and a failure was
+    recorded for it (a contact that isn't mapped, for example, is not a failure).
+
+    Returns:
+        str: "transient" if any failed step failed transiently, "permanent" if
+        steps failed otherwise or nothing was scraped at all, None if the company succeeded
+    """
+    failed = [
+        f for f in results.get("failures", [])
+        if not results.get(STEP_RESULTS.get(f["step"], f["step"]))
+    ]
+    if any(f["transient"] for f in failed):
+        return "transient"
+    if failed or not (results.get("news_scrape") or results.get("linkedin_scrape")):
+        return "permanent"
+    return None
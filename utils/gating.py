@@ -0,0 +1,239 @@
+import os
+import csv
+import json
+import logging
+import contextvars
+from utils.state import load_state
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Skip expensive steps where GATING_RULES say they can't change a company's report;
+# false runs every step for every company
+STEP_GATING = os.getenv("STEP_GATING", "true").lower() == "true"
+
+# A step is skipped for a company when every fact in a rule's "when" matches (a list
+# matches any of its values). Facts that are unknown for a company never match.
+#
+# Steps: contact, linkedin_api, linkedin_requests, linkedin_playwright,
+#        reachout_message, potential_actions
+# Facts: priority - "Ultra High" or "High" (the Salesforce report the company came from)
+#        owner    - opportunity owner email, or "Unassigned"
+#        signals  - growth posts + articles available to the reachout message and actions
+GATING_RULES = [
+    {
+        "step": "contact",
+        "when": {"owner": "Unassigned"},
+        "reason": "no opportunity owner to act on the contact's activity",
+    },
+    {
+        "step": "linkedin_playwright",
+        "when": {"priority": "High"},
+        "reason": "Playwright fallback is reserved for Ultra High opportunities",
+    },
+    {
+        "step": ["reachout_message", "potential_actions"],
+        "when": {"signals": 0},
+        "reason": "no growth posts or articles to base it on",
+    },
+]
+
+# Rough cost of the non-LLM work a skipped step saves: provider fees (USD) and wall time (seconds)
+STEP_COSTS = {
+    "contact": {"usd": 0.02, "seconds": 120},  # SerpAPI profile search + BrightData profile scrape
+    "linkedin_api": {"usd": 0.02, "seconds": 180},
+    "linkedin_requests": {"usd": 0.0, "seconds": 20},
+    "linkedin_playwright": {"usd": 0.0, "seconds": 90},
+}
+
+# LLM calls a step leads to, priced from their recorded averages in
+# data/state/llm_stats.json, or DEFAULT_LLM_CALL until a task has been recorded
+STEP_LLM_TASKS = {
+    "contact": ["contact_summary"],
+    "reachout_message": ["reachout_message"],
+    "potential_actions": ["potential_actions"],
+}
+DEFAULT_LLM_CALL = {"usd": 0.002, "seconds": 5.0}
+
+INPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "input")
+
+# Gate of the company currently being scraped (set per scrape() call)
+_company_gate = contextvars.ContextVar("company_gate", default=None)
+
+# Average cost/latency per call of each LLM task, loaded once per run
+_llm_averages = None
+
+
+def load_company_facts(company, input_dir=INPUT_DIR):
+    """
+    Read a company's gating facts from the Salesforce import in data/input
+    (priority from companies.csv, owner from owner_mapping.json).
+
+    Returns:
+        dict: {"priority", "owner"}; None for facts that are not known
+    """
+    facts = {"priority": None, "owner": None}
+
+    try:
+        with open(os.path.join(input_dir, "companies.csv"), "r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row.get("company", "").strip() == company and row.get("priority"):
+                    facts["priority"] = row["priority"].strip()
+                    break
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not read priority for {company}: {e}")
+
+    try:
+        with open(os.path.join(input_dir, "owner_mapping.json"), "r", encoding="utf-8") as f:
+            mapping = json.load(f)
+        if company in mapping.get("unmapped_companies", []):
+            facts["owner"] = "Unassigned"
+        else:
+            facts["owner"] = next(
+                (owner for owner, names in mapping.get("owner_to_companies", {}).items() if company in names),
+                None,
+            )
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not read owner for {company}: {e}")
+
+    return facts
+
+
+def begin_company_gating(company, facts=None):
+    """
+    Start gating a company's steps; calls to gate_skip_reason() after this use its facts.
+
+    Args:
+        company: Company name
+        facts: Facts to use instead of reading them from data/input
+
+    Returns:
+        list: The company's skipped steps ({"step", "reason", "usd", "seconds"}),
+        filled in as steps are gated
+    """
+    gate = {
+        "company": company,
+        "facts": facts if facts is not None else load_company_facts(company),
+        "skipped": [],
+    }
+    _company_gate.set(gate)
+    return gate["skipped"]
+
+
+def set_facts(**facts):
+    """Add facts learned while scraping (e.g. signals) to the current company's gate."""
+    gate = _company_gate.get()
+    if gate is not None:
+        gate["facts"].update(facts)
+
+
+def _matches(rule, step, facts):
+    steps = rule["step"] if isinstance(rule["step"], list) else [rule["step"]]
+    if step not in steps:
+        return False
+    for fact, expected in rule["when"].items():
+        value = facts.get(fact)
+        if value is None:
+            return False
+        if value not in (expected if isinstance(expected, list) else [expected]):
+            return False
+    return True
+
+
+def gated_by(step, facts):
+    """
+    The first of GATING_RULES that skips a step for a company with these facts.
+
+    Returns:
+        dict: The matching rule, or None if the step may run
+    """
+    if not STEP_GATING:
+        return None
+    return next((r for r in GATING_RULES if _matches(r, step, facts)), None)
+
+
+def _average_llm_call(task):
+    """Average cost and latency of one call of an LLM task from the persisted stats."""
+    global _llm_averages
+    if _llm_averages is None:
+        _llm_averages = {}
+        for name, models in load_state("llm_stats", default={}).items():
+            calls = sum(m.get("calls", 0) for m in models.values())
+            if calls:
+                _llm_averages[name] = {
+                    "usd": sum(m.get("cost", 0.0) for m in models.values()) / calls,
+                    "seconds": sum(m.get("latency_total", 0.0) for m in models.values()) / calls,
+                }
+    return _llm_averages.get(task, DEFAULT_LLM_CALL)
+
+
+def estimate_savings(step):
+    """
+    Estimate what skipping a step saves.
+
+    Returns:
+        dict: {"usd", "seconds"}
+    """
+    cost = dict(STEP_COSTS.get(step, {"usd": 0.0, "seconds": 0.0}))
+    for task in STEP_LLM_TASKS.get(step, []):
+        call = _average_llm_call(task)
+        cost["usd"] += call["usd"]
+        cost["seconds"] += call["seconds"]
+    return {"usd": round(float(cost["usd"]), 4), "seconds": round(float(cost["seconds"]), 1)}
+
+
+def gate_skip_reason(step):
+    """
+    Check whether a step should be skipped for the current company under GATING_RULES.
+
+    Returns:
+        str: Why the step is skipped (also recorded with its estimated savings)
+        None: If the step may run
+    """
+    gate = _company_gate.get()
+    if gate is None:
+        return None
+
+    rule = gated_by(step, gate["facts"])
+    if rule is None:
+        return None
+
+    savings = estimate_savings(step)
+    logger.info(
+        f"Skipping {step} for {gate['company']}: {rule['reason']} "
+        f"(saves ~${savings['usd']:.3f}, ~{savings['seconds']:.0f}s)"
+    )
+    if not any(s["step"] == step for s in gate["skipped"]):
+        gate["skipped"].append({"step": step, "reason": rule["reason"], **savings})
+    return rule["reason"]
+
+
+def log_gating_summary(all_results):
+    """Log the steps skipped by gating across the run and their estimated savings."""
+    skipped = [s for r in all_results for s in r.get("gated", [])]
+    if not skipped:
+        return
+
+    by_step = {}
+    for s in skipped:
+        totals = by_step.setdefault(s["step"], {"count": 0, "usd": 0.0, "seconds": 0.0})
+        totals["count"] += 1
+        totals["usd"] += s["usd"]
+        totals["seconds"] += s["seconds"]
+
+    logger.info(
+        f"Step gating skipped {len(skipped)} steps, saving ~${sum(s['usd'] for s in skipped):.2f} "
+        f"and ~{sum(s['seconds'] for s in skipped) / 60:.0f} min:"
+    )
+    for step, totals in sorted(by_step.items()):
+        logger.info(f"  - {step}: {totals['count']} companies, ~${totals['usd']:.2f}, ~{totals['seconds'] / 60:.1f} min")
@@ -0,0 +1,369 @@
+import os
+import logging
+import contextvars
+from datetime import datetime
+from utils.state import load_state, save_state, write_json_atomic
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Keep this many recent latency samples per task/model in the persisted stats
+LATENCY_HISTORY = 200
+
+# USD per 1M tokens. Perplexity responses report their own cost (including
+# request and search fees), which is preferred over this table when present.
+MODEL_PRICES = {
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-4.1": {"input": 2.00, "cached_input": 0.50, "output": 8.00},
+    "gpt-4.1-mini": {"input": 0.40, "cached_input": 0.10, "output": 1.60},
+    "gpt-4.1-nano": {"input": 0.10, "cached_input": 0.025, "output": 0.40},
+    "sonar": {"input": 1.00, "cached_input": 1.00, "output": 1.00},
+    "sonar-pro": {"input": 3.00, "cached_input": 3.00, "output": 15.00},
+}
+
+# Optional tasks are dropped in this order as a company or the run approaches its
+# token budget: the fraction is how much of the budget may be used before the task
+# is skipped. Tasks not listed (post classification, news search) always run.
+DEGRADE_THRESHOLDS = {
+    "contact_summary": 0.75,
+    "potential_actions": 0.9,
+    "reachout_message": 1.0,
+}
+
+
+def _budget_from_env(name):
+    """Token budget from an environment variable; 0 (unlimited) when unset or not a whole number."""
+    value = os.getenv(name, "").strip()
+    if not value:
+        return 0
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        logger.warning(f"Ignoring {name}={value!r}: expected a whole number of tokens (e.g. 50000), running without this budget")
+        return 0
+
+
+# Token budgets (prompt + completion); 0 means unlimited
+_budgets = {
+    "company": _budget_from_env("COMPANY_TOKEN_BUDGET"),
+    "run": _budget_from_env("RUN_TOKEN_BUDGET"),
+}
+
+# Per-task, per-model totals for the current process: {task: {model: totals}}
+_task_totals = {}
+
+# Totals for the whole run (this process)
+_run_totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "cost": 0.0}
+
+# Usage ledger of the company currently being scraped (set per scrape() call)
+_company_ledger = contextvars.ContextVar("company_ledger", default=None)
+
+
+def _empty_totals():
+    return {
+        "calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_tokens": 0,
+        "cost": 0.0,
+        "latency_total": 0.0,
+        "latencies": [],
+    }
+
+
+def set_budgets(company=None, run=None):
+    """Override the per-company and per-run token budgets (0 disables a budget)."""
+    if company is not None:
+        _budgets["company"] = company
+    if run is not None:
+        _budgets["run"] = run
+    logger.info(f"Token budgets: company={_budgets['company'] or 'unlimited'}, run={_budgets['run'] or 'unlimited'}")
+
+
+def get_budgets():
+    """Current token budgets: {"company", "run"} (0 = unlimited)."""
+    return dict(_budgets)
+
+
+def reset_usage():
+    """
+    Start new run totals. A long-running process (see service.py) calls this before
+    each run, so save_usage_stats() does not merge earlier runs' calls again and the
+    run budget applies to each run rather than to the process.
+    """
+    _task_totals.clear()
+    _run_totals.update(calls=0, prompt_tokens=0, completion_tokens=0, cached_tokens=0, cost=0.0)
+
+
+def new_ledger(company):
+    """Return an empty usage ledger for a company without making it current."""
+    return {
+        "company": company,
+        "calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_tokens": 0,
+        "cost": 0.0,
+        "by_task": {},
+        "skipped_tasks": [],
+    }
+
+
+def begin_company(company, ledger=None):
+    """
+    Make a company's usage ledger current; calls recorded after this are charged to it.
+
+    Args:
+        company: Company name
+        ledger: Existing ledger to continue (e.g. one charged by the bulk news stage);
+            a fresh ledger is started when None
+    """
+    ledger = ledger if ledger is not None else new_ledger(company)
+    _company_ledger.set(ledger)
+    return ledger
+
+
+def get_company_usage():
+    """Return the usage ledger of the current company, or None outside a company scrape."""
+    return _company_ledger.get()
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens=0):
+    """Estimate the USD cost of a call from MODEL_PRICES (0.0 for unknown models)."""
+    prices = MODEL_PRICES.get(model)
+    if not prices:
+        return 0.0
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (
+        uncached * prices["input"]
+        + cached_tokens * prices["cached_input"]
+        + completion_tokens * prices["output"]
+    ) / 1_000_000
+
+
+def _add_usage(totals, call_usage):
+    totals["calls"] += 1
+    for key in ("prompt_tokens", "completion_tokens", "cached_tokens", "cost"):
+        totals[key] += call_usage[key]
+
+
+def record_usage(task, response, model=None, latency=None, ledger=None):
+    """
+    Record token usage, cost and latency from an LLM response against a task.
+
+    Usage is added to the per-task stats, the run totals and the ledger of the
+    company currently being scraped (if any, or the given ledger).
+
+    Args:
+        task: Task name (e.g. "post_classification")
+        response: Chat completion response object with a `usage` attribute
+        model: Model that served the request
+        latency: Request wall time in seconds
+        ledger: Company ledger to charge instead of the current company's
+
+    Returns:
+        dict: prompt_tokens, completion_tokens, cached_tokens and cost for this call
+        None: If the response carries no usage information
+    """
+    model = model or getattr(response, "model", None) or "unknown"
+    totals = _task_totals.setdefault(task, {}).setdefault(model, _empty_totals())
+    totals["calls"] += 1
+    if latency is not None:
+        totals["latency_total"] += latency
+        totals["latencies"].append(round(latency, 3))
+
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        logger.debug(f"No usage information on {task} response")
+        return None
+
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+
+    # Perplexity reports the billed cost of the request directly
+    reported_cost = getattr(getattr(usage, "cost", None), "total_cost", None)
+    cost = reported_cost if reported_cost is not None else estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+
+    call_usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_tokens": cached_tokens,
+        "cost": cost,
+    }
+    for key, value in call_usage.items():
+        totals[key] += value
+
+    _add_usage(_run_totals, call_usage)
+
+    ledger = ledger if ledger is not None else _company_ledger.get()
+    if ledger is not None:
+        _add_usage(ledger, call_usage)
+        task_usage = ledger["by_task"].setdefault(
+            task, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "cost": 0.0}
+        )
+        _add_usage(task_usage, call_usage)
+
+    latency_text = f" in {latency:.1f}s" if latency is not None else ""
+    logger.info(
+        f"{task} usage ({model}{latency_text}): {prompt_tokens} prompt tokens ({cached_tokens} cached), "
+        f"{completion_tokens} completion tokens, ${cost:.4f}"
+    )
+    return call_usage
+
+
+def budget_skip_reason(task):
+    """
+    Check whether an optional task should be skipped to stay within token budgets.
+
+    Returns:
+        str: Why the task is skipped (also recorded on the company ledger)
+        None: If the task may run
+    """
+    threshold = DEGRADE_THRESHOLDS.get(task)
+    if threshold is None:
+        return None
+
+    reason = None
+    ledger = _company_ledger.get()
+    if ledger is not None and _budgets["company"]:
+        used = ledger["prompt_tokens"] + ledger["completion_tokens"]
+        if used >= threshold * _budgets["company"]:
+            reason = f"company used {used}/{_budgets['company']} tokens"
+
+    if reason is None and _budgets["run"]:
+        used = _run_totals["prompt_tokens"] + _run_totals["completion_tokens"]
+        if used >= threshold * _budgets["run"]:
+            reason = f"run used {used}/{_budgets['run']} tokens"
+
+    if reason:
+        logger.warning(f"Skipping {task} to stay within token budget: {reason}")
+        if ledger is not None and task not in ledger["skipped_tasks"]:
+            ledger["skipped_tasks"].append(task)
+    return reason
+
+
+def get_usage_summary():
+    """Return a copy of the per-task, per-model totals recorded so far."""
+    return {
+        task: {model: {**totals, "latencies": list(totals["latencies"])} for model, totals in models.items()}
+        for task, models in _task_totals.items()
+    }
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def log_usage_summary():
+    """Log per-task and overall token totals, cost, latency and the prompt cache hit rate."""
+    if not _task_totals:
+        logger.info("No LLM usage recorded")
+        return
+
+    logger.info("LLM usage by task:")
+    for task, models in sorted(_task_totals.items()):
+        for model, totals in sorted(models.items()):
+            hit_rate = totals["cached_tokens"] / totals["prompt_tokens"] if totals["prompt_tokens"] else 0.0
+            latencies = totals["latencies"]
+            logger.info(
+                f"  - {task} [{model}]: {totals['calls']} calls, {totals['prompt_tokens']} prompt tokens "
+                f"({totals['cached_tokens']} cached, {hit_rate:.0%}), {totals['completion_tokens']} completion tokens, "
+                f"${totals.get('cost', 0.0):.4f}, "
+                f"latency p50={_percentile(latencies, 50):.1f}s p95={_percentile(latencies, 95):.1f}s"
+            )
+
+    prompt_total = _run_totals["prompt_tokens"]
+    cached_total = _run_totals["cached_tokens"]
+    hit_rate = cached_total / prompt_total if prompt_total else 0.0
+    logger.info(
+        f"LLM usage total: {prompt_total} prompt tokens ({cached_total} cached, {hit_rate:.0%}), "
+        f"{_run_totals['completion_tokens']} completion tokens, ${_run_totals['cost']:.4f}"
+    )
+
+
+def write_run_report(all_results, report_dir="data/reports"):
+    """
+    Write an aggregate usage report for the run and log the costliest companies.
+
+    The report holds run totals, per-task stats, budgets and each company's
+    usage ledger (taken from the 'usage' entry of its results dict).
+
+    Returns:
+        str: Path to the written report, or None on failure
+    """
+    companies = [r["usage"] for r in all_results if r.get("usage")]
+    companies.sort(key=lambda u: u["prompt_tokens"] + u["completion_tokens"], reverse=True)
+
+    if companies:
+        logger.info("Highest-usage companies:")
+    for usage in companies[:5]:
+        logger.info(
+            f"  {usage['company']}: {usage['prompt_tokens'] + usage['completion_tokens']} tokens, "
+            f"${usage['cost']:.4f}"
+            + (f", skipped {', '.join(usage['skipped_tasks'])}" if usage["skipped_tasks"] else "")
+        )
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "budgets": dict(_budgets),
+        "totals": dict(_run_totals),
+        "by_task": {
+            task: {model: {k: v for k, v in totals.items() if k != "latencies"} for model, totals in models.items()}
+            for task, models in _task_totals.items()
+        },
+        "companies": companies,
+        # Steps skipped by the gating rules per company, with estimated savings (see utils/gating.py)
+        "gated_steps": {r["company"]: r["gated"] for r in all_results if r.get("gated")},
+    }
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output_dir = os.path.join(project_root, report_dir)
+    filename = os.path.join(output_dir, f"usage_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        write_json_atomic(filename, report)
+        logger.info(f"Usage report saved to {filename}")
+        return filename
+    except Exception as e:
+        logger.warning(f"Could not write usage report: {e}")
+        return None
+
+
+def save_usage_stats():
+    """
+    Merge this run's per-task stats into data/state/llm_stats.json.
+
+    The persisted stats keep cumulative token counts and a rolling window of
+    recent latencies per task and model, so routing decisions can be based on
+    more than a single run.
+    """
+    if not _task_totals:
+        return
+
+    stats = load_state("llm_stats", default={})
+    for task, models in _task_totals.items():
+        for model, totals in models.items():
+            entry = stats.setdefault(task, {}).setdefault(model, _empty_totals())
+            for key in ("calls", "prompt_tokens", "completion_tokens", "cached_tokens", "latency_total", "cost"):
+                entry[key] = entry.get(key, 0) + totals.get(key, 0)
+            entry["latencies"] = (entry.get("latencies", []) + totals["latencies"])[-LATENCY_HISTORY:]
+            entry["updated_at"] = datetime.now().isoformat(timespec="seconds")
+
+    try:
+        save_state("llm_stats", stats)
+        logger.info("Saved LLM usage stats to data/state/llm_stats.json")
+    except Exception as e:
+        logger.warning(f"Could not save LLM usage stats: {e}")
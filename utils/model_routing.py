@@ -0,0 +1,87 @@
+import logging
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Model, output token cap and request timeout (seconds) for every LLM task.
+# Per-task latency and token stats are recorded in data/state/llm_stats.json
+# (see utils/llm_usage.py) to guide moving high-volume tasks to faster models.
+MODEL_ROUTES = {
+    "post_classification": {"model": "gpt-4o-mini", "max_tokens": 2000, "timeout": 60},
+    "contact_summary": {"model": "gpt-4o-mini", "max_tokens": 2000, "timeout": 60},
+    "reachout_message": {"model": "gpt-4o-mini", "max_tokens": 300, "timeout": 60},
+    "potential_actions": {"model": "gpt-4o-mini", "max_tokens": 1200, "timeout": 90},
+    "news_search_fast": {"model": "sonar", "max_tokens": 4000, "timeout": 60},
+    "news_search": {"model": "sonar-pro", "max_tokens": 4000, "timeout": 120},
+}
+
+
+def get_route(task):
+    """Return the routing entry (model, max_tokens, timeout) for a task."""
+    if task not in MODEL_ROUTES:
+        raise KeyError(f"Unknown LLM task '{task}'. Known tasks: {', '.join(MODEL_ROUTES)}")
+    return MODEL_ROUTES[task]
+
+
+def _is_number(value):
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def parse_route_override(spec):
+    """
+    Parse a CLI route override of the form TASK=MODEL[:MAX_TOKENS[:TIMEOUT]].
+
+    The numeric fields are read from the right, so model IDs containing colons
+    (fine-tuned OpenAI models such as ft:gpt-4o-mini:org::abc123) are kept whole.
+
+    Examples:
+        "reachout_message=gpt-4o"
+        "post_classification=gpt-4.1-nano:1500"
+        "news_search=sonar:3000:60"
+        "reachout_message=ft:gpt-4o-mini:org::abc123:500"
+
+    Returns:
+        tuple: (task, dict of overridden route fields)
+    """
+    task, sep, value = spec.partition("=")
+    task = task.strip()
+    if not sep or not value:
+        raise ValueError(f"Invalid route '{spec}', expected TASK=MODEL[:MAX_TOKENS[:TIMEOUT]]")
+    if task not in MODEL_ROUTES:
+        raise ValueError(f"Unknown LLM task '{task}'. Known tasks: {', '.join(MODEL_ROUTES)}")
+
+    # Up to two trailing numeric fields; an empty MAX_TOKENS may precede a TIMEOUT ("sonar::60")
+    parts = value.split(":")
+    fields = []
+    while len(fields) < 2 and len(parts) > 1 and (_is_number(parts[-1]) or (fields and not parts[-1])):
+        fields.insert(0, parts.pop())
+    model = ":".join(parts).strip()
+
+    override = {}
+    if model:
+        override["model"] = model
+    if fields and fields[0]:
+        if not fields[0].isdigit():
+            raise ValueError(f"Invalid route '{spec}', MAX_TOKENS must be a whole number")
+        override["max_tokens"] = int(fields[0])
+    if len(fields) > 1:
+        override["timeout"] = float(fields[1])
+    return task, override
+
+
+def apply_route_overrides(specs):
+    """Apply a list of CLI route overrides to MODEL_ROUTES for this run."""
+    for spec in specs or []:
+        task, override = parse_route_override(spec)
+        MODEL_ROUTES[task] = {**MODEL_ROUTES[task], **override}
+        logger.info(f"Model route override: {task} -> {MODEL_ROUTES[task]}")
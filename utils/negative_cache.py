@@ -0,0 +1,146 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from utils.state import load_state, save_state
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Remember lookups that came back empty and skip them until they expire; false
+# repeats every lookup on every run
+NEGATIVE_CACHE = os.getenv("NEGATIVE_CACHE", "true").lower() == "true"
+
+# Days an empty result is trusted, per branch:
+#   linkedin - Firmable knows the company but has no LinkedIn page for it
+#   contact  - no LinkedIn profile found for the company's primary contact
+#   news     - Perplexity found no articles at all for the company over a full window
+NEGATIVE_TTL_DAYS = {
+    "linkedin": 90,
+    "contact": 60,
+    "news": 45,
+}
+
+STATE_NAME = "negative_cache"
+
+# Lookups for a company run concurrently (news next to LinkedIn/contact), so
+# load-modify-save of the cache file is serialized
+_lock = threading.Lock()
+
+
+def fingerprint(inputs):
+    """Hash of the Salesforce inputs (company, location, contact) an empty result was found for."""
+    return hashlib.sha1(json.dumps(list(inputs)).encode("utf-8")).hexdigest()
+
+
+def known_empty(company, branch, inputs, now=None):
+    """
+    Look up a cached empty result.
+
+    An entry only counts while its TTL has not passed and the inputs it was found
+    for are unchanged (e.g. the same contact is still mapped in Salesforce);
+    otherwise it is dropped and the lookup should run again.
+
+    Args:
+        company: Company name
+        branch: "linkedin", "contact" or "news"
+        inputs: The inputs the lookup uses, e.g. (company, location)
+
+    Returns:
+        dict: The entry ({"reason", "found_at", "retry_after", "fingerprint", "data"}), or None
+    """
+    if not NEGATIVE_CACHE:
+        return None
+
+    now = now or datetime.now()
+    entry = load_state(STATE_NAME, default={}).get(company, {}).get(branch)
+    if not entry:
+        return None
+
+    if entry.get("fingerprint") != fingerprint(inputs):
+        logger.info(f"Inputs for {company} changed, repeating {branch} lookup")
+        forget(company, branch)
+        return None
+    if now >= datetime.fromisoformat(entry["retry_after"]):
+        logger.info(f"Cached empty {branch} result for {company} expired, repeating lookup")
+        forget(company, branch)
+        return None
+
+    logger.info(f"Skipping {branch} lookup for {company}: {entry['reason']} (cached until {entry['retry_after'][:10]})")
+    return entry
+
+
+def peek(company, branch, inputs, now=None):
+    """
+    Look up a cached empty result like known_empty(), but without dropping stale
+    entries or logging (for planning a run).
+
+    Returns:
+        dict: The entry while it is valid for these inputs, or None
+    """
+    if not NEGATIVE_CACHE:
+        return None
+
+    now = now or datetime.now()
+    entry = load_state(STATE_NAME, default={}).get(company, {}).get(branch)
+    if not entry or entry.get("fingerprint") != fingerprint(inputs):
+        return None
+    if now >= datetime.fromisoformat(entry["retry_after"]):
+        return None
+    return entry
+
+
+def remember_empty(company, branch, reason, inputs, data=None, now=None):
+    """
+    Cache that a lookup came back empty so it is skipped until its TTL passes.
+
+    Only call this for genuine empty results, not for errors (those are retried).
+
+    Args:
+        company: Company name
+        branch: "linkedin", "contact" or "news"
+        reason: Why the result is empty, shown when the lookup is skipped
+        inputs: The inputs the lookup used, e.g. (company, location)
+        data: Optional JSON-serializable result to reuse while the entry is valid
+    """
+    if not NEGATIVE_CACHE:
+        return
+
+    now = now or datetime.now()
+    entry = {
+        "reason": reason,
+        "found_at": now.isoformat(timespec="seconds"),
+        "retry_after": (now + timedelta(days=NEGATIVE_TTL_DAYS[branch])).isoformat(timespec="seconds"),
+        "fingerprint": fingerprint(inputs),
+        "data": data,
+    }
+    with _lock:
+        state = load_state(STATE_NAME, default={})
+        state.setdefault(company, {})[branch] = entry
+        try:
+            save_state(STATE_NAME, state)
+        except Exception as e:
+            logger.warning(f"Could not save negative cache: {e}")
+    logger.info(f"Cached empty {branch} result for {company} for {NEGATIVE_TTL_DAYS[branch]} days: {reason}")
+
+
+def forget(company, branch):
+    """Drop a cached empty result."""
+    with _lock:
+        state = load_state(STATE_NAME, default={})
+        if state.get(company, {}).pop(branch, None) is None:
+            return
+        if not state[company]:
+            del state[company]
+        try:
+            save_state(STATE_NAME, state)
+        except Exception as e:
+            logger.warning(f"Could not save negative cache: {e}")
@@ -0,0 +1,122 @@
+import os
+import logging
+import threading
+from datetime import datetime
+from utils.email_client import EmailClient, load_owner_mapping, send_owner_digest
+from utils.state import load_state, save_state
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Send each owner's digest as soon as all of their companies have finished, instead
+# of waiting for the deliver phase (which then skips owners already sent)
+EARLY_DIGESTS = os.getenv("EARLY_DIGESTS", "false").lower() == "true"
+
+# Per import (owner_mapping.json "imported_at"):
+#   {"cycle", "finished": {company: report dict or None}, "sent": {owner: {"sent_at", "companies"}}}
+# Kept in data/state so owners whose companies span several batches/jobs are tracked across them
+STATE_NAME = "owner_digests"
+
+# Companies can finish from the scrape loop and from worker threads, so
+# load-modify-save is serialized
+_lock = threading.Lock()
+
+# Turned off for runs that don't send email (main.py --no-email)
+_enabled = EARLY_DIGESTS
+
+
+def set_early_digests(enabled):
+    """Override EARLY_DIGESTS for this run."""
+    global _enabled
+    _enabled = enabled
+
+
+def _owner_of(mapping, company):
+    return next(
+        (owner for owner, names in mapping.get("owner_to_companies", {}).items() if company in names),
+        None,
+    )
+
+
+def mark_finished(company, report_data=None, input_dir="data/input"):
+    """
+    Record that the run is done with a company (it succeeded, failed permanently,
+    or was carried forward) and send its owner's digest once all of the owner's
+    companies are done.
+
+    Args:
+        company: Company name
+        report_data: The company's report dict, or None if it has no report
+
+    Returns:
+        bool: Whether the owner's digest was sent now
+    """
+    if not _enabled:
+        return False
+
+    mapping = load_owner_mapping(input_dir)
+    if not mapping or not mapping.get("imported_at"):
+        # Without the import timestamp, companies finished in earlier runs can't be told apart
+        return False
+    cycle = mapping["imported_at"]
+    owner = _owner_of(mapping, company)
+
+    with _lock:
+        state = load_state(STATE_NAME, default={})
+        if state.get("cycle") != cycle:
+            state = {"cycle": cycle, "finished": {}, "sent": {}}
+        state["finished"][company] = report_data
+        _save(state)
+
+        # Unassigned companies go out in the fallback digest of the deliver phase
+        if owner is None or owner in state["sent"]:
+            return False
+
+        company_names = mapping["owner_to_companies"][owner]
+        pending = [name for name in company_names if name not in state["finished"]]
+        if pending:
+            logger.info(f"{owner}: {len(company_names) - len(pending)}/{len(company_names)} companies finished")
+            return False
+
+        owner_companies = [state["finished"][name] for name in company_names if state["finished"][name]]
+        if not owner_companies:
+            logger.warning(f"All of {owner}'s companies finished without a report, leaving their digest to the deliver phase")
+            return False
+
+        try:
+            sent = send_owner_digest(EmailClient(), owner, owner_companies)
+        except Exception as e:
+            logger.warning(f"Could not send early digest to {owner}: {e}")
+            sent = False
+        if not sent:
+            logger.warning(f"Early digest to {owner} failed, it will be sent in the deliver phase")
+            return False
+
+        state["sent"][owner] = {
+            "sent_at": datetime.now().isoformat(timespec="seconds"),
+            "companies": [c.get("company") for c in owner_companies],
+        }
+        _save(state)
+        return True
+
+
+def sent_owners(input_dir="data/input"):
+    """Owners whose digest was already sent for the current import."""
+    mapping = load_owner_mapping(input_dir)
+    state = load_state(STATE_NAME, default={})
+    if not mapping or not mapping.get("imported_at") or state.get("cycle") != mapping["imported_at"]:
+        return set()
+    return set(state.get("sent", {}))
+
+
+def _save(state):
+    try:
+        save_state(STATE_NAME, state)
+    except Exception as e:
+        logger.warning(f"Could not save owner digest progress: {e}")
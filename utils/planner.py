@@ -0,0 +1,435 @@
+import os
+import json
+import math
+import logging
+from datetime import datetime
+from utils.cadence import STATE_NAME as CADENCE_STATE, plan_refresh
+from utils.gating import INPUT_DIR, gated_by, load_company_facts
+from utils.llm_usage import get_budgets
+from utils.negative_cache import peek
+from utils.run_journal import recent_journals
+from utils.state import load_state
+from utils.tier_stats import STATE_NAME as TIER_STATE, order_tiers
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Layout of the monthly workflow (.github/workflows/run-schedule.yml) the plan is checked
+# against: companies per batch, scrape jobs the batches are split across, and the
+# timeout and setup time (checkout, pip install, state/artifact transfer) of each job
+WORKFLOW_BATCH_SIZE = int(os.getenv("BATCH_SIZE", "5"))
+WORKFLOW_JOBS = 3
+JOB_TIMEOUT_MINUTES = 350
+JOB_SETUP_MINUTES = 5
+
+# Seconds scraper.scrape_companies() waits between the companies of a batch
+INTER_COMPANY_DELAY = 60
+
+# Seconds per journaled step (utils/run_journal.py STEPS) until run journals have
+# recorded it: (typical, slow)
+DEFAULT_STEP_SECONDS = {
+    "company_info": (15, 30),
+    "news": (60, 150),
+    "linkedin": (240, 600),
+    "contact": (180, 420),
+    "summarization": (45, 90),
+}
+# Percentile of the recorded durations used for the slow case
+SLOW_PERCENTILE = 90
+
+# LLM tasks behind each step; their calls, tokens and cost per company are averaged
+# over the companies that ran the step in the run journals
+STEP_TASKS = {
+    "news": ["news_search_fast", "news_search"],
+    "linkedin": ["post_classification"],
+    "contact": ["contact_summary"],
+    "summarization": ["reachout_message", "potential_actions"],
+}
+PERPLEXITY_TASKS = {"news_search_fast", "news_search"}
+# Per call, until a task has been recorded in the journals or data/state/llm_stats.json
+DEFAULT_TASK_CALL = {"tokens": 2500, "usd": 0.002}
+
+# Success rate assumed for a LinkedIn tier without recorded attempts
+DEFAULT_TIER_SUCCESS = 0.8
+
+# Rough fees per call (USD); the calls themselves are what each provider's plan bills as credits
+PROVIDER_PRICES = {"serpapi": 0.015, "firmable": 0.01, "brightdata": 0.02}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_history():
+    """
+    Collect per-step durations and per-company LLM usage from the saved run journals.
+
+    Returns:
+        dict: {"journals", "companies", "step_seconds": {step: (typical, slow)},
+        "task_usage": {task: {"calls", "tokens", "usd"}} per company that ran the
+        task's step, "defaults": steps without recorded durations}
+    """
+    journals = recent_journals()
+    durations = {step: [] for step in DEFAULT_STEP_SECONDS}
+    task_totals = {}
+    step_runs = {step: 0 for step in STEP_TASKS}
+    companies = 0
+
+    for journal in journals:
+        for progress in journal.data.get("progress", {}).values():
+            steps = progress.get("steps", {})
+            for step, entry in steps.items():
+                if step in durations and entry.get("duration") is not None:
+                    durations[step].append(entry["duration"])
+
+            usage = (progress.get("results") or {}).get("usage")
+            if not usage:
+                continue
+            companies += 1
+            for step, tasks in STEP_TASKS.items():
+                if step not in steps:
+                    continue
+                step_runs[step] += 1
+                for task in tasks:
+                    used = usage.get("by_task", {}).get(task)
+                    if not used:
+                        continue
+                    totals = task_totals.setdefault(task, {"calls": 0, "tokens": 0, "usd": 0.0})
+                    totals["calls"] += used.get("calls", 0)
+                    totals["tokens"] += used.get("prompt_tokens", 0) + used.get("completion_tokens", 0)
+                    totals["usd"] += used.get("cost", 0.0)
+
+    step_seconds, defaults = {}, []
+    for step, values in durations.items():
+        if values:
+            step_seconds[step] = (sum(values) / len(values), _percentile(values, SLOW_PERCENTILE))
+        else:
+            step_seconds[step] = DEFAULT_STEP_SECONDS[step]
+            defaults.append(step)
+
+    task_usage = {}
+    llm_stats = load_state("llm_stats", default={})
+    for step, tasks in STEP_TASKS.items():
+        for task in tasks:
+            if step_runs[step]:
+                # Companies that ran the step without calling the task count as zero
+                totals = task_totals.get(task, {"calls": 0, "tokens": 0, "usd": 0.0})
+                task_usage[task] = {key: value / step_runs[step] for key, value in totals.items()}
+                continue
+            # Not journaled yet: one call per company at the task's recorded average
+            models = llm_stats.get(task, {}).values()
+            calls = sum(m.get("calls", 0) for m in models)
+            if calls:
+                tokens = sum(m.get("prompt_tokens", 0) + m.get("completion_tokens", 0) for m in models)
+                task_usage[task] = {"calls": 1, "tokens": tokens / calls, "usd": sum(m.get("cost", 0.0) for m in models) / calls}
+            elif task == "news_search":
+                # Only called when the fast search escalates
+                task_usage[task] = {"calls": 0, "tokens": 0, "usd": 0.0}
+            else:
+                task_usage[task] = {"calls": 1, **DEFAULT_TASK_CALL}
+
+    return {
+        "journals": len(journals),
+        "companies": companies,
+        "step_seconds": step_seconds,
+        "task_usage": task_usage,
+        "defaults": defaults,
+    }
+
+
+def _load_contact_mapping(input_dir):
+    try:
+        with open(os.path.join(input_dir, "contact_mapping.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Could not read contact mapping: {e}")
+        return {}
+
+
+def _enabled_tiers():
+    """LinkedIn tiers enabled for the run, as in scraper._scrape_company_posts()."""
+    hedge = os.getenv('LINKEDIN_HEDGE', 'false').lower() == 'true'
+    enabled = ['API']
+    if hedge or os.getenv('USE_REQUESTS_FALLBACK', 'false').lower() == 'true':
+        enabled.append('Requests')
+    if os.getenv('USE_PLAYWRIGHT_FALLBACK', 'false').lower() == 'true':
+        enabled.append('Playwright')
+    return enabled, hedge
+
+
+def _expected_tier_calls(company, facts, tier_totals):
+    """
+    Expected attempts per LinkedIn tier for a company: each tier is reached when
+    the ones before it fail, at their recorded global success rates.
+    """
+    enabled, hedge = _enabled_tiers()
+    tiers = [t for t in order_tiers(company, enabled) if not gated_by(f"linkedin_{t.lower()}", facts)]
+
+    def success(tier):
+        totals = tier_totals.get(tier, {})
+        return totals["successes"] / totals["attempts"] if totals.get("attempts") else DEFAULT_TIER_SUCCESS
+
+    calls, reached = {}, 1.0
+    if hedge and set(tiers[:2]) == {'API', 'Requests'}:
+        # Hedged tiers start side by side
+        for tier in tiers[:2]:
+            calls[tier] = 1.0
+        reached = (1 - success('API')) * (1 - success('Requests'))
+        tiers = tiers[2:]
+    for tier in tiers:
+        calls[tier] = reached
+        reached *= 1 - success(tier)
+    return calls
+
+
+def estimate_company(company, location, history, contact_mapping, tier_totals, cadence, input_dir=INPUT_DIR, now=None):
+    """
+    Estimate the external calls, LLM usage and wall time of scraping one company.
+
+    Steps are dropped the way the scrape would drop them: lookups that are still in
+    the negative cache, steps skipped by the gating rules (with the company's signals
+    predicted from its last report) and companies without a mapped contact.
+
+    Returns:
+        dict: {"company", "calls": {provider: count}, "tokens", "llm_usd",
+        "provider_usd", "seconds", "slow_seconds", "skipped": [(step, reason)]}
+    """
+    now = now or datetime.now()
+    facts = load_company_facts(company, input_dir)
+    last_report = (cadence.get(company) or {}).get("report")
+    if last_report:
+        facts["signals"] = len(last_report.get("posts") or []) + len(last_report.get("articles") or [])
+
+    calls = {"serpapi": 0.0, "firmable": 0.0, "brightdata": 0.0, "perplexity": 0.0, "openai": 0.0}
+    skipped = []
+    ran = {step: True for step in DEFAULT_STEP_SECONDS}
+
+    # Company info (SerpAPI search + Firmable lookup), reused while Firmable has no LinkedIn page
+    if peek(company, "linkedin", (company, location), now):
+        ran["company_info"] = ran["linkedin"] = False
+        skipped.append(("linkedin", "no LinkedIn page (negative cache)"))
+    else:
+        calls["serpapi"] += 1
+        calls["firmable"] += 1
+
+    if peek(company, "news", (company, location), now):
+        ran["news"] = False
+        skipped.append(("news", "no articles (negative cache)"))
+
+    if ran["linkedin"]:
+        tier_calls = _expected_tier_calls(company, facts, tier_totals)
+        calls["brightdata"] += tier_calls.get("API", 0.0)
+        if not tier_calls:
+            ran["linkedin"] = False
+            skipped.append(("linkedin", "every enabled tier is gated or skipped"))
+
+    contact_name = contact_mapping.get(company)
+    rule = gated_by("contact", facts)
+    if not contact_name:
+        ran["contact"] = False
+        skipped.append(("contact", "no primary contact mapped"))
+    elif rule:
+        ran["contact"] = False
+        skipped.append(("contact", rule["reason"]))
+    elif peek(company, "contact", (company, contact_name), now):
+        ran["contact"] = False
+        skipped.append(("contact", "no LinkedIn profile (negative cache)"))
+    else:
+        calls["serpapi"] += 1
+        calls["brightdata"] += 1
+
+    tokens, llm_usd = 0.0, 0.0
+    for step, tasks in STEP_TASKS.items():
+        if not ran[step]:
+            continue
+        for task in tasks:
+            rule = gated_by(task, facts)
+            if rule:
+                skipped.append((task, rule["reason"]))
+                continue
+            usage = history["task_usage"][task]
+            calls["perplexity" if task in PERPLEXITY_TASKS else "openai"] += usage["calls"]
+            tokens += usage["tokens"]
+            llm_usd += usage["usd"]
+
+    # News runs next to the LinkedIn and contact scrapes, which run one after the other
+    seconds = {}
+    for case in (0, 1):
+        step = {s: history["step_seconds"][s][case] if ran[s] else 0 for s in DEFAULT_STEP_SECONDS}
+        seconds[case] = (
+            step["company_info"] + max(step["news"], step["linkedin"] + step["contact"]) + step["summarization"]
+        )
+
+    return {
+        "company": company,
+        "calls": calls,
+        "tokens": tokens,
+        "llm_usd": llm_usd,
+        "provider_usd": sum(calls[p] * price for p, price in PROVIDER_PRICES.items()),
+        "seconds": seconds[0],
+        "slow_seconds": seconds[1],
+        "skipped": skipped,
+    }
+
+
+def plan_run(companies, due_only=False, batch_size=WORKFLOW_BATCH_SIZE, jobs=WORKFLOW_JOBS, input_dir=INPUT_DIR, now=None):
+    """
+    Plan a run without calling any provider: which companies are due, and the
+    external calls, tokens, cost and wall time expected per batch and workflow job.
+
+    Batches are split across jobs like the workflow's import job does, and each
+    batch is one main.py process (so RUN_TOKEN_BUDGET applies per batch).
+
+    Args:
+        companies: List of (company_name, location) tuples, as imported
+        due_only: Plan a sub-monthly run (see utils/cadence.py)
+        batch_size: Companies per batch
+        jobs: Scrape jobs the batches are split across
+
+    Returns:
+        dict: {"companies", "due", "carried", "history", "totals", "estimates",
+        "batches", "jobs", "warnings"}
+    """
+    now = now or datetime.now()
+    due, carried = plan_refresh(companies, due_only=due_only, now=now)
+    due_names = {name for name, _ in due}
+
+    history = load_history()
+    contact_mapping = _load_contact_mapping(input_dir)
+    tier_totals = load_state(TIER_STATE, default={}).get("global", {})
+    cadence = load_state(CADENCE_STATE, default={})
+
+    estimates = {
+        name: estimate_company(name, location, history, contact_mapping, tier_totals, cadence, input_dir, now)
+        for name, location in due
+    }
+
+    batches = []
+    for start in range(0, len(companies), batch_size):
+        chunk = [estimates[name] for name, _ in companies[start:start + batch_size] if name in due_names]
+        delays = INTER_COMPANY_DELAY * max(len(chunk) - 1, 0)
+        batches.append({
+            "number": len(batches) + 1,
+            "due": len(chunk),
+            "tokens": sum(e["tokens"] for e in chunk),
+            "seconds": sum(e["seconds"] for e in chunk) + delays,
+            "slow_seconds": sum(e["slow_seconds"] for e in chunk) + delays,
+        })
+
+    per_job = math.ceil(len(batches) / jobs) if batches else 0
+    job_plans = []
+    for index in range(jobs):
+        job_batches = batches[index * per_job:(index + 1) * per_job]
+        if not job_batches:
+            continue
+        job_plans.append({
+            "number": index + 1,
+            "batches": [b["number"] for b in job_batches],
+            "due": sum(b["due"] for b in job_batches),
+            "minutes": JOB_SETUP_MINUTES + sum(b["seconds"] for b in job_batches) / 60,
+            "slow_minutes": JOB_SETUP_MINUTES + sum(b["slow_seconds"] for b in job_batches) / 60,
+        })
+
+    totals = {"calls": {}, "tokens": 0.0, "llm_usd": 0.0, "provider_usd": 0.0, "skipped": {}}
+    for estimate in estimates.values():
+        for provider, count in estimate["calls"].items():
+            totals["calls"][provider] = totals["calls"].get(provider, 0.0) + count
+        for key in ("tokens", "llm_usd", "provider_usd"):
+            totals[key] += estimate[key]
+        for step, reason in estimate["skipped"]:
+            totals["skipped"].setdefault(step, {}).setdefault(reason, 0)
+            totals["skipped"][step][reason] += 1
+
+    warnings = []
+    for job in job_plans:
+        if job["slow_minutes"] > JOB_TIMEOUT_MINUTES:
+            warnings.append(
+                f"Job {job['number']} may hit its {JOB_TIMEOUT_MINUTES} min timeout "
+                f"(~{job['minutes']:.0f} min expected, ~{job['slow_minutes']:.0f} min if slow)"
+            )
+    budgets = get_budgets()
+    if budgets["company"]:
+        over = [e["company"] for e in estimates.values() if e["tokens"] > budgets["company"]]
+        if over:
+            names = ", ".join(over[:10]) + (f" and {len(over) - 10} more" if len(over) > 10 else "")
+            warnings.append(
+                f"{len(over)} companies expected over the {budgets['company']}-token company budget "
+                f"(optional steps will be dropped): {names}"
+            )
+    if budgets["run"]:
+        for batch in batches:
+            if batch["tokens"] > budgets["run"]:
+                warnings.append(
+                    f"Batch {batch['number']} expected to use ~{batch['tokens']:.0f} tokens, "
+                    f"over the {budgets['run']}-token run budget"
+                )
+
+    return {
+        "companies": len(companies),
+        "due": len(due),
+        "carried": len(carried),
+        "due_only": due_only,
+        "batch_size": batch_size,
+        "history": history,
+        "totals": totals,
+        "estimates": estimates,
+        "batches": batches,
+        "jobs": job_plans,
+        "warnings": warnings,
+    }
+
+
+def format_plan(plan):
+    """Render a plan from plan_run() as printable lines."""
+    history, totals = plan["history"], plan["totals"]
+    mode = "sub-monthly" if plan["due_only"] else "full"
+    lines = [
+        f"Run plan ({mode} run): {plan['companies']} companies, {plan['due']} due, {plan['carried']} carried forward",
+        f"History: {history['journals']} run journals, {history['companies']} companies"
+        + (f" (default durations for: {', '.join(history['defaults'])})" if history["defaults"] else ""),
+        "",
+        "External calls:",
+    ]
+    labels = {
+        "serpapi": "SerpAPI searches",
+        "firmable": "Firmable lookups",
+        "brightdata": "BrightData snapshots",
+        "perplexity": "Perplexity calls",
+        "openai": "OpenAI calls",
+    }
+    for provider, label in labels.items():
+        lines.append(f"  {label:<22} {totals['calls'].get(provider, 0.0):>8.0f}")
+    lines += [
+        f"LLM tokens: ~{totals['tokens']:,.0f} (~${totals['llm_usd']:.2f})",
+        f"Provider fees: ~${totals['provider_usd']:.2f}",
+    ]
+
+    if totals["skipped"]:
+        lines += ["", "Skipped steps:"]
+        for step, reasons in sorted(totals["skipped"].items()):
+            for reason, count in reasons.items():
+                lines.append(f"  {step}: {count} companies ({reason})")
+
+    lines += ["", f"Jobs ({plan['batch_size']} companies per batch, {JOB_TIMEOUT_MINUTES} min timeout):"]
+    for job in plan["jobs"]:
+        first, last = job["batches"][0], job["batches"][-1]
+        batches = f"batch {first}" if first == last else f"batches {first}-{last}"
+        lines.append(
+            f"  Job {job['number']}: {batches}, {job['due']} companies due, "
+            f"~{job['minutes']:.0f} min (~{job['slow_minutes']:.0f} min if slow)"
+        )
+
+    if plan["warnings"]:
+        lines += ["", "Warnings:"]
+        lines += [f"  - {warning}" for warning in plan["warnings"]]
+    return lines
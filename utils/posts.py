@@ -0,0 +1,166 @@
+import os
+import re
+import csv
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from utils.state import write_json_atomic
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Scraped posts are handed to the summarizer in memory; set to true to also write
+# each scrape to data/debug/{company} Linkedin Posts.json / Contact Posts.json
+DEBUG_DUMP_POSTS = os.getenv("DEBUG_DUMP_POSTS", "false").lower() == "true"
+
+DEBUG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "debug")
+
+
+@dataclass(slots=True)
+class PostRecord:
+    """A LinkedIn post as returned by every LinkedIn scraper (API, requests, Playwright, contact)."""
+    date: datetime | None
+    text: str
+    likes: int | None = None
+    # Near-duplicate posts and articles collapsed into this one (see utils/dedup.py)
+    also_in: list[dict] = field(default_factory=list)
+
+    @property
+    def display_date(self):
+        """The post date as DD/MM/YYYY (the Perplexity article format), or "Unknown"."""
+        return self.date.strftime("%d/%m/%Y") if self.date else "Unknown"
+
+    def to_dict(self):
+        return {
+            "date": self.date.isoformat() if self.date else None,
+            "text": self.text,
+            "likes": self.likes,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from its to_dict() form."""
+        return cls(date=parse_post_date(data.get('date')), text=data.get('text') or '', likes=data.get('likes'))
+
+
+def parse_relative_date(value, now=None):
+    """
+    Convert a relative LinkedIn date (e.g. '1h', '1d', '2w', '3mo', '4y') to a datetime.
+
+    Returns:
+        datetime, or None if the value is not a relative date
+    """
+    match = re.match(r'(\d+)\s*(h|d|w|mo|y)', (value or "").lower().strip())
+    if not match:
+        return None
+
+    now = now or datetime.now()
+    amount = int(match.group(1))
+    days = {"h": amount / 24, "d": amount, "w": amount * 7, "mo": amount * 30, "y": amount * 365}
+    return now - timedelta(days=days[match.group(2)])
+
+
+def parse_post_date(value, now=None):
+    """
+    Parse a scraped post date: ISO 8601 (BrightData, JSON-LD), epoch milliseconds
+    (LinkedIn's embedded page data) or relative (Playwright).
+
+    Returns:
+        datetime, or None if the date is missing or unparseable
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000)
+
+    value = str(value).strip()
+    if value.isdigit():
+        return datetime.fromtimestamp(int(value) / 1000)
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+
+    date = parse_relative_date(value, now)
+    if date is None:
+        logger.warning(f"Could not parse post date: {value!r}")
+    return date
+
+
+def parse_likes(value):
+    """Parse a reaction count such as '1,234' or '56'; None when unknown."""
+    digits = re.sub(r'[^\d]', '', str(value or ''))
+    return int(digits) if digits else None
+
+
+def post_from_brightdata(post):
+    """Build a PostRecord from a BrightData post dict (post_text, date_posted)."""
+    return PostRecord(
+        date=parse_post_date(post.get('date_posted')),
+        text=(post.get('post_text') or '').strip(),
+    )
+
+
+def dump_posts(name, posts):
+    """
+    Write scraped posts to data/debug/{name}.json when DEBUG_DUMP_POSTS is set.
+
+    Args:
+        name: File name without extension (e.g. "OnQ Software Linkedin Posts")
+        posts: List of PostRecords
+    """
+    if not DEBUG_DUMP_POSTS:
+        return
+    try:
+        os.makedirs(DEBUG_DIR, exist_ok=True)
+        path = os.path.join(DEBUG_DIR, f"{name}.json")
+        write_json_atomic(path, [p.to_dict() for p in posts])
+        logger.info(f"Wrote {len(posts)} posts to {path}")
+    except Exception as e:
+        logger.warning(f"Could not write debug dump {name}: {e}")
+
+
+def load_posts(filepath):
+    """
+    Load posts from a debug dump, or from an older BrightData JSON / Playwright CSV
+    posts file.
+
+    Returns:
+        list: PostRecords
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"Posts file not found: {filepath}")
+
+    file_ext = os.path.splitext(filepath)[1].lower()
+
+    if file_ext == '.json':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        posts = []
+        for post in data:
+            if 'post_text' in post:
+                posts.append(post_from_brightdata(post))
+            else:
+                posts.append(PostRecord.from_dict(post))
+        return posts
+
+    elif file_ext == '.csv':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return [
+                PostRecord(
+                    date=parse_post_date(row.get('Date')),
+                    text=row.get('Content') or '',
+                    likes=parse_likes(row.get('Likes')),
+                )
+                for row in csv.DictReader(f)
+            ]
+
+    else:
+        raise ValueError(f"Unsupported file format: {file_ext}. Expected .json or .csv")
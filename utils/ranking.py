@@ -0,0 +1,128 @@
+import re
+import math
+import logging
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "our", "that", "the", "their", "this", "to", "was", "we",
+    "were", "will", "with", "pty", "ltd", "limited", "group",
+}
+
+# Vocabulary of the growth indicators the pipeline looks for. Added to every query so
+# concrete growth signals outrank generic mentions of the company.
+GROWTH_TERMS = (
+    "award awards recognition expansion expand expands new hire hires hiring appointed appoints "
+    "partnership partners partnering patent innovation funding raise raised investment revenue "
+    "profit launch launches launched product acquisition acquires client clients contract "
+    "contracts market growth"
+)
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+
+def tokenize(text):
+    """Lowercase `text` and split it into word tokens, dropping stopwords."""
+    return [t for t in TOKEN_PATTERN.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def estimate_tokens(text):
+    """Rough LLM token estimate for `text` (about four characters per token)."""
+    return max(1, len(text or "") // 4)
+
+
+def bm25_scores(documents, query):
+    """
+    Score each document against the query with Okapi BM25.
+
+    Args:
+        documents: List of document strings
+        query: Query string
+
+    Returns:
+        list[float]: One score per document, in input order
+    """
+    doc_tokens = [tokenize(doc) for doc in documents]
+    query_terms = set(tokenize(query))
+    if not doc_tokens or not query_terms:
+        return [0.0] * len(documents)
+
+    n_docs = len(doc_tokens)
+    avg_len = sum(len(tokens) for tokens in doc_tokens) / n_docs or 1.0
+
+    doc_freq = {}
+    for tokens in doc_tokens:
+        for term in set(tokens) & query_terms:
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+
+    scores = []
+    for tokens in doc_tokens:
+        term_counts = {}
+        for token in tokens:
+            if token in query_terms:
+                term_counts[token] = term_counts.get(token, 0) + 1
+
+        score = 0.0
+        for term, tf in term_counts.items():
+            df = doc_freq[term]
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            score += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * len(tokens) / avg_len))
+        scores.append(score)
+
+    return scores
+
+
+def select_signals(items, query, text_fn, k=8, token_budget=600, size_fn=None):
+    """
+    Pick the most relevant items for a prompt within a count and token budget.
+
+    Items are ranked by BM25 score of text_fn(item) against the query; ties keep
+    their original order. Items are then taken in rank order while they fit in the
+    token budget (the top item is always included).
+
+    Args:
+        items: Candidate signals (e.g. article or growth post dicts)
+        query: Query string (company name, industry and growth vocabulary)
+        text_fn: Function returning the text used to rank an item (and size it,
+            unless size_fn is given)
+        k: Maximum number of items to return
+        token_budget: Maximum estimated tokens across the returned items
+        size_fn: Function returning the text an item adds to the prompt, when that
+            differs from the text it is ranked on
+
+    Returns:
+        list: Selected items, most relevant first
+    """
+    if not items:
+        return []
+
+    texts = [text_fn(item) for item in items]
+    scores = bm25_scores(texts, query)
+    sizes = [estimate_tokens(size_fn(item)) for item in items] if size_fn else [estimate_tokens(t) for t in texts]
+    ranked = sorted(range(len(items)), key=lambda i: scores[i], reverse=True)
+
+    selected = []
+    used_tokens = 0
+    for i in ranked:
+        if len(selected) >= k:
+            break
+        cost = sizes[i]
+        if selected and used_tokens + cost > token_budget:
+            continue
+        selected.append(items[i])
+        used_tokens += cost
+
+    logger.info(f"Selected {len(selected)}/{len(items)} signals (~{used_tokens} tokens) for prompt")
+    return selected
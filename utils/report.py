@@ -0,0 +1,71 @@
+import os
+import json
+import logging
+from dataclasses import dataclass, field, asdict, fields
+from utils.state import write_json_atomic
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "output")
+
+
+@dataclass(slots=True)
+class CompanyReport:
+    """
+    A company's report, built in memory through scraper.scrape() and written once
+    to data/output/{company}.json. The JSON layout is what salesforce.py and
+    utils/email_client.py read.
+    """
+    company: str
+    articles: list[dict] = field(default_factory=list)
+    industry: str | None = None
+    posts: list[dict] = field(default_factory=list)
+    message: str = ""
+    potential_actions: list[str] = field(default_factory=list)
+    linkedin_url: str | None = None
+    contact_name: str | None = None
+    contact_posts: list[dict] = field(default_factory=list)
+    # When the report was scraped, and whether it was carried forward unchanged into
+    # a later run because the company was not due for a refresh (see utils/cadence.py)
+    refreshed_at: str | None = None
+    carried_forward: bool = False
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a report from its JSON form, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @classmethod
+    def load(cls, path):
+        """Load a report previously written by save()."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        return asdict(self)
+
+    @property
+    def filename(self):
+        return os.path.join(OUTPUT_DIR, f"{self.company}.json")
+
+    def save(self, path=None):
+        """
+        Atomically write the report as JSON (temporary file + rename), so readers
+        never see a half-written report.
+
+        Returns:
+            str: Path to the written file
+        """
+        path = path or self.filename
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_json_atomic(path, self.to_dict())
+        logger.info(f"Saved report for {self.company} to {path}")
+        return path
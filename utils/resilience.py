@@ -0,0 +1,285 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import requests
+from utils.failures import CircuitOpenError, TRANSIENT_STATUS_CODES, is_transient
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Turn retries and circuit breakers off entirely (every call goes straight through)
+RESILIENCE_ENABLED = os.getenv("RESILIENCE_ENABLED", "true").lower() == "true"
+
+# Retry and circuit breaker settings per external provider:
+#   attempts           - tries per call, retrying transient errors (timeouts, 429, 5xx)
+#   base_delay         - first backoff in seconds, doubled per attempt (full jitter)
+#   max_delay          - cap on a single backoff, including a provider's Retry-After
+#   failure_threshold  - consecutive failed calls that open the circuit
+#   cooldown           - seconds the circuit stays open before one probe call is let through
+PROVIDER_POLICIES = {
+    "brightdata": {"attempts": 3, "base_delay": 5, "max_delay": 60, "failure_threshold": 2, "cooldown": 900},
+    "openai": {"attempts": 3, "base_delay": 2, "max_delay": 30, "failure_threshold": 5, "cooldown": 120},
+    "perplexity": {"attempts": 3, "base_delay": 2, "max_delay": 30, "failure_threshold": 4, "cooldown": 180},
+    "firmable": {"attempts": 3, "base_delay": 1, "max_delay": 15, "failure_threshold": 5, "cooldown": 300},
+    "serpapi": {"attempts": 3, "base_delay": 1, "max_delay": 15, "failure_threshold": 5, "cooldown": 300},
+    "salesforce": {"attempts": 3, "base_delay": 5, "max_delay": 60, "failure_threshold": 3, "cooldown": 300},
+}
+
+# Seconds between progress checks of a BrightData snapshot. Single-company runs
+# (main.py --company, service refresh of one company) check every
+# BRIGHTDATA_FAST_POLL_INTERVAL seconds so the report is ready as soon as the snapshot is
+BRIGHTDATA_POLL_INTERVAL = int(os.getenv("BRIGHTDATA_POLL_INTERVAL", "60"))
+BRIGHTDATA_FAST_POLL_INTERVAL = int(os.getenv("BRIGHTDATA_FAST_POLL_INTERVAL", "10"))
+
+_fast_polling = False
+
+
+def get_policy(provider):
+    """Return the retry/circuit policy for a provider."""
+    if provider not in PROVIDER_POLICIES:
+        raise KeyError(f"Unknown provider '{provider}'. Known providers: {', '.join(PROVIDER_POLICIES)}")
+    return PROVIDER_POLICIES[provider]
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one provider.
+
+    closed    - calls go through; `failure_threshold` failed calls in a row open it
+    open      - calls fail fast with CircuitOpenError for `cooldown` seconds
+    half_open - one probe call is let through; success closes the circuit,
+                failure opens it for another cooldown
+
+    Shared by the event loop and the worker threads the sync scrapers run in.
+    """
+
+    def __init__(self, provider, failure_threshold, cooldown):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def retry_at(self):
+        """time.monotonic() at which the next probe is allowed (None when closed)."""
+        return self.opened_at + self.cooldown if self.opened_at is not None else None
+
+    def allow(self):
+        """Whether a call may go through now (claims the probe slot when half open)."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "closed":
+                return True
+            if self.state == "open" and now >= self.retry_at:
+                self.state = "half_open"
+                self._probing = False
+            # A probe that never reported back (e.g. a job that failed for other reasons)
+            # frees the slot after another cooldown
+            if self.state == "half_open" and (not self._probing or now >= self._probe_started + self.cooldown):
+                self._probing = True
+                self._probe_started = now
+                logger.info(f"Circuit for {self.provider} half open, sending a probe call")
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logger.info(f"Circuit for {self.provider} closed, probe call succeeded")
+            self.state = "closed"
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning(
+                        f"Circuit for {self.provider} opened after {self.failures} failed calls, "
+                        f"failing fast for {self.cooldown}s"
+                    )
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def check(self, follow_up=False):
+        """
+        Raise CircuitOpenError unless a call may go through now.
+
+        Args:
+            follow_up: The call continues a job that was already let through (e.g.
+                polling a BrightData snapshot). It only fails fast while the circuit
+                is open and never takes the half-open probe slot, which may be the
+                job's own trigger.
+        """
+        if follow_up:
+            with self._lock:
+                blocked = self.state == "open" and time.monotonic() < self.retry_at
+            if blocked:
+                raise CircuitOpenError(self.provider, max(0.0, self.retry_at - time.monotonic()))
+            return
+        if not self.allow():
+            raise CircuitOpenError(self.provider, max(0.0, self.retry_at - time.monotonic()))
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider):
+    """Return the circuit breaker of a provider, created on first use."""
+    with _breakers_lock:
+        if provider not in _breakers:
+            policy = get_policy(provider)
+            _breakers[provider] = CircuitBreaker(provider, policy["failure_threshold"], policy["cooldown"])
+        return _breakers[provider]
+
+
+def set_fast_polling(enabled):
+    """Poll BrightData snapshots every BRIGHTDATA_FAST_POLL_INTERVAL seconds (single-company runs)."""
+    global _fast_polling
+    _fast_polling = enabled
+
+
+def brightdata_poll_interval():
+    """Seconds to wait between progress checks of a BrightData snapshot."""
+    return BRIGHTDATA_FAST_POLL_INTERVAL if _fast_polling else BRIGHTDATA_POLL_INTERVAL
+
+
+def seconds_until_probe():
+    """Seconds until every open circuit lets a probe through (0 when none are open)."""
+    now = time.monotonic()
+    with _breakers_lock:
+        waits = [b.retry_at - now for b in _breakers.values() if b.state == "open"]
+    return max([0.0, *waits])
+
+
+def backoff_delay(provider, attempt, error=None):
+    """
+    Backoff before retry number `attempt` (1-based): full jitter over
+    base_delay * 2**(attempt-1), or the provider's Retry-After if longer,
+    capped at max_delay.
+    """
+    policy = get_policy(provider)
+    delay = random.uniform(0, policy["base_delay"] * 2 ** (attempt - 1))
+
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        delay = max(delay, float(headers.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        pass
+    return min(delay, policy["max_delay"])
+
+
+def _should_retry(provider, error, attempt):
+    """Record a failed attempt; return whether to try again."""
+    if not is_transient(error):
+        # The provider answered (bad request, auth, parse error): it is up
+        get_breaker(provider).record_success()
+        return False
+    if attempt >= get_policy(provider)["attempts"]:
+        get_breaker(provider).record_failure()
+        return False
+    return True
+
+
+def call(provider, fn, *args, **kwargs):
+    """
+    Call `fn(*args, **kwargs)` against a provider, retrying transient errors with
+    exponential backoff and jitter, behind the provider's circuit breaker.
+
+    Raises:
+        CircuitOpenError: The provider's circuit is open (failing fast)
+        Exception: The last error once retries are used up, or any non-transient error
+    """
+    return _call(provider, fn, args, kwargs)
+
+
+def _call(provider, fn, args, kwargs, closes_circuit=True, follow_up=False):
+    if not RESILIENCE_ENABLED:
+        return fn(*args, **kwargs)
+
+    breaker = get_breaker(provider)
+    attempt = 0
+    while True:
+        attempt += 1
+        if attempt == 1:
+            breaker.check(follow_up)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if not _should_retry(provider, e, attempt):
+                raise
+            delay = backoff_delay(provider, attempt, e)
+            logger.warning(f"{provider} call failed ({type(e).__name__}: {e}), retry {attempt} in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        if closes_circuit:
+            breaker.record_success()
+        return result
+
+
+async def acall(provider, fn, *args, **kwargs):
+    """
+    Async version of call(): awaits `fn(*args, **kwargs)`, which is called again
+    (for a fresh coroutine) on every attempt.
+    """
+    if not RESILIENCE_ENABLED:
+        return await fn(*args, **kwargs)
+
+    breaker = get_breaker(provider)
+    attempt = 0
+    while True:
+        attempt += 1
+        if attempt == 1:
+            breaker.check()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            if not _should_retry(provider, e, attempt):
+                raise
+            delay = backoff_delay(provider, attempt, e)
+            logger.warning(f"{provider} call failed ({type(e).__name__}: {e}), retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+def http_request(provider, method, url, closes_circuit=True, follow_up=False, **kwargs):
+    """
+    requests.request() through call(). Responses with a transient status (429, 5xx)
+    are retried and raise requests.HTTPError once retries are used up; any other
+    response is returned as is for the caller to check.
+
+    Args:
+        closes_circuit: Whether a response counts as the provider working. Pass False
+            for the first request of a longer job (e.g. a BrightData trigger) whose
+            outcome is reported later with get_breaker(provider).record_success()
+            or record_failure().
+        follow_up: A request continuing such a job (e.g. a progress poll); see
+            CircuitBreaker.check()
+    """
+    def send():
+        response = requests.request(method, url, **kwargs)
+        if response.status_code in TRANSIENT_STATUS_CODES:
+            raise requests.HTTPError(f"{response.status_code} from {provider}", response=response)
+        return response
+
+    return _call(provider, send, (), {}, closes_circuit, follow_up)
@@ -0,0 +1,244 @@
+import os
+import json
+import signal
+import asyncio
+import logging
+from datetime import datetime
+from utils.state import STATE_DIR, write_json_atomic
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# One journal per run, next to the rest of the cross-run state (cleanup() never
+# touches data/state, and the workflow caches it between runs)
+RUNS_DIR = os.path.join(STATE_DIR, "runs")
+
+# Keep this many of the most recent run journals
+RUN_JOURNAL_HISTORY = int(os.getenv("RUN_JOURNAL_HISTORY", "20"))
+
+# Steps of scraper.scrape() that are journaled, in order
+STEPS = ("company_info", "news", "linkedin", "contact", "summarization")
+
+
+class RunJournal:
+    """
+    Journal of a scrape run: the companies in it and, per company, the steps that
+    completed and their outputs. The journal is rewritten (atomically) after every
+    step, so an interrupted run can be resumed with `main.py --resume <run-id>`
+    and only repeats the steps that had not finished.
+
+    Layout of data/state/runs/{run_id}.json:
+        {"run_id", "started_at", "status", "companies": [[name, location], ...],
+         "progress": {company: {"steps": {step: {"output", "duration", "done_at"}},
+                                "report", "results", "interrupted_at"}}}
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def run_id(self):
+        return self.data["run_id"]
+
+    @property
+    def companies(self):
+        return [tuple(c) for c in self.data["companies"]]
+
+    @property
+    def path(self):
+        return os.path.join(RUNS_DIR, f"{self.run_id}.json")
+
+    @classmethod
+    def start(cls, companies, run_id=None):
+        """Start and save the journal of a new run over `companies` ((name, location) tuples)."""
+        run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        journal = cls({
+            "run_id": run_id,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "status": "running",
+            "companies": [list(c) for c in companies],
+            "progress": {},
+        })
+        journal.flush()
+        _prune_journals()
+        logger.info(f"Run journal {run_id} started for {len(companies)} companies (resume with --resume {run_id})")
+        return journal
+
+    @classmethod
+    def load(cls, run_id):
+        """
+        Load the journal of an earlier run ("latest" picks the most recent one).
+
+        Returns:
+            RunJournal, or None if there is no such journal
+        """
+        if run_id == "latest":
+            run_ids = _journal_ids()
+            if not run_ids:
+                logger.error("No run journals to resume")
+                return None
+            run_id = run_ids[-1]
+
+        path = os.path.join(RUNS_DIR, f"{run_id}.json")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                journal = cls(json.load(f))
+        except FileNotFoundError:
+            logger.error(f"Run journal not found: {path}")
+            return None
+        except Exception as e:
+            logger.error(f"Could not load run journal {path}: {e}")
+            return None
+
+        done = sum(1 for p in journal.data["progress"].values() if p.get("results"))
+        logger.info(f"Resuming run {run_id}: {done}/{len(journal.companies)} companies already complete")
+        journal.data["status"] = "running"
+        journal.data["resumed_at"] = datetime.now().isoformat(timespec="seconds")
+        return journal
+
+    @classmethod
+    def start_or_resume(cls, companies, run_id):
+        """
+        Resume the unfinished journal with this ID if there is one (e.g. a re-run of a
+        cancelled workflow job), otherwise start a new run under that ID.
+        """
+        if os.path.exists(os.path.join(RUNS_DIR, f"{run_id}.json")):
+            journal = cls.load(run_id)
+            if journal and journal.data.get("finished_at") is None:
+                return journal
+        return cls.start(companies, run_id)
+
+    def _progress(self, company):
+        return self.data["progress"].setdefault(company, {"steps": {}})
+
+    def is_done(self, company, step):
+        """Whether `step` completed for `company` in an earlier attempt of this run."""
+        return step in self.data["progress"].get(company, {}).get("steps", {})
+
+    def output(self, company, step):
+        """Output recorded for a completed step (None if the step is not done)."""
+        return self.data["progress"].get(company, {}).get("steps", {}).get(step, {}).get("output")
+
+    def record_step(self, company, step, output=None, duration=None):
+        """Mark a step done with its (JSON-serializable) output and save the journal."""
+        self._progress(company)["steps"][step] = {
+            "output": output,
+            "duration": round(duration, 1) if duration is not None else None,
+            "done_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.flush()
+
+    def durations(self, company):
+        """{step: seconds} for the steps of a company that completed."""
+        steps = self.data["progress"].get(company, {}).get("steps", {})
+        return {step: steps[step]["duration"] for step in STEPS if step in steps}
+
+    def complete(self, company, report, results):
+        """Record a company as finished, with its final report dict and results summary."""
+        progress = self._progress(company)
+        progress["report"] = report
+        progress["results"] = results
+        progress.pop("interrupted_at", None)
+        self.flush()
+
+    def completed_results(self, company):
+        """Results summary of a company finished earlier in this run, or None."""
+        return self.data["progress"].get(company, {}).get("results")
+
+    def completed_report(self, company):
+        """Final report dict of a company finished earlier in this run, or None."""
+        return self.data["progress"].get(company, {}).get("report")
+
+    def mark_interrupted(self, company=None):
+        """Record that the run stopped (while scraping `company`, if given) and save the journal."""
+        now = datetime.now().isoformat(timespec="seconds")
+        self.data["status"] = "interrupted"
+        self.data["interrupted_at"] = now
+        if company:
+            self._progress(company)["interrupted_at"] = now
+        self.flush()
+
+    def finish(self):
+        self.data["status"] = "finished"
+        self.data["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        self.flush()
+
+    def flush(self):
+        """Atomically write the journal to data/state/runs/{run_id}.json."""
+        try:
+            os.makedirs(RUNS_DIR, exist_ok=True)
+            write_json_atomic(self.path, self.data)
+        except Exception as e:
+            logger.warning(f"Could not save run journal {self.run_id}: {e}")
+
+
+def handle_sigterm(journal, current_company):
+    """
+    On SIGTERM (e.g. a cancelled GitHub runner), save the journal with the company
+    in flight marked as interrupted, then cancel the running scrape task so the
+    run stops at the next await.
+
+    Args:
+        journal: RunJournal of the run
+        current_company: Callable returning the company being scraped, or None
+
+    Returns:
+        Callable that removes the handler again
+    """
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+
+    def on_sigterm():
+        logger.warning(f"SIGTERM received, saving run journal {journal.run_id} and stopping")
+        journal.mark_interrupted(current_company())
+        task.cancel()
+
+    try:
+        loop.add_signal_handler(signal.SIGTERM, on_sigterm)
+    except (NotImplementedError, RuntimeError):
+        # Signal handlers need the main thread of a Unix event loop
+        logger.debug("Could not install SIGTERM handler for the run journal")
+        return lambda: None
+    return lambda: loop.remove_signal_handler(signal.SIGTERM)
+
+
+def recent_journals():
+    """
+    The saved run journals, least recently written first, for their step
+    durations and per-company usage (e.g. for main.py --plan).
+
+    Returns:
+        list: RunJournal per readable journal
+    """
+    journals = []
+    for run_id in _journal_ids():
+        path = os.path.join(RUNS_DIR, f"{run_id}.json")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                journals.append(RunJournal(json.load(f)))
+        except Exception as e:
+            logger.warning(f"Could not read run journal {path}: {e}")
+    return journals
+
+
+def _journal_ids():
+    """Run IDs of the saved journals, least recently written first."""
+    if not os.path.isdir(RUNS_DIR):
+        return []
+    names = [name for name in os.listdir(RUNS_DIR) if name.endswith(".json") and not name.startswith(".tmp-")]
+    names.sort(key=lambda name: os.path.getmtime(os.path.join(RUNS_DIR, name)))
+    return [name[:-len(".json")] for name in names]
+
+
+def _prune_journals():
+    for run_id in _journal_ids()[:-RUN_JOURNAL_HISTORY]:
+        try:
+            os.remove(os.path.join(RUNS_DIR, f"{run_id}.json"))
+        except OSError as e:
+            logger.warning(f"Could not remove old run journal {run_id}: {e}")
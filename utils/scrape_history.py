@@ -0,0 +1,208 @@
+import os
+import hashlib
+import logging
+import threading
+import contextvars
+from datetime import datetime, timedelta
+from utils.state import load_state, save_state
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Companies scraped for the first time get a deeper one-time backfill; after that
+# each scrape starts at the previous successful scrape minus a small overlap, so
+# items published around the boundary (or indexed late) are not missed.
+BACKFILL_DAYS = int(os.getenv("SCRAPE_BACKFILL_DAYS", "90"))
+OVERLAP_HOURS = int(os.getenv("SCRAPE_OVERLAP_HOURS", "24"))
+
+# Keep this many seen item keys per company and source for deduplication
+SEEN_HISTORY = 500
+
+STATE_NAME = "scrape_history"
+
+# News and LinkedIn scrapes for a company run concurrently (see scraper.scrape),
+# so load-modify-save of the history file is serialized
+_lock = threading.Lock()
+
+# Scrapes of the company currently being scraped (set per scrape() call), held until
+# the report holding their items is saved: {source: {"company", "keys", "scraped_at"}}.
+# Marking items seen earlier would lose them for good if the report is never written.
+_pending = contextvars.ContextVar("pending_scrapes", default=None)
+
+
+def get_window_start(company, source, now=None):
+    """
+    Return the start of the scrape window for a company and source.
+
+    Args:
+        company: Company name
+        source: "news", "linkedin" or "contact"
+        now: Current time (defaults to datetime.now())
+
+    Returns:
+        tuple: (start datetime, True if incremental / False for a first-time backfill)
+    """
+    now = now or datetime.now()
+    backfill_start = now - timedelta(days=BACKFILL_DAYS)
+
+    entry = load_state(STATE_NAME, default={}).get(company, {}).get(source)
+    if not entry or not entry.get("last_success"):
+        logger.info(f"No {source} history for {company}, backfilling {BACKFILL_DAYS} days")
+        return backfill_start, False
+
+    try:
+        last_success = datetime.fromisoformat(entry["last_success"])
+    except ValueError:
+        logger.warning(f"Invalid {source} last_success for {company}: {entry['last_success']!r}, backfilling")
+        return backfill_start, False
+
+    start = max(last_success - timedelta(hours=OVERLAP_HOURS), backfill_start)
+    logger.info(f"Incremental {source} scrape for {company} since {start.isoformat(timespec='minutes')}")
+    return start, True
+
+
+def _last_success(company, source):
+    """The last successful scrape of a company and source, or None (never, or unreadable)."""
+    entry = load_state(STATE_NAME, default={}).get(company, {}).get(source)
+    if not entry or not entry.get("last_success"):
+        return None
+    try:
+        return datetime.fromisoformat(entry["last_success"])
+    except ValueError:
+        return None
+
+
+def is_backfill(company, source):
+    """Whether the next scrape of a company and source is a first-time backfill (no valid last_success)."""
+    return _last_success(company, source) is None
+
+
+def window_days(company, source, now=None):
+    """
+    Days covered by a company's scrape window for a source, as get_window_start()
+    computes it. Call it before the scrape is committed to get the window just scraped.
+    """
+    now = now or datetime.now()
+    start = now - timedelta(days=BACKFILL_DAYS)
+    last_success = _last_success(company, source)
+    if last_success:
+        start = max(last_success - timedelta(hours=OVERLAP_HOURS), start)
+    return max((now - start).total_seconds() / 86400, 1)
+
+
+def article_key(article):
+    """Dedup key for a news article: its normalized source URL (headline if missing)."""
+    url = (article.get("source_url") or "").strip().lower().rstrip("/")
+    return url or (article.get("headline") or "").strip().lower()
+
+
+def post_key(post):
+    """Dedup key for a BrightData LinkedIn post: hash of its date and text."""
+    text = f"{post.get('date_posted', '')}|{(post.get('post_text') or '').strip()}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def record_key(post):
+    """
+    Dedup key for a PostRecord from the requests or Playwright scraper: hash of its
+    text (their dates are relative, e.g. "2w", so only approximate).
+    """
+    return hashlib.sha1(post.text.strip().encode("utf-8")).hexdigest()
+
+
+def filter_seen(company, source, items, key_fn):
+    """
+    Drop items that were already returned by an earlier scrape of this company and source.
+
+    Returns:
+        list: Items whose key has not been seen before, in input order
+    """
+    seen = set(load_state(STATE_NAME, default={}).get(company, {}).get(source, {}).get("seen", []))
+    new_items = []
+    for item in items:
+        key = key_fn(item)
+        if key and key in seen:
+            continue
+        seen.add(key)
+        new_items.append(item)
+
+    if len(new_items) < len(items):
+        logger.info(f"Dropped {len(items) - len(new_items)} already-seen {source} items for {company}")
+    return new_items
+
+
+def begin_company_history(pending=None):
+    """
+    Start holding a company's scrapes; record_scrape() calls after this are kept
+    until commit_scrapes() instead of being written.
+
+    Args:
+        pending: Held scrapes to continue (e.g. from the bulk news stage or an
+            earlier attempt at the company); a fresh dict is started when None
+
+    Returns:
+        dict: The held scrapes, {source: {"company", "keys", "scraped_at"}}
+    """
+    pending = pending if pending is not None else {}
+    _pending.set(pending)
+    return pending
+
+
+def record_scrape(company, source, items, key_fn, scraped_at):
+    """
+    Record a successful scrape: its start time becomes the next window's anchor
+    and the item keys are added to the seen history.
+
+    While a company's scrapes are held (see begin_company_history) the scrape is
+    only kept until commit_scrapes(); otherwise it is written straight away.
+
+    Args:
+        company: Company name
+        source: "news", "linkedin" or "contact"
+        items: Items returned by the scrape (after filter_seen)
+        key_fn: Function returning an item's dedup key
+        scraped_at: Time the scrape started
+    """
+    entry = {
+        "company": company,
+        "keys": [k for k in (key_fn(item) for item in items) if k],
+        "scraped_at": scraped_at.isoformat(timespec="seconds"),
+    }
+    pending = _pending.get()
+    if pending is not None:
+        pending[source] = entry
+        return
+    _write_scrape(source, entry)
+
+
+def commit_scrapes(pending, sources=None):
+    """
+    Write held scrapes to the history once the report holding their items is saved.
+
+    Args:
+        pending: Held scrapes from begin_company_history()
+        sources: Only write these sources (the rest stay held); all when None
+    """
+    for source in list(pending):
+        if sources is None or source in sources:
+            _write_scrape(source, pending.pop(source))
+
+
+def _write_scrape(source, entry):
+    company = entry["company"]
+    with _lock:
+        history = load_state(STATE_NAME, default={})
+        history_entry = history.setdefault(company, {}).setdefault(source, {})
+        seen = history_entry.get("seen", []) + entry["keys"]
+        history_entry["seen"] = seen[-SEEN_HISTORY:]
+        history_entry["last_success"] = entry["scraped_at"]
+        try:
+            save_state(STATE_NAME, history)
+        except Exception as e:
+            logger.warning(f"Could not save scrape history for {company}: {e}")
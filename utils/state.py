@@ -0,0 +1,62 @@
+import os
+import json
+import logging
+import tempfile
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Persistent pipeline state lives outside data/input and data/output so that
+# cleanup() never removes it. The GitHub workflow caches this directory between runs.
+STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "state")
+
+
+def load_state(name, default=None):
+    """
+    Load a named JSON state file from data/state.
+
+    Returns:
+        The parsed JSON data, or `default` if the file is missing or unreadable.
+    """
+    path = os.path.join(STATE_DIR, f"{name}.json")
+    if not os.path.exists(path):
+        return default
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load state file {path}: {e}")
+        return default
+
+
+def save_state(name, data):
+    """
+    Atomically write a named JSON state file to data/state.
+
+    The data is written to a temporary file in the same directory and then renamed
+    over the target, so a crash never leaves a half-written state file behind.
+    """
+    os.makedirs(STATE_DIR, exist_ok=True)
+    path = os.path.join(STATE_DIR, f"{name}.json")
+    write_json_atomic(path, data)
+
+
+def write_json_atomic(path, data):
+    """Write `data` as JSON to `path` via a temporary file and atomic rename."""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
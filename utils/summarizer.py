@@ -1,9 +1,17 @@
 import os
-import csv
 import json
+import time
 import logging
 from dotenv import load_dotenv
 from openai import OpenAI
+from utils.failures import record_failure
+from utils.llm_usage import record_usage, budget_skip_reason
+from utils.gating import gate_skip_reason, set_facts
+from utils.model_routing import get_route
+from utils.ranking import GROWTH_TERMS, select_signals
+from utils.resilience import call
+from utils.report import CompanyReport
+from utils.posts import load_posts
 from datetime import datetime, timedelta
 import re
 
@@ -20,9 +28,17 @@ logger = logging.getLogger(__name__)
 # Setup
 # -------------------------------------------------------------------
 load_dotenv()
-client = OpenAI()
+# Retries happen in utils/resilience.py (backoff + circuit breaker), not in the SDK
+client = OpenAI(max_retries=0)
 
-# Define the schema for batch LinkedIn post analysis
+# Growth posts and articles are ranked against the company (BM25) and only the
+# top signals that fit in this budget are sent to the action/reachout prompts.
+PROMPT_SIGNAL_LIMIT = int(os.getenv("PROMPT_SIGNAL_LIMIT", "8"))
+PROMPT_SIGNAL_TOKEN_BUDGET = int(os.getenv("PROMPT_SIGNAL_TOKEN_BUDGET", "600"))
+
+# Define the schema for batch LinkedIn post analysis.
+# Only growth posts are returned (by index) with a summary; every index left out
+# is a non-growth post. Dates are taken from the parsed source data, not the model.
 posts_batch_schema = {
     "type": "json_schema",
     "json_schema": {
@@ -30,9 +46,9 @@ posts_batch_schema = {
         "schema": {
             "type": "object",
             "properties": {
-                "posts": {
+                "growth_posts": {
                     "type": "array",
-                    "description": "Array of analyzed posts",
+                    "description": "Only the posts that indicate company growth",
                     "items": {
                         "type": "object",
                         "properties": {
@@ -40,29 +56,21 @@ posts_batch_schema = {
                                 "type": "integer",
                                 "description": "Index of the post in the original list (0-based)"
                             },
-                            "is_growth_indicator": {
-                                "type": "boolean",
-                                "description": "Whether this post indicates company growth"
-                            },
-                            "summary": {
-                                "type": "string",
-                                "description": "Brief summary of the post content"
-                            },
                             "growth_type": {
                                 "type": "string",
-                                "description": "Type of growth: awards, expansion, new hires, partnerships, patents, financial success, product launch, etc. Empty string if not a growth indicator."
+                                "description": "Type of growth: awards, expansion, new hires, partnerships, patents, financial success, product launch, etc."
                             },
-                            "date": {
+                            "summary": {
                                 "type": "string",
-                                "description": "Date from the post"
+                                "description": "Brief one-sentence summary of the post content"
                             }
                         },
-                        "required": ["post_index", "is_growth_indicator", "summary", "growth_type", "date"],
+                        "required": ["post_index", "growth_type", "summary"],
                         "additionalProperties": False
                     }
                 }
             },
-            "required": ["posts"],
+            "required": ["growth_posts"],
             "additionalProperties": False
         },
         "strict": True
@@ -82,6 +90,10 @@ contact_posts_schema = {
                     "items": {
                         "type": "object",
                         "properties": {
+                            "post_index": {
+                                "type": "integer",
+                                "description": "Index of the summarized post in the original list (0-based)"
+                            },
                             "summary": {
                                 "type": "string",
                                 "description": "Brief one-sentence summary of what the person posted about"
@@ -95,7 +107,7 @@ contact_posts_schema = {
                                 "description": "Topic category: industry insight, company update, personal achievement, thought leadership, event, hiring, other"
                             }
                         },
-                        "required": ["summary", "date", "topic"],
+                        "required": ["post_index", "summary", "date", "topic"],
                         "additionalProperties": False
                     }
                 }
@@ -108,24 +120,129 @@ contact_posts_schema = {
 }
 
 
-def summarize_contact_posts(contact_posts_filepath, contact_name):
+# -------------------------------------------------------------------
+# Prompts
+# -------------------------------------------------------------------
+# Each prompt keeps all static instructions in the system message (plus any fixed
+# user preamble) and puts company-specific content last, so the leading tokens are
+# identical across companies and the provider's prompt cache can reuse them.
+
+POSTS_ANALYSIS_SYSTEM_PROMPT = (
+    "You are an expert business analyst who identifies company growth indicators from social media posts.\n\n"
+    "Analyze the LinkedIn posts provided and determine which ones indicate company growth.\n\n"
+    "Growth indicators include:\n"
+    "- Awards and recognition\n"
+    "- Business expansion\n"
+    "- New hires or team growth\n"
+    "- Partnerships or collaborations\n"
+    "- Patents or innovations\n"
+    "- Financial success or funding\n"
+    "- Product launches or major updates\n"
+    "- Market expansion\n"
+    "- Client acquisitions\n\n"
+    "Return only the posts that indicate growth, identified by their post index, "
+    "with the growth type and a brief one-sentence summary. Omit all other posts."
+)
+
+CONTACT_POSTS_SYSTEM_PROMPT = (
+    "You are an analyst summarizing a person's LinkedIn activity. "
+    "For each post, provide a brief one-sentence summary of what they posted about, "
+    "the date in DD/MM/YYYY format, and a topic category. "
+    "Provide a brief dot-point summary for each post."
+)
+
+ACTIONS_SYSTEM_PROMPT = (
+    "You are a senior private equity origination analyst generating highly curated "
+    "engagement actions based strictly on scraped company signals. "
+    "Every action must reference a specific signal from the scraped data (e.g., new hire, "
+    "funding round, award, expansion, product launch). "
+    "Actions must create strategic or informational value — not social hospitality. "
+    "Do NOT suggest generic networking ideas (no golf, coffee, dinners, gifts, event "
+    "attendance unless directly relevant to a specific signal). "
+    "Do NOT suggest mass outreach or vague 'connect to discuss'. "
+    "Each action must demonstrate insight into the company's strategy, growth stage, "
+    "or sector dynamics. Assume the audience is sophisticated founders or executives. "
+    "Tone must be sharp, professional, and credible in a private equity context.\n\n"
+    "Based on the scraped signals about the company given by the user, generate 5-7 specific, "
+    "commercially intelligent engagement actions.\n\n"
+    "For each action, provide:\n"
+    "- A concise title (one line)\n"
+    "- 2-3 sentences explaining: why this action is relevant to the specific signal, "
+    "what value it creates, and why it is differentiated (not generic outreach)\n\n"
+    "Format each action as:\n"
+    "Title\n"
+    "Explanation sentences.\n\n"
+    "Use plain text only. No markdown, no bold, no numbering, no bullets."
+)
+
+REACHOUT_SYSTEM_PROMPT = (
+    "You are a senior partner at Armitage Associates, a private equity firm that "
+    "backs founder-led software and technology businesses in Australia and New Zealand. "
+    "You are writing a LinkedIn message that demonstrates genuine sector knowledge and "
+    "references a specific, verifiable signal from the company's recent activity. "
+    "The tone is direct, commercially sharp, and peer-level — one operator to another. "
+    "No flattery, no filler, no corporate jargon. "
+    "Never use phrases like 'impressive growth', 'exciting trajectory', 'caught my eye', "
+    "'synergy', 'leverage', 'ecosystem', or 'value proposition'. "
+    "Never start with 'I hope this message finds you well' or 'I came across your company'. "
+    "The message must feel like it could only have been written about this specific company — "
+    "not a template with the name swapped in. "
+    "Keep it under 80 words. No emojis. No subject line. Just the message body.\n\n"
+    "Write a LinkedIn message to a founder/executive at the company given by the user.\n\n"
+    "Rules:\n"
+    "- Lead with a specific observation that proves you've done your homework on this company\n"
+    "- Reference a concrete signal (deal, hire, product, metric) — not a vague compliment\n"
+    "- Mention Armitage Associates in context, not as a pitch\n"
+    "- Show you understand their sector dynamics or growth stage\n"
+    "- Close with a specific, low-friction next step (not 'let's connect sometime')\n"
+    "- The reader should think 'this person actually understands my business'\n"
+)
+
+
+
+def _create_completion(task, messages, **kwargs):
+    """
+    Run a chat completion for an LLM task using its configured model route.
+
+    The model, output token cap and timeout come from utils.model_routing, and the
+    response's token usage and latency are recorded against the task. Transient
+    errors are retried behind the OpenAI circuit breaker (utils/resilience.py).
+    """
+    route = get_route(task)
+    started = time.monotonic()
+    response = call(
+        "openai", client.chat.completions.create,
+        model=route["model"],
+        messages=messages,
+        max_completion_tokens=route["max_tokens"],
+        timeout=route["timeout"],
+        prompt_cache_key=task,
+        **kwargs,
+    )
+    record_usage(task, response, model=route["model"], latency=time.monotonic() - started)
+    return response
+
+def summarize_contact_posts(posts, contact_name):
     """
     Summarize a contact's LinkedIn posts into dot-point summaries.
 
     Args:
-        contact_posts_filepath: Path to the contact posts JSON file
+        posts: PostRecords from the contact scraper (e.g. after deduplication)
         contact_name: Name of the contact person
 
     Returns:
-        list: List of dicts with 'summary', 'date', 'topic' keys
+        list: List of dicts with 'summary', 'date', 'topic' keys (and 'also_in'
+        when near-duplicates were collapsed into the post)
         None: On failure
     """
-    if not contact_posts_filepath or not os.path.exists(contact_posts_filepath):
-        logger.warning(f"Contact posts file not found: {contact_posts_filepath}")
+    if posts is None:
+        logger.warning(f"No contact posts provided for {contact_name}")
+        return None
+
+    if budget_skip_reason("contact_summary"):
         return None
 
     try:
-        posts = parse_posts_file(contact_posts_filepath)
         if not posts:
             logger.warning(f"No contact posts found for {contact_name}")
             return []
@@ -134,25 +251,15 @@ def summarize_contact_posts(contact_posts_filepath, contact_name):
 
         posts_text = ""
         for i, post in enumerate(posts):
-            posts_text += f"Post #{i}:\n- Date: {post['Date']}\n- Content: {post['Content']}\n\n"
+            posts_text += f"Post #{i}:\n- Date: {post.display_date}\n- Content: {post.text}\n\n"
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = _create_completion(
+            "contact_summary",
             messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an analyst summarizing a person's LinkedIn activity. "
-                        "For each post, provide a brief one-sentence summary of what they posted about, "
-                        "the date in DD/MM/YYYY format, and a topic category."
-                    ),
-                },
+                {"role": "system", "content": CONTACT_POSTS_SYSTEM_PROMPT},
                 {
                     "role": "user",
-                    "content": (
-                        f"Summarize these LinkedIn posts by {contact_name}. "
-                        f"Provide a brief dot-point summary for each post.\n\n{posts_text}"
-                    ),
+                    "content": f"LinkedIn posts by {contact_name}:\n\n{posts_text}",
                 },
             ],
             response_format=contact_posts_schema,
@@ -162,14 +269,11 @@ def summarize_contact_posts(contact_posts_filepath, contact_name):
         summaries = result.get("posts", [])
 
         for s in summaries:
-            date_str = s.get("date", "Unknown")
-            if date_str and '/' in date_str and len(date_str) == 10:
-                absolute_date = date_str
-                relative_date = calculate_relative_date(absolute_date)
-            else:
-                relative_date = date_str
-                absolute_date = convert_relative_date_to_absolute(relative_date)
-            s["date"] = absolute_date + " - " + relative_date
+            s["date"] = format_post_date(s.get("date", "Unknown"))
+            # Links to company posts and articles collapsed into this post as near-duplicates
+            index = s.pop("post_index", None)
+            if isinstance(index, int) and 0 <= index < len(posts) and posts[index].also_in:
+                s["also_in"] = posts[index].also_in
 
         summaries.sort(key=lambda x: parse_date_for_sorting(x['date']), reverse=True)
 
@@ -178,129 +282,66 @@ def summarize_contact_posts(contact_posts_filepath, contact_name):
 
     except Exception as e:
         logger.exception(f"Failed to summarize contact posts for {contact_name}: {e}")
+        record_failure("contact", e)
         return None
 
 
-def parse_posts_file(filepath):
-    """
-    Parse posts from either JSON or CSV format.
-    Returns a list of dicts with keys: Date, Likes, Content
-    """
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"Posts file not found: {filepath}")
-
-    # Determine file type by extension
-    file_ext = os.path.splitext(filepath)[1].lower()
-
-    if file_ext == '.json':
-        # Parse JSON format (from API scraper)
-        logger.info(f"Parsing JSON posts file: {filepath}")
-        with open(filepath, 'r', encoding='utf-8') as file:
-            json_data = json.load(file)
-
-        # Convert JSON format to expected format
-        data = []
-        for post in json_data:
-            # Extract date from date_posted field (ISO format)
-            date_posted = post.get('date_posted', 'Unknown')
-            if date_posted and date_posted != 'Unknown':
-                try:
-                    # Parse ISO date and format as DD/MM/YYYY (matching Perplexity format)
-                    dt = datetime.fromisoformat(date_posted.replace('Z', '+00:00'))
-                    formatted_date = dt.strftime("%d/%m/%Y")
-                except Exception:
-                    formatted_date = date_posted
-            else:
-                formatted_date = 'Unknown'
-
-            data.append({
-                'Date': formatted_date,
-                'Likes': '0',  # API doesn't provide likes
-                'Content': post.get('post_text', 'No Text')
-            })
-
-        return data
-
-    elif file_ext == '.csv':
-        # Parse CSV format (from Playwright scraper)
-        logger.info(f"Parsing CSV posts file: {filepath}")
-        with open(filepath, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            data = list(reader)
-        return data
-
-    else:
-        raise ValueError(f"Unsupported file format: {file_ext}. Expected .json or .csv")
-
-
-# Keep backward compatibility
-def parse_csv(filepath):
-    """Backward compatibility wrapper for parse_posts_file"""
-    return parse_posts_file(filepath)
-
-
 def analyze_posts_batch_with_openai(posts):
     """
     Analyze multiple LinkedIn posts at once using OpenAI to determine which indicate growth.
-    Returns a list of structured JSON objects with summary, growth_type, and date.
+    Returns a list of growth posts only, each with post_index, growth_type and summary.
+    Posts whose index is not returned are non-growth. Returns None if the call fails.
     """
     try:
-        # Build the batch prompt with all posts
+        # Build the batch prompt with all posts (dates are resolved locally, so not sent)
         posts_text = ""
         for i, post in enumerate(posts):
-            posts_text += f"""
-                            Post #{i}:
-                            - Date: {post['Date']}
-                            - Likes: {post['Likes']}
-                            - Content: {post['Content']}
-
-                            """
-
-        user_prompt = f"""
-        Analyze these LinkedIn posts and determine which ones indicate company growth.
-
-        Growth indicators include:
-        - Awards and recognition
-        - Business expansion
-        - New hires or team growth
-        - Partnerships or collaborations
-        - Patents or innovations
-        - Financial success or funding
-        - Product launches or major updates
-        - Market expansion
-        - Client acquisitions
-
-        For each post, determine if it indicates growth.
-        Provide a brief summary, identify the growth type, and extract the date.
-
-        {posts_text}
-
-        Analyze all {len(posts)} posts above.
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            likes = post.likes if post.likes is not None else "unknown"
+            posts_text += f"Post #{i}:\n- Likes: {likes}\n- Content: {post.text}\n\n"
+
+        response = _create_completion(
+            "post_classification",
             messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert business analyst who identifies company growth indicators from social media posts."
-                },
+                {"role": "system", "content": POSTS_ANALYSIS_SYSTEM_PROMPT},
                 {
                     "role": "user",
-                    "content": user_prompt
+                    "content": f"Analyze all {len(posts)} posts below.\n\n{posts_text}"
                 }
             ],
-            response_format=posts_batch_schema
+            response_format=posts_batch_schema,
         )
 
         result = json.loads(response.choices[0].message.content)
-        logger.info(f"Analyzed {len(result['posts'])} posts in batch")
+        growth_posts = [
+            p for p in result.get('growth_posts', [])
+            if isinstance(p.get('post_index'), int) and 0 <= p['post_index'] < len(posts)
+        ]
+        logger.info(f"Analyzed {len(posts)} posts in batch, {len(growth_posts)} flagged as growth")
 
-        return result['posts']
+        return growth_posts
 
     except Exception as e:
         logger.exception(f"Failed to analyze posts batch: {e}")
-        return []  # Return empty list to allow workflow to continue
+        record_failure("summarization", e)
+        return None  # Caller treats None as a failed analysis and continues
+
+
+def format_post_date(date_str):
+    """
+    Format a source post date as "DD/MM/YYYY - <relative>".
+
+    Accepts absolute DD/MM/YYYY dates (PostRecord.display_date) or relative
+    dates (e.g. "2w").
+    """
+    if date_str and '/' in date_str and len(date_str) == 10:
+        # Already absolute format (DD/MM/YYYY)
+        absolute_date = date_str
+        relative_date = calculate_relative_date(absolute_date)
+    else:
+        # Relative format (e.g., "2w")
+        relative_date = date_str or 'Unknown'
+        absolute_date = convert_relative_date_to_absolute(relative_date)
+    return absolute_date + " - " + relative_date
 
 
 def convert_relative_date_to_absolute(relative_date):
@@ -408,6 +449,45 @@ def parse_date_for_sorting(date_str):
         return datetime.min
 
 
+def _build_signal_summaries(company_name, growth_posts, company_data=None):
+    """
+    Pick the most relevant growth posts and articles for a prompt.
+
+    Posts and articles are ranked together with BM25 against the company name,
+    industry and growth vocabulary, and the top signals within
+    PROMPT_SIGNAL_LIMIT / PROMPT_SIGNAL_TOKEN_BUDGET are kept.
+
+    Returns:
+        tuple: (posts_summary, articles_summary) bullet lists, empty strings if none
+    """
+    company_data = company_data or {}
+    signals = [("post", p) for p in growth_posts or []]
+    signals += [("article", a) for a in company_data.get("articles", [])]
+
+    def signal_text(signal):
+        kind, item = signal
+        if kind == "post":
+            return f"{item.get('growth_type', '')} {item.get('summary', '')}"
+        return f"{item.get('headline', '')} {item.get('summary', '')} {item.get('growth_type', '')}"
+
+    def signal_line(signal):
+        # The line the signal adds to the prompt, which is what counts against the budget
+        kind, item = signal
+        if kind == "post":
+            return f"- [{item.get('growth_type', 'growth')}] {item.get('summary', '')}"
+        return f"- {item.get('headline', '')} ({item.get('growth_type', '')})"
+
+    query = f"{company_name} {company_data.get('industry', '')} {GROWTH_TERMS}"
+    selected = select_signals(
+        signals, query, signal_text, k=PROMPT_SIGNAL_LIMIT, token_budget=PROMPT_SIGNAL_TOKEN_BUDGET,
+        size_fn=signal_line,
+    )
+
+    posts_summary = "\n".join(signal_line(s) for s in selected if s[0] == "post")
+    articles_summary = "\n".join(signal_line(s) for s in selected if s[0] == "article")
+    return posts_summary, articles_summary
+
+
 def generate_potential_actions(company_name, growth_posts, company_data=None):
     """
     Generate potential actions for investment analysts based on company growth signals.
@@ -419,57 +499,22 @@ def generate_potential_actions(company_name, growth_posts, company_data=None):
         logger.warning(f"No growth posts or company data for {company_name}, returning default actions")
         return ["Schedule introductory call with founders", "Research competitive landscape"]
 
-    # Build context from growth posts
-    posts_summary = ""
-    if growth_posts:
-        posts_summary = "\n".join(
-            f"- [{p.get('growth_type', 'growth')}] {p.get('summary', '')}"
-            for p in growth_posts
-        )
+    if gate_skip_reason("potential_actions") or budget_skip_reason("potential_actions"):
+        return []
 
-    # Build context from articles if available
-    articles_summary = ""
-    if company_data and company_data.get("articles"):
-        articles_summary = "\n".join(
-            f"- {a.get('headline', '')} ({a.get('growth_type', '')})"
-            for a in company_data.get("articles", [])[:5]
-        )
+    posts_summary, articles_summary = _build_signal_summaries(company_name, growth_posts, company_data)
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = _create_completion(
+            "potential_actions",
             messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a senior private equity origination analyst generating highly curated "
-                        "engagement actions based strictly on scraped company signals. "
-                        "Every action must reference a specific signal from the scraped data (e.g., new hire, "
-                        "funding round, award, expansion, product launch). "
-                        "Actions must create strategic or informational value — not social hospitality. "
-                        "Do NOT suggest generic networking ideas (no golf, coffee, dinners, gifts, event "
-                        "attendance unless directly relevant to a specific signal). "
-                        "Do NOT suggest mass outreach or vague 'connect to discuss'. "
-                        "Each action must demonstrate insight into the company's strategy, growth stage, "
-                        "or sector dynamics. Assume the audience is sophisticated founders or executives. "
-                        "Tone must be sharp, professional, and credible in a private equity context."
-                    ),
-                },
+                {"role": "system", "content": ACTIONS_SYSTEM_PROMPT},
                 {
                     "role": "user",
                     "content": (
-                        f"Based on these scraped signals about {company_name}, generate 5-7 specific, "
-                        f"commercially intelligent engagement actions.\n\n"
                         f"LinkedIn Growth Signals:\n{posts_summary}\n\n"
                         f"News & Articles:\n{articles_summary}\n\n"
-                        "For each action, provide:\n"
-                        "- A concise title (one line)\n"
-                        "- 2-3 sentences explaining: why this action is relevant to the specific signal, "
-                        "what value it creates, and why it is differentiated (not generic outreach)\n\n"
-                        "Format each action as:\n"
-                        "Title\n"
-                        "Explanation sentences.\n\n"
-                        "Use plain text only. No markdown, no bold, no numbering, no bullets."
+                        f"Company: {company_name}"
                     ),
                 },
             ],
@@ -522,26 +567,18 @@ def generate_reachout_message(company_name, growth_posts, company_data=None):
     """
     logger.info(f"Generating LinkedIn reachout message for {company_name} based on {len(growth_posts)} growth posts")
 
-    # Build context from growth posts
-    posts_summary = ""
-    if growth_posts:
-        posts_summary = "\n".join(
-            f"- [{p.get('growth_type', 'growth')}] {p.get('summary', '')}"
-            for p in growth_posts
-        )
+    if gate_skip_reason("reachout_message"):
+        return ""
 
-    # Build context from news articles as fallback or supplement
-    articles_summary = ""
-    if company_data and company_data.get("articles"):
-        articles_summary = "\n".join(
-            f"- {a.get('headline', '')} ({a.get('growth_type', '')})"
-            for a in company_data.get("articles", [])[:5]
-        )
+    posts_summary, articles_summary = _build_signal_summaries(company_name, growth_posts, company_data)
 
     if not posts_summary and not articles_summary:
         logger.warning(f"No growth posts or articles for {company_name}, skipping reachout message")
         return ""
 
+    if budget_skip_reason("reachout_message"):
+        return ""
+
     # Build the signals section
     signals = ""
     if posts_summary:
@@ -550,40 +587,11 @@ def generate_reachout_message(company_name, growth_posts, company_data=None):
         signals += f"Recent news:\n{articles_summary}\n"
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = _create_completion(
+            "reachout_message",
             messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a senior partner at Armitage Associates, a private equity firm that "
-                        "backs founder-led software and technology businesses in Australia and New Zealand. "
-                        "You are writing a LinkedIn message that demonstrates genuine sector knowledge and "
-                        "references a specific, verifiable signal from the company's recent activity. "
-                        "The tone is direct, commercially sharp, and peer-level — one operator to another. "
-                        "No flattery, no filler, no corporate jargon. "
-                        "Never use phrases like 'impressive growth', 'exciting trajectory', 'caught my eye', "
-                        "'synergy', 'leverage', 'ecosystem', or 'value proposition'. "
-                        "Never start with 'I hope this message finds you well' or 'I came across your company'. "
-                        "The message must feel like it could only have been written about this specific company — "
-                        "not a template with the name swapped in. "
-                        "Keep it under 80 words. No emojis. No subject line. Just the message body."
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": (
-                        f"Write a LinkedIn message to a founder/executive at {company_name}.\n\n"
-                        f"{signals}\n"
-                        "Rules:\n"
-                        "- Lead with a specific observation that proves you've done your homework on this company\n"
-                        "- Reference a concrete signal (deal, hire, product, metric) — not a vague compliment\n"
-                        "- Mention Armitage Associates in context, not as a pitch\n"
-                        "- Show you understand their sector dynamics or growth stage\n"
-                        "- Close with a specific, low-friction next step (not 'let's connect sometime')\n"
-                        "- The reader should think 'this person actually understands my business'\n"
-                    ),
-                },
+                {"role": "system", "content": REACHOUT_SYSTEM_PROMPT},
+                {"role": "user", "content": f"{signals}\nCompany: {company_name}"},
             ],
         )
         message = response.choices[0].message.content.strip()
@@ -594,104 +602,61 @@ def generate_reachout_message(company_name, growth_posts, company_data=None):
         return ""
 
 
-def add_posts_to_news_file(news_filepath, posts_data, message="", potential_actions=None):
-    """
-    Add the analyzed posts to the news JSON file under a 'posts' field.
-    Also adds potential_actions field (required).
+def summarize_posts(report, posts):
     """
-    try:
-        # Read existing news file
-        with open(news_filepath, 'r', encoding='utf-8') as f:
-            news_data = json.load(f)
-
-        # Add posts, message, and potential_actions fields
-        news_data['posts'] = posts_data
-        news_data['message'] = message
-        # Ensure potential_actions always exists
-        news_data['potential_actions'] = potential_actions if potential_actions else []
-
-        # Write back to file
-        with open(news_filepath, 'w', encoding='utf-8') as f:
-            json.dump(news_data, f, indent=2)
-
-        logger.info(f"Successfully added {len(posts_data)} posts and {len(news_data['potential_actions'])} actions to {news_filepath}")
-
-    except Exception as e:
-        logger.exception(f"Failed to add posts to news file: {e}")
-        return False
-    return True
-
-
-def summarize_posts(news_filepath, posts_filepath):
-    """
-    Main function to process LinkedIn posts (JSON or CSV) and add growth indicators to news file.
+    Main function to process scraped LinkedIn posts and add growth indicators,
+    the reachout message and potential actions to a company report.
 
     Args:
-        news_filepath: Path to the company news JSON file (e.g., "data/output/OnQ Software.json")
-        posts_filepath: Path to the LinkedIn posts file (e.g., "data/output/OnQ Software Linkedin Posts.json" or .csv)
+        report: CompanyReport holding the company's articles; updated in place
+        posts: PostRecords from the LinkedIn scrapers (e.g. after deduplication)
 
     Returns:
         list: Growth posts on success
         None: On failure or if inputs are missing
     """
     # Handle missing inputs gracefully
-    if not news_filepath:
-        logger.warning("No news filepath provided, skipping summarization")
-        return None
-
-    if not posts_filepath:
-        logger.warning("No posts filepath provided, skipping LinkedIn post analysis")
+    if report is None:
+        logger.warning("No company report provided, skipping summarization")
         return None
 
-    if not os.path.exists(posts_filepath):
-        logger.warning(f"Posts file not found: {posts_filepath}, skipping LinkedIn post analysis")
+    if posts is None:
+        logger.warning("No posts provided, skipping LinkedIn post analysis")
         return None
 
-    if not os.path.exists(news_filepath):
-        logger.warning(f"News JSON file not found: {news_filepath}, cannot add posts")
-        return None
-
-    logger.info(f"Processing posts from {posts_filepath}")
-
     try:
-        # Parse posts file (handles both JSON and CSV)
-        posts = parse_posts_file(posts_filepath)
-        logger.info(f"Found {len(posts)} posts")
+        logger.info(f"Processing {len(posts)} posts for {report.company}")
 
-        if not posts:
-            logger.warning("No posts found, skipping analysis")
-            return []
-
-        # Analyze all posts in one batch API call
-        logger.info(f"Analyzing all {len(posts)} posts in a single API call")
-        analyzed_posts = analyze_posts_batch_with_openai(posts)
+        if posts:
+            # Analyze all posts in one batch API call
+            logger.info(f"Analyzing all {len(posts)} posts in a single API call")
+            analyzed_posts = analyze_posts_batch_with_openai(posts)
 
-        if not analyzed_posts:
-            logger.warning("Post analysis returned no results")
-            return []
+            if analyzed_posts is None:
+                logger.warning("Post analysis failed")
+                return None
+        else:
+            # Incremental scrapes return no posts when there are no new ones;
+            # actions and the reachout message still come from the news articles
+            logger.info("No new posts to analyze")
+            analyzed_posts = []
 
-        # Filter for growth indicators only and convert dates
+        # Only growth posts come back; take each post's date from the scraped source data
         growth_posts = []
         for analysis in analyzed_posts:
-            if analysis.get('is_growth_indicator'):
-                date_from_analysis = analysis.get('date', 'Unknown')
-
-                # Check if date is already absolute (DD/MM/YYYY format) or relative (e.g., "2w")
-                if date_from_analysis and '/' in date_from_analysis and len(date_from_analysis) == 10:
-                    # Already absolute format (DD/MM/YYYY) - from API or Perplexity
-                    absolute_date = date_from_analysis
-                    relative_date = calculate_relative_date(absolute_date)
-                else:
-                    # Relative format (e.g., "2w") - from Playwright CSV
-                    relative_date = date_from_analysis
-                    absolute_date = convert_relative_date_to_absolute(relative_date)
-
-                growth_posts.append({
-                    "summary": analysis.get('summary', ''),
-                    "growth_type": analysis.get('growth_type', ''),
-                    "date": absolute_date + " - " + relative_date
-                })
-                logger.info(f"Growth indicator found: {analysis.get('growth_type')} - {relative_date} -> {absolute_date}")
+            source_post = posts[analysis['post_index']]
+            date = format_post_date(source_post.display_date)
+
+            growth_post = {
+                "summary": analysis.get('summary', ''),
+                "growth_type": analysis.get('growth_type', ''),
+                "date": date
+            }
+            # Links to contact posts collapsed into this one as near-duplicates
+            if source_post.also_in:
+                growth_post["also_in"] = source_post.also_in
+            growth_posts.append(growth_post)
+            logger.info(f"Growth indicator found: {analysis.get('growth_type')} - {date}")
 
         logger.info(f"Found {len(growth_posts)} growth indicator posts out of {len(posts)} total posts")
 
@@ -699,47 +664,44 @@ def summarize_posts(news_filepath, posts_filepath):
         growth_posts.sort(key=lambda x: parse_date_for_sorting(x['date']), reverse=True)
         logger.info("Sorted posts chronologically (latest first)")
 
-        # Load company data for generating actions and message
-        with open(news_filepath, 'r', encoding='utf-8') as f:
-            company_data = json.load(f)
-        company_name = company_data.get('company', 'the company')
-
-        # Only generate actions and reachout message if there's actual data
-        articles = company_data.get('articles', [])
-        message = ""
-        potential_actions = []
-        if growth_posts or articles:
-            message = generate_reachout_message(company_name, growth_posts, company_data)
-            potential_actions = generate_potential_actions(company_name, growth_posts, company_data)
-        else:
-            logger.info(f"No growth posts or articles for {company_name}, skipping action/message generation")
+        # Companies with no signals skip actions and the reachout message (see utils/gating.py)
+        set_facts(signals=len(growth_posts) + len(report.articles))
+        company_data = report.to_dict()
+        message = generate_reachout_message(report.company, growth_posts, company_data)
+        potential_actions = generate_potential_actions(report.company, growth_posts, company_data)
 
-        # Add to news file
-        add_posts_to_news_file(news_filepath, growth_posts, message, potential_actions)
+        report.posts = growth_posts
+        report.message = message
+        report.potential_actions = potential_actions or []
+        logger.info(f"Added {len(growth_posts)} posts and {len(report.potential_actions)} actions to the {report.company} report")
 
         logger.info("Processing complete!")
         return growth_posts
 
-    except FileNotFoundError as e:
-        logger.error(f"File not found during summarization: {e}")
-        return None
     except Exception as e:
         logger.exception(f"Error during summarization: {e}")
+        record_failure("summarization", e)
         return None
 
 
 # Backward compatibility wrapper
 def summarize_csv(news_filepath, posts_filepath):
     """
-    Backward compatibility wrapper for summarize_posts.
+    Backward compatibility wrapper for summarize_posts: adds the posts saved at
+    posts_filepath (a debug dump, or an older JSON/CSV posts file) to the report
+    saved at news_filepath.
     Deprecated: Use summarize_posts instead.
     """
-    return summarize_posts(news_filepath, posts_filepath)
+    report = CompanyReport.load(news_filepath)
+    growth_posts = summarize_posts(report, load_posts(posts_filepath))
+    if growth_posts is not None:
+        report.save(news_filepath)
+    return growth_posts
 
 
 if __name__ == "__main__":
     # Example usage
     summarize_csv(
         news_filepath="data/output/GRC Solutions.json",
-        posts_filepath="data/output/GRC Solutions Linkedin Posts.csv"
+        posts_filepath="data/debug/GRC Solutions Linkedin Posts.json"
     )
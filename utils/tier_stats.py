@@ -0,0 +1,191 @@
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+from utils.state import load_state, save_state
+
+# -------------------------------------------------------------------
+# Logging configuration
+# -------------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Order the LinkedIn scraper tiers per company from their history (see order_tiers);
+# false always uses the fixed API -> Requests -> Playwright order
+ADAPTIVE_TIER_ORDER = os.getenv("ADAPTIVE_TIER_ORDER", "true").lower() == "true"
+
+# A tier is skipped for a company once every attempt over this many days returned no
+# posts (and there were at least TIER_SKIP_MIN_ATTEMPTS of them)...
+TIER_SKIP_DAYS = int(os.getenv("TIER_SKIP_DAYS", "90"))
+TIER_SKIP_MIN_ATTEMPTS = 3
+# ...and tried again after it has been skipped on this many runs, in case the page
+# changed. Counted in runs rather than days so the re-probe fires at any cron cadence
+TIER_REPROBE_RUNS = int(os.getenv("TIER_REPROBE_RUNS", "3"))
+
+# Companies without history use the global success rates once every tier has this many attempts
+GLOBAL_MIN_ATTEMPTS = 10
+
+# Keep this many attempts per company and tier
+TIER_HISTORY = 20
+
+DEFAULT_ORDER = ("API", "Requests", "Playwright")
+
+STATE_NAME = "linkedin_tiers"
+
+# Hedged scrapes finish tiers concurrently, so load-modify-save is serialized
+_lock = threading.Lock()
+
+
+def record_attempt(company, tier, posts, latency, raw_posts=None):
+    """
+    Record the outcome of one LinkedIn scraper tier for a company.
+
+    Args:
+        company: Company name
+        tier: "API", "Requests" or "Playwright"
+        posts: The tier's result (list of posts, or None if it failed)
+        latency: Seconds the attempt took
+        raw_posts: Posts the tier found before already-seen ones were dropped, when
+            the scraper drops them itself (an incremental scrape with no new posts
+            still shows the page is active)
+    """
+    if posts is None:
+        raw_posts = 0
+    elif raw_posts is None:
+        raw_posts = len(posts)
+    attempt = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "ok": posts is not None,
+        "posts": raw_posts,
+        "latency": round(latency, 1),
+    }
+    with _lock:
+        state = load_state(STATE_NAME, default={})
+        history = state.setdefault("companies", {}).setdefault(company, {}).setdefault(tier, [])
+        history.append(attempt)
+        del history[:-TIER_HISTORY]
+        state.get("skips", {}).get(company, {}).pop(tier, None)
+
+        totals = state.setdefault("global", {}).setdefault(
+            tier, {"attempts": 0, "successes": 0, "posts": 0, "latency": 0.0}
+        )
+        totals["attempts"] += 1
+        totals["successes"] += attempt["ok"]
+        totals["posts"] += attempt["posts"]
+        totals["latency"] = round(totals["latency"] + attempt["latency"], 1)
+
+        try:
+            save_state(STATE_NAME, state)
+        except Exception as e:
+            logger.warning(f"Could not save LinkedIn tier stats: {e}")
+
+
+def latency_percentile(tier, percentile=50):
+    """
+    Latency at a percentile of a tier's recent successful attempts, across companies.
+
+    Args:
+        tier: "API", "Requests" or "Playwright"
+        percentile: 0-100
+
+    Returns:
+        float: Seconds, or None if the tier has no successful attempts on record
+    """
+    state = load_state(STATE_NAME, default={})
+    latencies = sorted(
+        a["latency"]
+        for tiers in state.get("companies", {}).values()
+        for a in tiers.get(tier, [])
+        if a["ok"]
+    )
+    if not latencies:
+        return None
+    index = min(len(latencies) - 1, int(len(latencies) * percentile / 100))
+    return latencies[index]
+
+
+def _skip_reason(history, skipped_runs, now):
+    """Why a tier should be skipped for a company given its attempts and skipped runs, or None."""
+    if not history or skipped_runs >= TIER_REPROBE_RUNS:
+        return None
+
+    window_start = now - timedelta(days=TIER_SKIP_DAYS)
+    recent = [a for a in history if datetime.fromisoformat(a["at"]) >= window_start]
+    first_at = datetime.fromisoformat(history[0]["at"])
+    if (
+        len(recent) >= TIER_SKIP_MIN_ATTEMPTS
+        and first_at <= window_start
+        and not any(a["posts"] for a in recent)
+    ):
+        return f"no posts in {len(recent)} attempts over {TIER_SKIP_DAYS} days"
+    return None
+
+
+def order_tiers(company, tiers, now=None, record_skips=False):
+    """
+    Order (and prune) the enabled LinkedIn scraper tiers for a company.
+
+    - A tier that has returned no posts for this company on every attempt over
+      TIER_SKIP_DAYS is skipped, until it has been skipped on TIER_REPROBE_RUNS
+      runs. If that would skip every tier, the first one is still tried.
+    - The tier that last returned posts for this company goes first.
+    - Otherwise tiers are ordered by global success rate (once every tier has
+      GLOBAL_MIN_ATTEMPTS attempts), falling back to the default order.
+
+    Args:
+        company: Company name
+        tiers: Enabled tiers in default order
+        record_skips: Count this call as a run for the skipped tiers (the scrape
+            itself; a dry run such as the planner leaves the counts alone)
+
+    Returns:
+        list: Tiers to try, in order
+    """
+    tiers = list(tiers)
+    if not ADAPTIVE_TIER_ORDER or len(tiers) < 2:
+        return tiers
+
+    now = now or datetime.now()
+    state = load_state(STATE_NAME, default={})
+    company_history = state.get("companies", {}).get(company, {})
+    skips = state.get("skips", {}).get(company, {})
+    totals = state.get("global", {})
+
+    ordered = tiers
+    if all(totals.get(t, {}).get("attempts", 0) >= GLOBAL_MIN_ATTEMPTS for t in tiers):
+        rate = {t: totals[t]["successes"] / totals[t]["attempts"] for t in tiers}
+        ordered = sorted(tiers, key=lambda t: -rate[t])
+
+    successes = [(a["at"], t) for t in tiers for a in company_history.get(t, []) if a["posts"]]
+    if successes:
+        last_good = max(successes)[1]
+        ordered = [last_good] + [t for t in ordered if t != last_good]
+
+    selected = []
+    for tier in ordered:
+        reason = _skip_reason(company_history.get(tier, []), skips.get(tier, 0), now)
+        if reason:
+            logger.info(f"Skipping LinkedIn {tier} scraper for {company}: {reason}")
+        else:
+            selected.append(tier)
+    if not selected:
+        selected = ordered[:1]
+
+    skipped = [t for t in ordered if t not in selected]
+    if record_skips and skipped:
+        with _lock:
+            state = load_state(STATE_NAME, default={})
+            counts = state.setdefault("skips", {}).setdefault(company, {})
+            for tier in skipped:
+                counts[tier] = counts.get(tier, 0) + 1
+            try:
+                save_state(STATE_NAME, state)
+            except Exception as e:
+                logger.warning(f"Could not save LinkedIn tier stats: {e}")
+
+    if selected != tiers:
+        logger.info(f"LinkedIn tier order for {company}: {' -> '.join(selected)}")
+    return selected